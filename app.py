@@ -1,9 +1,41 @@
 import ephem
+import hashlib
+import json
+import logging
 import math
+import os
+import queue
+import random
+import zlib
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify
+from urllib.parse import quote, urlencode
+from functools import lru_cache
+from flask import Flask, Response, redirect, render_template, request, jsonify, url_for
+
+from aufwaermen import Aufwaermen, Prozesspool
+from config import lade_konfiguration, richte_logging_ein
+import darstellung
+import drahtformat
+import komprimierung
+from ephemeriden import EphemeridenTabelle
+from ereignisse import ARTEN as EREIGNIS_ARTEN, EreignisSuche
+import tschebyschow
+from ergebniscache import ErgebnisCache
+from metriken import Histogramme, Messung, StichprobenProfiler, setze_ebene, stufe
+from projektion import waehle_projektion
+from katalogdatei import Speicherkatalog
+from sternkatalog import (
+    STERN_FARBEN, GalaxienKatalog, Katalog, SternIndex, bereite_galaxien_vor, konvertiere_galaxien_csv,
+    konvertiere_sterne_csv, spektral_code, stern_groessen
+)
+from verteiler import Verteiler
 
 app = Flask(__name__, template_folder='templates')
+lade_konfiguration(app)
+logger = richte_logging_ein(app.config)
+
+# Hot-Path-Logging: bei 0 (Produktion oder Level über DEBUG) bleibt nur ein Vergleich
+LOG_STICHPROBE = app.config['LOG_STICHPROBE'] if logger.isEnabledFor(logging.DEBUG) else 0.0
 
 # --- KONSTANTEN FÜR ALLE EBENEN ---
 FENSTER_GROESSE = 600
@@ -70,18 +102,24 @@ SPIRALARME = [
 ]
 
 # --- GALAXIEN EBENE (-21 bis -30) ---
+# ra_grad: Rektaszension in Grad, typ: Hubble-Typ (bestimmt die Farbe)
 LOKALE_GRUPPE = [
-    {'name': 'Andromeda-Galaxie', 'entfernung_lj': 2537000, 'durchmesser_lj': 152000, 'sterne': 1000000000000},
-    {'name': 'Dreiecksgalaxie', 'entfernung_lj': 2730000, 'durchmesser_lj': 60000, 'sterne': 40000000000},
-    {'name': 'Große Magellansche Wolke', 'entfernung_lj': 163000, 'durchmesser_lj': 14000, 'sterne': 30000000000},
-    {'name': 'Kleine Magellansche Wolke', 'entfernung_lj': 200000, 'durchmesser_lj': 7000, 'sterne': 7000000000},
-    {'name': 'Messier 32', 'entfernung_lj': 2560000, 'durchmesser_lj': 6500, 'sterne': 3000000000},
-    {'name': 'Messier 110', 'entfernung_lj': 2680000, 'durchmesser_lj': 15000, 'sterne': 10000000000},
-    {'name': 'NGC 147', 'entfernung_lj': 2360000, 'durchmesser_lj': 11000, 'sterne': 10000000000},
-    {'name': 'NGC 185', 'entfernung_lj': 2010000, 'durchmesser_lj': 10000, 'sterne': 8000000000},
-    {'name': 'IC 10', 'entfernung_lj': 2200000, 'durchmesser_lj': 5000, 'sterne': 20000000000},
-    {'name': 'Leo I', 'entfernung_lj': 820000, 'durchmesser_lj': 2000, 'sterne': 33000000}
+    {'name': 'Andromeda-Galaxie', 'entfernung_lj': 2537000, 'durchmesser_lj': 152000, 'sterne': 1000000000000, 'ra_grad': 10.68, 'typ': 'SA(s)b'},
+    {'name': 'Dreiecksgalaxie', 'entfernung_lj': 2730000, 'durchmesser_lj': 60000, 'sterne': 40000000000, 'ra_grad': 23.46, 'typ': 'SA(s)cd'},
+    {'name': 'Große Magellansche Wolke', 'entfernung_lj': 163000, 'durchmesser_lj': 14000, 'sterne': 30000000000, 'ra_grad': 80.89, 'typ': 'SB(s)m'},
+    {'name': 'Kleine Magellansche Wolke', 'entfernung_lj': 200000, 'durchmesser_lj': 7000, 'sterne': 7000000000, 'ra_grad': 13.19, 'typ': 'SB(s)m'},
+    {'name': 'Messier 32', 'entfernung_lj': 2560000, 'durchmesser_lj': 6500, 'sterne': 3000000000, 'ra_grad': 10.67, 'typ': 'cE2'},
+    {'name': 'Messier 110', 'entfernung_lj': 2680000, 'durchmesser_lj': 15000, 'sterne': 10000000000, 'ra_grad': 10.09, 'typ': 'E5'},
+    {'name': 'NGC 147', 'entfernung_lj': 2360000, 'durchmesser_lj': 11000, 'sterne': 10000000000, 'ra_grad': 8.30, 'typ': 'dE5'},
+    {'name': 'NGC 185', 'entfernung_lj': 2010000, 'durchmesser_lj': 10000, 'sterne': 8000000000, 'ra_grad': 9.74, 'typ': 'dE3'},
+    {'name': 'IC 10', 'entfernung_lj': 2200000, 'durchmesser_lj': 5000, 'sterne': 20000000000, 'ra_grad': 5.07, 'typ': 'dIrr'},
+    {'name': 'Leo I', 'entfernung_lj': 820000, 'durchmesser_lj': 2000, 'sterne': 33000000, 'ra_grad': 152.12, 'typ': 'dE3'}
 ]
+# Reichweite der Galaxien-Ebene: 3 Mio Lichtjahre bei -21, jede Stufe weiter hinaus verdoppelt sie
+GALAXIEN_BASIS_LJ = 3000000
+GALAXIEN_STUFEN_FAKTOR = 2
+# Beschriftet werden nur die auffälligsten Galaxien einer Ansicht
+GALAXIEN_MAX_BESCHRIFTUNGEN = 25
 
 # Vollständige Planeten-Informationen
 PLANETEN_INFO = {
@@ -254,6 +292,86 @@ ZODIAC_ZEICHEN = [
 ZOOM_STEP_FACTOR_OUT = 1.1
 ZOOM_AGGRESSIVE_BASE_IN = 1.5
 
+# Obergrenze für Frames pro Timeline-Anfrage (Wiedergabe-Puffer)
+MAX_TIMELINE_FRAMES = app.config['MAX_TIMELINE_FRAMES']
+
+# Stapel-API: große Stapel verteilen ihre Datumsgruppen auf einen Prozess-Pool
+STAPEL_MAX_ANSICHTEN = app.config['STAPEL_MAX_ANSICHTEN']
+STAPEL_FENSTER = app.config['STAPEL_FENSTER']
+_stapel_prozesse = app.config['STAPEL_PROZESSE']
+if _stapel_prozesse is None:
+    _stapel_prozesse = os.cpu_count() or 1
+# Mit nur einem Prozess wäre der Pool reiner Mehraufwand (Kopieren, Serialisieren);
+# Prozesse starten erst mit dem ersten großen Stapel
+STAPEL_POOL = Prozesspool(_stapel_prozesse) if _stapel_prozesse > 1 else None
+
+# Layout und Positionen je Datum ändern sich nie: Browser und Proxies dürfen cachen
+LAYOUT_MAX_AGE = app.config['LAYOUT_MAX_AGE']
+
+# Kurzlebiger Ergebnis-Cache für /api/planet_data (Echtzeit-Clients derselben Sekunde)
+PLANET_DATA_CACHE = ErgebnisCache(app.config['PLANET_DATA_CACHE_GROESSE'], app.config['PLANET_DATA_CACHE_TTL'])
+
+# Stufenzeiten von /api/planet_data (Histogramme je Stufe und Ebene, siehe /metrics)
+STUFEN_ZEITEN = Histogramme(
+    'planetenuhr_stufe_sekunden', 'Dauer der Stufen von /api/planet_data', ('stufe', 'ebene')
+)
+SERVER_TIMING = app.config['SERVER_TIMING']
+
+# Serverseitig gerenderte Ansichten (SVG/PNG), von allen Clients geteilt
+BILD_CACHE = darstellung.BildCache(app.config['BILD_CACHE_BYTES'])
+BILD_ZEIT_RUNDUNG = app.config['BILD_ZEIT_RUNDUNG']
+BILD_FORMATE = {'svg': 'image/svg+xml', 'png': 'image/png'}
+PROFILER = StichprobenProfiler() if app.config['PROFILER_ERLAUBT'] else None
+
+# HTTP-Caching und Kompression: statische Dateien mit Inhalts-Hash in der URL
+# sind unveränderlich; Antworten ab KOMPRIMIERUNG_AB Bytes werden gepackt
+STATIC_MAX_AGE = app.config['STATIC_MAX_AGE']
+KOMPRIMIERUNG_AB = app.config['KOMPRIMIERUNG_AB']
+KOMPRESSIONS_CACHE = komprimierung.KompressionsCache()
+
+# Echtzeit-Stream (Server-Sent Events)
+STREAM_INTERVALL_MIN = app.config['STREAM_INTERVALL_MIN']
+STREAM_INTERVALL_MAX = app.config['STREAM_INTERVALL_MAX']
+STREAM_PUFFER = app.config['STREAM_PUFFER']
+STREAM_KEEPALIVE = app.config['STREAM_KEEPALIVE']
+
+# Ereignissuche: Obergrenze des Zeitraums, Blöcke werden prozessweit gecacht
+EREIGNIS_MAX_TAGE = app.config['EREIGNIS_MAX_TAGE']
+TSCHEBYSCHOW_MAX_TAGE = app.config['TSCHEBYSCHOW_MAX_TAGE']
+
+# Vorberechnete Ephemeriden: Tagesgitter, außerhalb davon rechnet ephem live
+CACHE_VERZEICHNIS = app.config['CACHE_VERZEICHNIS']
+
+EPHEMERIDEN_TABELLE = EphemeridenTabelle(
+    HELIOCENTRIC_OBJEKTE,
+    app.config['EPHEMERIDEN_START'], app.config['EPHEMERIDEN_ENDE'], app.config['EPHEMERIDEN_SCHRITT_TAGE'],
+    pfad=os.path.join(CACHE_VERZEICHNIS, 'ephemeriden.bin')
+)
+
+# Optionale große Kataloge (Katalogdatei oder CSV, per mmap geöffnet); ohne sie bzw.
+# bis sie geladen sind, gelten die eingebauten MILCHSTRASSE_STERNE und LOKALE_GRUPPE
+STERNKATALOG = Katalog(
+    app.config['STERNKATALOG_PFAD'], CACHE_VERZEICHNIS, konvertiere_sterne_csv, SternIndex
+) if app.config['STERNKATALOG_PFAD'] else None
+GALAXIENKATALOG = Katalog(
+    app.config['GALAXIENKATALOG_PFAD'], CACHE_VERZEICHNIS, konvertiere_galaxien_csv, GalaxienKatalog
+) if app.config['GALAXIENKATALOG_PFAD'] else None
+STERNKATALOG_MAX_STERNE = app.config['STERNKATALOG_MAX_STERNE']
+GALAXIENKATALOG_MAX_GALAXIEN = app.config['GALAXIENKATALOG_MAX_GALAXIEN']
+# Die eingebaute Lokale Gruppe mit demselben Index wie ein geladener Katalog
+EINGEBAUTE_GALAXIEN = GalaxienKatalog(Speicherkatalog(*bereite_galaxien_vor(LOKALE_GRUPPE)))
+SICHT_RAND = 20  # Pixel außerhalb des Fensters, die noch mitgeliefert werden
+# Beschriftungen stehen rechts vom Objekt; so weit links vom Fenster zählt es noch als sichtbar
+BESCHRIFTUNG_BREITE = 150
+
+# Aufwärmen; Stufen werden am Dateiende registriert. Gestartet wird vom
+# Server-Einstieg (app.py, asgi.py) bzw. mit der ersten Anfrage, nicht beim
+# Import: Skripte, Benchmarks und Pool-Prozesse importieren die App auch
+AUFWAERMEN = Aufwaermen(app.config['AUFWAERMEN_PROZESSE'])
+
+# Projektion aller Ebenen: NumPy-Arrays, falls installiert, sonst reine Python-Schleifen
+PROJEKTION = waehle_projektion(app.config['PROJEKTION'])
+
 def get_current_level_range(zoom_level):
     """Bestimmt die aktuelle Ebene basierend auf Zoom-Level"""
     if zoom_level >= -10:
@@ -358,82 +476,277 @@ def get_radius_for_planet(name, zoom_level, sonnen_radius):
     
     return radius * orbit_zoom_faktor
 
+# --- GEOMETRIE-TABELLE ---
+# Alle Skalierungsfunktionen hängen nur von Zoomstufe und Planet ab. Für die
+# ganzzahligen Zoomstufen werden sie beim Import einmal ausgewertet, gebrochene
+# Zoomstufen landen in einem LRU-Cache.
+ZOOM_MIN = -30
+ZOOM_MAX = 20
+
+def berechne_zoom_geometrie(zoom_level):
+    """Wertet alle Skalierungsfunktionen für eine Zoomstufe aus"""
+    orbit_zoom_faktor, zoom_faktor_display = calculate_scaling_factors(zoom_level)
+    sonnen_radius = get_sonnen_radius(zoom_level)
+
+    return {
+        'zoom_level': zoom_level,
+        'orbit_zoom_faktor': orbit_zoom_faktor,
+        'zoom_faktor_display': zoom_faktor_display,
+        'sonnen_radius': sonnen_radius,
+        'orbit_radius': {name: get_radius_for_planet(name, zoom_level, sonnen_radius) for name in BAHNEN_INDEX},
+        'planet_durchmesser': {name: get_planet_diameter(name, zoom_level) for name in BAHNEN_INDEX}
+    }
+
+GEOMETRIE_TABELLE = {zoom_level: berechne_zoom_geometrie(zoom_level) for zoom_level in range(ZOOM_MIN, ZOOM_MAX + 1)}
+
+@lru_cache(maxsize=256)
+def _berechne_zoom_geometrie_gebrochen(zoom_level):
+    return berechne_zoom_geometrie(zoom_level)
+
+def get_zoom_geometrie(zoom_level):
+    """Geometrie einer Zoomstufe aus der Tabelle (gebrochene Stufen: LRU-Cache).
+
+    Die zurückgegebenen Dicts werden geteilt und dürfen nicht verändert werden.
+    """
+    geometrie = GEOMETRIE_TABELLE.get(zoom_level)
+    if geometrie is None:
+        geometrie = _berechne_zoom_geometrie_gebrochen(zoom_level)
+    return geometrie
+
 def get_stern_farbe(spektralklasse):
-    """Bestimmt Sternfarbe basierend auf Spektralklasse"""
-    if spektralklasse.startswith('O'): return '#9bb0ff'  # Blau
-    elif spektralklasse.startswith('B'): return '#aabfff'  # Blau-Weiß
-    elif spektralklasse.startswith('A'): return '#cad7ff'  # Weiß
-    elif spektralklasse.startswith('F'): return '#f8f7ff'  # Gelb-Weiß
-    elif spektralklasse.startswith('G'): return '#fff4ea'  # Gelb (wie Sonne)
-    elif spektralklasse.startswith('K'): return '#ffd2a1'  # Orange
-    elif spektralklasse.startswith('M'): return '#ffcc6f'  # Rot-Orange
-    else: return '#ffffff'  # Standard
-
-def calculate_milchstrasse_data(zoom_level, offset_x, offset_y, selected_star=None):
-    """Berechnet die Milchstraßen-Ebene mit realistischer Sternverteilung"""
+    """Bestimmt Sternfarbe basierend auf Spektralklasse (Tabelle wie im Sternkatalog)"""
+    return STERN_FARBEN[spektral_code(spektralklasse)]
+
+def stern_winkel(name):
+    """Pseudo-zufälliger, aber stabiler Winkel aus dem Namen. hash() ist pro Prozess
+    zufällig (PYTHONHASHSEED), damit lägen die Sterne in jedem Worker woanders."""
+    return zlib.crc32(name.encode('utf-8')) % 360
+
+def groessen_klasse(relative_level):
+    if relative_level <= 3:
+        return 0
+    elif relative_level <= 6:
+        return 1
+    return 2
+
+def bereite_stern_vor(stern, x_lj, y_lj):
+    """Alles Zoom-unabhängige eines Sterns: Position in Lichtjahren um die Sonne,
+    Größen je Klasse und die unveränderlichen Antwortfelder"""
+    return {
+        'x_lj': x_lj,
+        'y_lj': y_lj,
+        'groessen': stern_groessen(stern['masse_sonne']),
+        'daten': {
+            'name': stern['name'],
+            'farbe': get_stern_farbe(stern['spektralklasse']),
+            'entfernung_lj': stern['entfernung_lj'],
+            'masse_sonne': stern['masse_sonne'],
+            'spektralklasse': stern['spektralklasse'],
+            'planetensystem': stern['planetensystem']
+        }
+    }
+
+def _bereite_eingebauten_stern_vor(stern):
+    # Vereinfachte Positionierung (in einer realen Implementierung würden wir RA/Dec verwenden)
+    # Für Demo: Zufällige Winkel, aber mit korrekten Entfernungen
+    winkel = math.radians(stern_winkel(stern['name']))
+    return bereite_stern_vor(stern, stern['entfernung_lj'] * math.cos(winkel), stern['entfernung_lj'] * math.sin(winkel))
+
+VORBERECHNETE_STERNE = [_bereite_eingebauten_stern_vor(stern) for stern in MILCHSTRASSE_STERNE]
+
+# --- SICHTBARKEIT (CULLING) ---
+# Mit festem Fensterausschnitt (sichtbereich) lassen die Rechner Objekte weg,
+# die nichts zum Bild beitragen; wie viele, steht in zoom_info['culled'].
+# Ohne Ausschnitt (relative Antworten, der Client verschiebt selbst) bleibt
+# alles drin. Gewählte Objekte werden nie weggelassen (Info-Panel).
+
+def sicht_rechteck(sichtbereich, links=0):
+    """Fensterausschnitt plus SICHT_RAND, links zusätzlich `links` Pixel"""
+    x0, y0, x1, y1 = sichtbereich
+    return (x0 - SICHT_RAND - links, y0 - SICHT_RAND, x1 + SICHT_RAND, y1 + SICHT_RAND)
+
+def punkt_sichtbar(x, y, radius, rechteck):
+    x0, y0, x1, y1 = rechteck
+    return x + radius >= x0 and x - radius <= x1 and y + radius >= y0 and y - radius <= y1
+
+def kreislinie_sichtbar(mitte_x, mitte_y, radius, rechteck):
+    """Schneidet die Kreislinie das Rechteck? Nein, wenn das Rechteck ganz
+    innerhalb oder ganz außerhalb des Kreises liegt."""
+    x0, y0, x1, y1 = rechteck
+    dx = max(x0 - mitte_x, 0.0, mitte_x - x1)
+    dy = max(y0 - mitte_y, 0.0, mitte_y - y1)
+    fern_x = max(abs(x0 - mitte_x), abs(x1 - mitte_x))
+    fern_y = max(abs(y0 - mitte_y), abs(y1 - mitte_y))
+    return dx * dx + dy * dy <= radius * radius <= fern_x * fern_x + fern_y * fern_y
+
+def strecke_sichtbar(xa, ya, xb, yb, rechteck):
+    """Schneidet die Strecke das Rechteck? (Liang-Barsky)"""
+    x0, y0, x1, y1 = rechteck
+    dx, dy = xb - xa, yb - ya
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, xa - x0), (dx, x1 - xa), (-dy, ya - y0), (dy, y1 - ya)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+def sichtbares_sonnensystem(planeten, umlaufbahnen, sonne, zodiak, sichtbereich):
+    """Planeten und Bahnen, die im Ausschnitt etwas zeichnen, plus Anzahl der weggelassenen.
+
+    Ein Planet zählt als sichtbar, wenn sein Punkt oder eine seiner Linien
+    (zur Sonne, zum Zodiak-Kreis) das Fenster schneidet. Detailstufe: Bahnen
+    unter der Sonnenscheibe (gezeichnet wird die Sonne darüber) fallen weg.
+    """
+    rechteck = sicht_rechteck(sichtbereich)
+    sx, sy = sonne['x'], sonne['y']
+    sichtbare_bahnen = [
+        bahn for bahn in umlaufbahnen
+        if bahn['radius'] > sonne['radius'] and kreislinie_sichtbar(sx, sy, bahn['radius'], rechteck)
+    ]
+
+    zodiak_radius = zodiak['radius'] if zodiak['show'] else None
+    sichtbare_planeten = []
+    for planet in planeten:
+        x, y = planet['x'], planet['y']
+        sichtbar = (
+            planet['selected']
+            or punkt_sichtbar(x, y, planet['point_radius'], rechteck)
+            or strecke_sichtbar(sx, sy, x, y, rechteck)
+        )
+        if not sichtbar and zodiak_radius is not None:
+            zx = sx + zodiak_radius * math.cos(planet['helio_lon_rad'])
+            zy = sy - zodiak_radius * math.sin(planet['helio_lon_rad'])
+            sichtbar = strecke_sichtbar(x, y, zx, zy, rechteck)
+        if sichtbar:
+            sichtbare_planeten.append(planet)
+
+    culled = len(planeten) - len(sichtbare_planeten) + len(umlaufbahnen) - len(sichtbare_bahnen)
+    return sichtbare_planeten, sichtbare_bahnen, culled
+
+def katalog_sterne(index, max_entfernung, skala, mitte_x, mitte_y, fenster, klasse, selected_star):
+    """Indizes der hellsten Katalogsterne innerhalb von max_entfernung und (falls
+    angegeben) im Fenster (siehe sicht_rechteck) plus der gewählte Stern, dazu die
+    Anzahl der Sterne im Kreis, die ganz außerhalb liegen, und den Index des gewählten
+    Sterns (oder None); `skala` sind Pixel pro Lichtjahr"""
+    rechteck, ausserhalb = None, 0
+    if fenster is not None:
+        # Fenster (samt größtem Sternradius der Größenklasse) in Lichtjahre um die Sonne zurückrechnen
+        x0, y0, x1, y1 = fenster
+        rand = index.max_radien[klasse]
+        rechteck = (
+            (x0 - rand - mitte_x) / skala, (y0 - rand - mitte_y) / skala,
+            (x1 + rand - mitte_x) / skala, (y1 + rand - mitte_y) / skala
+        )
+        ausserhalb = index.zaehlen(max_entfernung) - PROJEKTION.katalog_zaehlen(index, max_entfernung, rechteck)
+    treffer = PROJEKTION.katalog_auswahl(index, max_entfernung, rechteck, STERNKATALOG_MAX_STERNE)
+
+    gewaehlt = index.index_von(selected_star) if selected_star else None
+    if gewaehlt is not None and gewaehlt not in treffer:
+        x, y = index.x[gewaehlt], index.y[gewaehlt]
+        if x * x + y * y <= max_entfernung * max_entfernung:
+            treffer.append(gewaehlt)
+            if rechteck is not None and not (rechteck[0] <= x <= rechteck[2] and rechteck[1] <= y <= rechteck[3]):
+                ausserhalb -= 1
+    return treffer, ausserhalb, gewaehlt
+
+def calculate_milchstrasse_data(zoom_level, offset_x, offset_y, selected_star=None, sichtbereich=None):
+    """Berechnet die Milchstraßen-Ebene mit realistischer Sternverteilung.
+    `sichtbereich` (x0, y0, x1, y1) begrenzt Katalogsterne auf den Fensterausschnitt."""
     relative_level = zoom_level + 11  # -11 bis -20 → 0 bis 9
     
     # Skalierungsfaktoren basierend auf Zoom-Level
     if relative_level <= 3:  # Level -11 bis -14: Lokale Nachbarn
         max_entfernung = 100  # Lichtjahre
         base_scale = (ZENTRUM - UMRANDE_GROESSE) / max_entfernung
-        anzuzeigende_sterne = [s for s in MILCHSTRASSE_STERNE if s['entfernung_lj'] <= max_entfernung]
+        anzuzeigende_sterne = [s for s in VORBERECHNETE_STERNE if s['daten']['entfernung_lj'] <= max_entfernung]
     elif relative_level <= 6:  # Level -15 bis -17: Orion-Arm
         max_entfernung = 1000  # Lichtjahre
         base_scale = (ZENTRUM - UMRANDE_GROESSE) / max_entfernung
-        anzuzeigende_sterne = [s for s in MILCHSTRASSE_STERNE if s['entfernung_lj'] <= max_entfernung]
+        anzuzeigende_sterne = [s for s in VORBERECHNETE_STERNE if s['daten']['entfernung_lj'] <= max_entfernung]
     else:  # Level -18 bis -20: Ganze Milchstraße
         max_entfernung = 50000  # Lichtjahre
         base_scale = (ZENTRUM - UMRANDE_GROESSE) / max_entfernung
         # Für die Übersicht zeigen wir nur bedeutende Sterne
-        anzuzeigende_sterne = [s for s in MILCHSTRASSE_STERNE if s['masse_sonne'] > 1.0 or s['entfernung_lj'] < 50]
+        anzuzeigende_sterne = [
+            s for s in VORBERECHNETE_STERNE
+            if s['daten']['masse_sonne'] > 1.0 or s['daten']['entfernung_lj'] < 50
+        ]
     
-    sterne = []
+    # Pixel pro Lichtjahr inkl. Zoom-Faktor
+    skala = base_scale * (ZENTRUM - UMRANDE_GROESSE) * ZOOM_STEP_FACTOR_OUT ** (relative_level * 2) / max_entfernung
     
-    for stern in anzuzeigende_sterne:
-        # Vereinfachte Positionierung (in einer realen Implementierung würden wir RA/Dec verwenden)
-        # Für Demo: Zufällige Winkel, aber mit korrekten Entfernungen
-        angle = hash(stern['name']) % 360  # Pseudo-zufälliger Winkel basierend auf Namen
-        radius = (stern['entfernung_lj'] / max_entfernung) * base_scale * (ZENTRUM - UMRANDE_GROESSE)
-        
-        # Zoom-Faktor anwenden
-        zoom_faktor = ZOOM_STEP_FACTOR_OUT ** (relative_level * 2)
-        radius *= zoom_faktor
-        
-        x = ZENTRUM + offset_x + radius * math.cos(math.radians(angle))
-        y = ZENTRUM + offset_y + radius * math.sin(math.radians(angle))
-        
-        # Sterngröße basierend auf Masse und Zoom-Level
-        if relative_level <= 3:
-            groesse = max(3, stern['masse_sonne'] * 6)
-        elif relative_level <= 6:
-            groesse = max(2, stern['masse_sonne'] * 4)
-        else:
-            groesse = max(1, stern['masse_sonne'] * 2)
-        
-        # Farbe basierend auf Spektralklasse
-        farbe = get_stern_farbe(stern['spektralklasse'])
-        
-        sterne.append({
-            'name': stern['name'],
-            'x': x,
-            'y': y,
-            'radius': groesse,
-            'farbe': farbe,
-            'entfernung_lj': stern['entfernung_lj'],
-            'masse_sonne': stern['masse_sonne'],
-            'spektralklasse': stern['spektralklasse'],
-            'planetensystem': stern['planetensystem'],
-            'selected': (stern['name'] == selected_star)
-        })
+    culled = 0
+    klasse = groessen_klasse(relative_level)
+    mitte_x, mitte_y = ZENTRUM + offset_x, ZENTRUM + offset_y
+    if STERNKATALOG is not None and STERNKATALOG.bereit:
+        # Großer Katalog: nur die hellsten Sterne des Ausschnitts (Detailstufe über die Magnitude).
+        # Sterne außerhalb fasst die Indexabfrage nicht an, gezählt werden sie trotzdem;
+        # dunklere Sterne jenseits des Limits sind Detailstufe, nicht culled
+        index = STERNKATALOG.daten
+        fenster = sicht_rechteck(sichtbereich, BESCHRIFTUNG_BREITE) if sichtbereich is not None else None
+        treffer, culled, gewaehlt = katalog_sterne(
+            index, max_entfernung, skala, mitte_x, mitte_y, fenster, klasse, selected_star
+        )
+        # Position, Farbe und Radien stehen schon in der Datei: Projektion und
+        # Sichtbarkeit mit dem eigenen Radius (das Abfragerechteck gilt für den
+        # größten) rechnet die Engine spaltenweise, eine Zeile ist nur noch
+        # Nachschlagen per Index
+        anzahl = len(treffer)
+        treffer, xs, ys, radien = PROJEKTION.katalog_sichtbar(
+            index, treffer, mitte_x, mitte_y, skala, klasse, fenster, gewaehlt
+        )
+        culled += anzahl - len(treffer)
+        sterne = []
+        for i, x, y, radius in zip(treffer, xs, ys, radien):
+            stern = index.stern(i)
+            stern['selected'] = i == gewaehlt
+            stern['x'] = x
+            stern['y'] = y
+            stern['radius'] = radius
+            sterne.append(stern)
+    else:
+        if sichtbereich is not None:
+            rechteck = sicht_rechteck(sichtbereich, BESCHRIFTUNG_BREITE)
+            alle = anzuzeigende_sterne
+            anzuzeigende_sterne = [
+                stern for stern in alle
+                if stern['daten']['name'] == selected_star or punkt_sichtbar(
+                    mitte_x + skala * stern['x_lj'], mitte_y + skala * stern['y_lj'], stern['groessen'][klasse], rechteck
+                )
+            ]
+            culled = len(alle) - len(anzuzeigende_sterne)
+
+        # Pro Anfrage bleibt nur Skalieren und Verschieben der vorberechneten Positionen
+        xs, ys = PROJEKTION.skalieren(
+            mitte_x, mitte_y, skala,
+            [stern['x_lj'] for stern in anzuzeigende_sterne], [stern['y_lj'] for stern in anzuzeigende_sterne]
+        )
+        sterne = [
+            {
+                **stern['daten'],
+                'x': x,
+                'y': y,
+                'radius': stern['groessen'][klasse],
+                'selected': (stern['daten']['name'] == selected_star)
+            }
+            for stern, x, y in zip(anzuzeigende_sterne, xs, ys)
+        ]
     
     return {
         'ebene': 'milchstrasse',
         'sterne': sterne,
         'sonne': {
             'name': 'Sonne',
-            'x': ZENTRUM + offset_x,
-            'y': ZENTRUM + offset_y,
+            'x': mitte_x,
+            'y': mitte_y,
             'radius': 8,
             'farbe': 'yellow',
             'selected': ('Sonne' == selected_star)
@@ -442,120 +755,217 @@ def calculate_milchstrasse_data(zoom_level, offset_x, offset_y, selected_star=No
         'zoom_info': {
             'max_entfernung': max_entfernung,
             'relative_level': relative_level,
-            'anzahl_sterne': len(sterne)
+            'anzahl_sterne': len(sterne),
+            'culled': culled
         }
     }
 
-def calculate_galaxien_data(zoom_level, offset_x, offset_y, selected_galaxie=None):
-    """Berechnet die Galaxien-Ebene mit Nachbargalaxien"""
-    relative_level = zoom_level + 21  # 0 bis 9
-    base_scale = (ZENTRUM - UMRANDE_GROESSE) / 3000000  # 3 Mio Lichtjahre Basis
-    
+def calculate_galaxien_data(zoom_level, offset_x, offset_y, selected_galaxie=None, sichtbereich=None):
+    """Berechnet die Galaxien-Ebene mit Nachbargalaxien an ihren Himmelspositionen
+    (Draufsicht, Winkel = Rektaszension). Der Entfernungsindex liefert bis zur
+    Reichweite der Stufe die Galaxien mit der größten scheinbaren Größe zuerst.
+    `sichtbereich` (x0, y0, x1, y1) lässt Galaxien außerhalb des Fensters weg."""
+    relative_level = zoom_level + 21  # 0 bis -9
+    max_entfernung = GALAXIEN_BASIS_LJ * GALAXIEN_STUFEN_FAKTOR ** -relative_level
+    # Pixel pro Lichtjahr
+    skala = (ZENTRUM - UMRANDE_GROESSE) / max_entfernung
+
+    if GALAXIENKATALOG is not None and GALAXIENKATALOG.bereit:
+        katalog = GALAXIENKATALOG.daten
+    else:
+        katalog = EINGEBAUTE_GALAXIEN
+
+    mitte_x, mitte_y = ZENTRUM + offset_x, ZENTRUM + offset_y
+    min_entfernung, rechteck = 0.0, None
+    if sichtbereich is not None:
+        # Fensterausschnitt (samt größtem Galaxienradius) in Lichtjahre zurückrechnen
+        fenster = sicht_rechteck(sichtbereich, BESCHRIFTUNG_BREITE)
+        x0, y0, x1, y1 = fenster
+        rand = katalog.max_radius
+        naechster = math.hypot(max(x0 - mitte_x, 0.0, mitte_x - x1), max(y0 - mitte_y, 0.0, mitte_y - y1))
+        min_entfernung = max(0.0, naechster - rand) / skala
+        rechteck = (
+            (x0 - rand - mitte_x) / skala, (y0 - rand - mitte_y) / skala,
+            (x1 + rand - mitte_x) / skala, (y1 + rand - mitte_y) / skala
+        )
+    treffer = katalog.abfrage(min_entfernung, max_entfernung, rechteck, GALAXIENKATALOG_MAX_GALAXIEN)
+    if selected_galaxie:
+        gewaehlt = katalog.index_von(selected_galaxie)
+        if gewaehlt is not None and gewaehlt not in treffer:
+            treffer.append(gewaehlt)
+
+    # Pro Anfrage bleibt nur Skalieren und Verschieben der vorberechneten Positionen
+    xs, ys = PROJEKTION.skalieren(mitte_x, mitte_y, skala, [katalog.x[i] for i in treffer], [katalog.y[i] for i in treffer])
+
     galaxien = []
-    
-    for i, galaxie in enumerate(LOKALE_GRUPPE):
-        # Position im Kreis um die Milchstraße
-        angle = (i / len(LOKALE_GRUPPE)) * 2 * math.pi
-        radius = (galaxie['entfernung_lj'] / 3000000) * base_scale * (ZOOM_STEP_FACTOR_OUT ** (relative_level * 2))
-        
-        x = ZENTRUM + offset_x + radius * math.cos(angle)
-        y = ZENTRUM + offset_y + radius * math.sin(angle)
-        
-        # Galaxie-Größe basierend auf Durchmesser
-        groesse = max(5, math.log(galaxie['durchmesser_lj']) * 2)
-        
+    culled = 0
+    for i, x, y in zip(treffer, xs, ys):
+        galaxie = katalog.galaxie(i)
+        gewaehlt = galaxie['name'] == selected_galaxie
+        if sichtbereich is not None and not gewaehlt and not punkt_sichtbar(x, y, galaxie['radius'], fenster):
+            culled += 1
+            continue
         galaxien.append({
             'name': galaxie['name'],
             'x': x,
             'y': y,
-            'radius': groesse,
+            'radius': galaxie['radius'],
+            'farbe': galaxie['farbe'],
             'entfernung_lj': galaxie['entfernung_lj'],
             'durchmesser_lj': galaxie['durchmesser_lj'],
             'sterne_anzahl': galaxie['sterne'],
-            'selected': (galaxie['name'] == selected_galaxie)
+            # Treffer sind nach Priorität sortiert
+            'beschriftung': len(galaxien) < GALAXIEN_MAX_BESCHRIFTUNGEN,
+            'selected': gewaehlt
         })
-    
+
     return {
         'ebene': 'galaxien',
         'galaxien': galaxien,
         'milchstrasse': {
             'name': 'Milchstraße',
-            'x': ZENTRUM + offset_x,
-            'y': ZENTRUM + offset_y,
+            'x': mitte_x,
+            'y': mitte_y,
             'radius': 15,
             'selected': ('Milchstraße' == selected_galaxie)
+        },
+        'zoom_info': {
+            'max_entfernung': max_entfernung,
+            'relative_level': relative_level,
+            'anzahl_galaxien': len(galaxien),
+            'culled': culled
         }
     }
 
-def calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet=None):
-    """Berechnet Sonnensystem-Daten separat"""
+def parse_datum(datum_uhrzeit_str):
+    """Wandelt den Datums-String des Clients in ein datetime um (Fallback: jetzt)"""
     try:
-        beobachtungszeit = ephem.Date(datum_uhrzeit_str)
+        return datetime.strptime(datum_uhrzeit_str, "%Y/%m/%d %H:%M:%S")
     except:
-        beobachtungszeit = ephem.Date(datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
-    
-    center_x = ZENTRUM + offset_x
-    center_y = ZENTRUM + offset_y
+        pass
+    try:
+        return ephem.Date(datum_uhrzeit_str).datetime().replace(microsecond=0)
+    except:
+        return datetime.now().replace(microsecond=0)
 
-    sonnen_radius = get_sonnen_radius(zoom_level)
+def verschiebe_datum(datum, schritt, anzahl):
+    """Verschiebt ein Datum um Tage/Monate/Jahre wie Date.setDate/setMonth/setFullYear im Client"""
+    if schritt == 'day':
+        return datum + timedelta(days=anzahl)
 
-    planeten = []
-    umlaufbahnen = []
-    
-    show_outer_orbits = zoom_level <= 15
-    planet_names = ['Merkur', 'Venus', 'Erde', 'Mars', 'Jupiter', 'Saturn']
-    if show_outer_orbits:
-        planet_names.extend(['Uranus', 'Neptun', 'Pluto'])
-    
-    for name in planet_names:
-        radius = get_radius_for_planet(name, zoom_level, sonnen_radius)
-        umlaufbahnen.append({'name': name, 'radius': radius})
+    if schritt == 'month':
+        monate = datum.year * 12 + (datum.month - 1) + anzahl
+        jahr, monat = divmod(monate, 12)
+        monat += 1
+    elif schritt == 'year':
+        jahr, monat = datum.year + anzahl, datum.month
+    else:
+        raise ValueError(f"Unbekannter Zeitschritt: {schritt}")
+
+    # Überlauf wie in JavaScript: 31. Januar + 1 Monat = 2./3. März
+    return datetime(jahr, monat, 1, datum.hour, datum.minute, datum.second) + timedelta(days=datum.day - 1)
 
-    max_visible_radius = get_radius_for_planet('Pluto', zoom_level, sonnen_radius) if show_outer_orbits else get_radius_for_planet('Saturn', zoom_level, sonnen_radius)
-    zodiak_radius = max_visible_radius + UMRANDE_GROESSE
+def berechne_helio_laengen(beobachtungszeiten):
+    """Heliozentrische Längen für mehrere Zeitpunkte: aus der Ephemeriden-Tabelle,
+    nur Zeitpunkte außerhalb (oder vor Fertigstellung) der Tabelle rechnet ephem live.
+    Ergebnis: eine Liste {Name: Länge in rad} je Zeitpunkt.
+    """
+    laengen = [None] * len(beobachtungszeiten)
+    fehlend = []
+
+    for i, beobachtungszeit in enumerate(beobachtungszeiten):
+        roh = EPHEMERIDEN_TABELLE.laengen(beobachtungszeit)
+        if roh is None:
+            fehlend.append(i)
+            continue
+        erde = roh.pop('Sonne_Geo')
+        # Gleiche Konvention wie die Live-Berechnung: Erde = Sonnenlänge - 180°
+        roh['Erde'] = erde - math.pi
+        laengen[i] = roh
+
+    if fehlend:
+        live = berechne_helio_laengen_live([beobachtungszeiten[i] for i in fehlend])
+        for i, werte in zip(fehlend, live):
+            laengen[i] = werte
+
+    return laengen
+
+def berechne_helio_laengen_live(beobachtungszeiten):
+    """Berechnet heliozentrische Längen für mehrere Zeitpunkte direkt mit ephem.
+
+    Pro Himmelskörper wird nur ein ephem-Objekt erzeugt und für alle Zeitpunkte
+    wiederverwendet. Ergebnis: eine Liste {Name: Länge in rad} je Zeitpunkt.
+    """
+    laengen = [{} for _ in beobachtungszeiten]
 
     for name_key, planet_class in HELIOCENTRIC_OBJEKTE.items():
-        name_zur_anzeige = name_key
-        
-        if name_key == 'Sonne_Geo':
+        obj = planet_class()
+        for i, beobachtungszeit in enumerate(beobachtungszeiten):
             try:
-                obj = planet_class()
                 obj.compute(beobachtungszeit)
-                helio_lon_rad = obj.hlong - math.pi  
-                name_key_orbit = 'Erde'
-                farbe = PLANETEN_FARBEN['Erde']
-                name_zur_anzeige = 'Erde'
+                if name_key == 'Sonne_Geo':
+                    # Geozentrische Sonnenlänge - 180° = heliozentrische Erdlänge
+                    laengen[i]['Erde'] = obj.hlong - math.pi
+                else:
+                    laengen[i][name_key] = float(obj.hlong)
             except:
                 continue
-        else:
-            try:
-                obj = planet_class(beobachtungszeit) 
-                helio_lon_rad = obj.hlong 
-                name_key_orbit = name_key
-                farbe = PLANETEN_FARBEN[name_key]
-            except:
-                continue
-        
-        if not show_outer_orbits and name_key_orbit in ['Uranus', 'Neptun', 'Pluto']:
-            continue
-            
-        orbit_radius = get_radius_for_planet(name_key_orbit, zoom_level, sonnen_radius)
-        point_radius = get_planet_diameter(name_key_orbit, zoom_level) / 2
-        
-        angle_rad = float(helio_lon_rad)
-        x = center_x + orbit_radius * math.cos(angle_rad)
-        y = center_y - orbit_radius * math.sin(angle_rad)
 
-        planeten.append({
-            'name': name_zur_anzeige,
-            'x': x,
-            'y': y,
-            'point_radius': point_radius,
-            'farbe': farbe,
+    return laengen
+
+def berechne_koerper_laengen(name, zeiten):
+    """Heliozentrische Längen eines Körpers (rad) für viele Zeitpunkte direkt mit ephem"""
+    if name == 'Erde':
+        obj = HELIOCENTRIC_OBJEKTE['Sonne_Geo']()
+        versatz = math.pi
+    else:
+        obj = HELIOCENTRIC_OBJEKTE[name]()
+        versatz = 0.0
+    laengen = []
+    for zeit in zeiten:
+        obj.compute(zeit)
+        laengen.append(float(obj.hlong) - versatz)
+    return laengen
+
+EPHEMERIDEN_KOERPER = [name for name in HELIOCENTRIC_OBJEKTE if name != 'Sonne_Geo'] + ['Erde']
+
+@lru_cache(maxsize=16)
+def tschebyschow_antwort(start, ende):
+    """Koeffizientendatei für [start, ende) samt ETag"""
+    body = tschebyschow.exportiere(berechne_koerper_laengen, EPHEMERIDEN_KOERPER, start, ende)
+    return body, hashlib.sha1(body).hexdigest()
+
+EREIGNIS_SUCHE = EreignisSuche(
+    berechne_helio_laengen, ZODIAC_ZEICHEN, cache_bloecke=app.config['EREIGNIS_CACHE_BLOECKE']
+)
+
+def berechne_sonnensystem_layout(zoom_level):
+    """Zoom-abhängige, zeitunabhängige Geometrie der Sonnensystem-Ebene.
+
+    Enthält keine Positionen: Bahnradien, Punktgrößen und Zodiak werden später
+    mit den heliozentrischen Längen eines Zeitpunkts kombiniert.
+    """
+    geometrie = get_zoom_geometrie(zoom_level)
+    sonnen_radius = geometrie['sonnen_radius']
+
+    show_outer_orbits = zoom_level <= 15
+    planet_names = ['Merkur', 'Venus', 'Erde', 'Mars', 'Jupiter', 'Saturn']
+    if show_outer_orbits:
+        planet_names.extend(['Uranus', 'Neptun', 'Pluto'])
+
+    umlaufbahnen = []
+    planeten = {}
+    for name in planet_names:
+        orbit_radius = geometrie['orbit_radius'][name]
+        umlaufbahnen.append({'name': name, 'radius': orbit_radius})
+        planeten[name] = {
             'orbit_radius': orbit_radius,
-            'helio_lon_rad': angle_rad,
-            'selected': (name_zur_anzeige == selected_planet)
-        })
+            'point_radius': geometrie['planet_durchmesser'][name] / 2,
+            'farbe': PLANETEN_FARBEN[name]
+        }
+
+    # Äußerste sichtbare Bahn (Pluto bzw. Saturn) plus Rand
+    zodiak_radius = umlaufbahnen[-1]['radius'] + UMRANDE_GROESSE
 
     if zoom_level <= -5:
         modus_anzeige = "DIDAKTISCH"
@@ -568,12 +978,10 @@ def calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_
 
     return {
         'ebene': 'sonnensystem',
+        'zoom_level': zoom_level,
         'sonne': {
             'radius': sonnen_radius,
-            'x': center_x,
-            'y': center_y,
-            'farbe': PLANETEN_FARBEN['Sonne'],
-            'selected': ('Sonne' == selected_planet)
+            'farbe': PLANETEN_FARBEN['Sonne']
         },
         'planeten': planeten,
         'umlaufbahnen': umlaufbahnen,
@@ -582,55 +990,877 @@ def calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_
             'zeichen': ZODIAC_ZEICHEN,
             'show': zoom_level <= 3
         },
-        'selected_planet_info': PLANETEN_INFO.get(selected_planet) if selected_planet else None,
         'status': {
             'zoom_level': zoom_level,
             'modus_anzeige': modus_anzeige,
-            'datum_uhrzeit_str': datum_uhrzeit_str,
-            'sonnen_radius_info': f"Sonne: {sonnen_radius*2:.1f}px",
-            'selected_planet': selected_planet
+            'sonnen_radius_info': f"Sonne: {sonnen_radius*2:.1f}px"
         }
     }
 
-def calculate_planet_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet=None):
+def erzeuge_planeten(helio_laengen, layout, center_x, center_y, selected_planet=None):
+    """Erzeugt die Planeteneinträge einer Ansicht aus Layout und heliozentrischen Längen"""
+    planeten = []
+    # Bahnen, die bei dieser Zoomstufe ausgeblendet sind, fallen weg
+    sichtbar = [(name, float(lon)) for name, lon in helio_laengen.items() if name in layout['planeten']]
+    xs, ys = PROJEKTION.polar(
+        center_x, center_y,
+        [layout['planeten'][name]['orbit_radius'] for name, _ in sichtbar],
+        [angle_rad for _, angle_rad in sichtbar],
+        y_richtung=-1
+    )
+
+    for (name, angle_rad), x, y in zip(sichtbar, xs, ys):
+        geometrie = layout['planeten'][name]
+        orbit_radius = geometrie['orbit_radius']
+
+        planeten.append({
+            'name': name,
+            'x': x,
+            'y': y,
+            'point_radius': geometrie['point_radius'],
+            'farbe': geometrie['farbe'],
+            'orbit_radius': orbit_radius,
+            'helio_lon_rad': angle_rad,
+            'selected': (name == selected_planet)
+        })
+
+    return planeten
+
+def calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet=None, sichtbereich=None,
+                                helio_laengen=None):
+    """Berechnet Sonnensystem-Daten separat.
+    `sichtbereich` (x0, y0, x1, y1) lässt Planeten und Bahnen außerhalb des Fensters weg;
+    `helio_laengen` (falls schon berechnet, z.B. für mehrere Zoomstufen) spart ephem."""
+    with stufe('datum'):
+        try:
+            beobachtungszeit = ephem.Date(datum_uhrzeit_str)
+        except:
+            beobachtungszeit = ephem.Date(datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
+    
+    center_x = ZENTRUM + offset_x
+    center_y = ZENTRUM + offset_y
+
+    with stufe('geometrie'):
+        layout = berechne_sonnensystem_layout(zoom_level)
+    if helio_laengen is None:
+        with stufe('ephemeriden'):
+            helio_laengen = berechne_helio_laengen([beobachtungszeit])[0]
+    with stufe('geometrie'):
+        planeten = erzeuge_planeten(helio_laengen, layout, center_x, center_y, selected_planet)
+
+    sonne = {
+        'radius': layout['sonne']['radius'],
+        'x': center_x,
+        'y': center_y,
+        'farbe': layout['sonne']['farbe'],
+        'selected': ('Sonne' == selected_planet)
+    }
+    umlaufbahnen = layout['umlaufbahnen']
+    culled = 0
+    if sichtbereich is not None:
+        with stufe('geometrie'):
+            planeten, umlaufbahnen, culled = sichtbares_sonnensystem(
+                planeten, umlaufbahnen, sonne, layout['zodiak'], sichtbereich
+            )
+
+    with stufe('aufbau'):
+        return {
+            'ebene': 'sonnensystem',
+            'sonne': sonne,
+            'planeten': planeten,
+            'umlaufbahnen': umlaufbahnen,
+            'zodiak': layout['zodiak'],
+            'selected_planet_info': PLANETEN_INFO.get(selected_planet) if selected_planet else None,
+            'status': {
+                **layout['status'],
+                'datum_uhrzeit_str': datum_uhrzeit_str,
+                'selected_planet': selected_planet
+            },
+            'zoom_info': {
+                'culled': culled
+            }
+        }
+
+def calculate_planet_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet=None, sichtbereich=None):
     """Berechnet alle Planetenpositionen - mit korrigierter Ebenen-Logik"""
     current_range = get_current_level_range(zoom_level)
     
-    # DEBUG: Ausgabe für Zoom-Level
-    print(f"DEBUG: Zoom Level: {zoom_level}, Range: {current_range}")
+    # DEBUG: Ausgabe für Zoom-Level (nur als Stichprobe, siehe LOG_STICHPROBE)
+    if LOG_STICHPROBE and random.random() < LOG_STICHPROBE:
+        logger.debug("Zoom Level: %s, Range: %s", zoom_level, current_range)
     
     if current_range == 'milchstrasse':
-        return calculate_milchstrasse_data(zoom_level, offset_x, offset_y, selected_planet)
+        with stufe('geometrie'):
+            return calculate_milchstrasse_data(zoom_level, offset_x, offset_y, selected_planet, sichtbereich)
     elif current_range == 'galaxien':
-        return calculate_galaxien_data(zoom_level, offset_x, offset_y, selected_planet)
+        with stufe('geometrie'):
+            return calculate_galaxien_data(zoom_level, offset_x, offset_y, selected_planet, sichtbereich)
     else:
         # Sonnensystem
-        return calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet)
+        return calculate_sonnensystem_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet, sichtbereich)
+
+def normalisiere_zoom(wert):
+    """Zoom aus Query-Parametern: ganzzahlige Werte als int, sonst float, ungültig → None"""
+    try:
+        zoom_level = float(wert)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(zoom_level):
+        return None
+    return int(zoom_level) if zoom_level.is_integer() else zoom_level
+
+def lese_offsets(data):
+    """Verschiebung aus der Anfrage. Mit 'relativ' liegt das Zentrum bei (0, 0) und
+    der Client verschiebt selbst, sodass Verschieben keine Serveranfrage braucht."""
+    if data.get('relativ', False):
+        return -ZENTRUM, -ZENTRUM, True
+    return data.get('offset_x', 0), data.get('offset_y', 0), False
+
+def runde_laengen(laengen):
+    """Rundet Längen für die Übertragung (1e-6 rad liegt unter der Tabellengenauigkeit)"""
+    return {name: round(lon, 6) for name, lon in laengen.items()}
+
+@lru_cache(maxsize=128)
+def layout_antwort(zoom_level):
+    """Serialisiertes Layout einer Zoomstufe samt starkem ETag"""
+    layout = berechne_sonnensystem_layout(zoom_level)
+    layout['planeten_info'] = PLANETEN_INFO
+    body = json.dumps(layout, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+    return body, etag
+
+_STATIC_HASHES = {}
+
+@app.template_global()
+def static_url(dateiname):
+    """URL einer statischen Datei mit Inhalts-Hash (?v=...); neu berechnet, wenn sich die Datei ändert"""
+    return url_for('static', filename=dateiname, v=static_hash(dateiname))
+
+def static_hash(dateiname):
+    pfad = os.path.join(app.static_folder, dateiname)
+    try:
+        mtime = os.stat(pfad).st_mtime_ns
+    except OSError:
+        return None
+    eintrag = _STATIC_HASHES.get(dateiname)
+    if eintrag is None or eintrag[0] != mtime:
+        with open(pfad, 'rb') as datei:
+            eintrag = (mtime, hashlib.sha1(datei.read()).hexdigest()[:12])
+        _STATIC_HASHES[dateiname] = eintrag
+    return eintrag[1]
+
+@app.before_request
+def starte_aufwaermen():
+    # WSGI-Server ohne eigenen Einstieg (z.B. gunicorn app:application)
+    AUFWAERMEN.starten()
+
+@app.after_request
+def http_caching_und_kompression(response):
+    if request.endpoint == 'static' and response.status_code in (200, 304):
+        dateiname = request.view_args.get('filename', '')
+        if request.args.get('v') and request.args.get('v') == static_hash(dateiname):
+            # Hash in der URL: Inhalt ändert sich nie, neue Version = neue URL
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+    return komprimiere_antwort(response)
+
+def komprimiere_antwort(response):
+    """gzip/Brotli nach Accept-Encoding; komprimierte Varianten bekommen eigene ETags"""
+    if not komprimierung.ist_komprimierbar(response.mimetype) or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or (response.is_streamed and request.endpoint != 'static'):
+        # Server-Sent Events u.ä. nicht puffern
+        return response
+
+    kodierung = komprimierung.waehle_kodierung(request.headers.get('Accept-Encoding'))
+    if kodierung is None:
+        return response
+
+    response.direct_passthrough = False
+    body = response.get_data()
+    if len(body) < KOMPRIMIERUNG_AB:
+        return response
+
+    etag, schwach = response.get_etag()
+    if etag:
+        komprimiert = KOMPRESSIONS_CACHE.hole_oder_komprimiere(etag, kodierung, body)
+        response.set_etag(f"{etag}-{kodierung}", weak=schwach)
+    else:
+        komprimiert = komprimierung.komprimieren(body, kodierung)
+    response.set_data(komprimiert)
+    response.headers['Content-Encoding'] = kodierung
+    # Bedingte Anfrage mit dem ETag der komprimierten Variante → 304
+    return response.make_conditional(request)
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    response = app.response_class(render_template('index.html'), mimetype='text/html')
+    # Die Seite verweist auf gehashte statische URLs und muss daher immer revalidiert werden
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def planet_data_antwort(data, accept=None, accept_encoding=None, messung=None, pool=None):
+    """Body, Statuscode, Content-Type und Content-Encoding (oder None) für
+    /api/planet_data. Braucht keinen Request-Kontext, damit auch der ASGI-Pfad
+    (asgi.py) sie im Thread-Pool aufrufen kann. `accept` wählt das Format
+    (siehe drahtformat.py), `accept_encoding` die Kompression; beides ist Teil
+    des Cache-Schlüssels, gepackt wird also nur einmal pro Variante.
+    Stufenzeiten gehen in STUFEN_ZEITEN und, falls übergeben, in `messung`
+    (für den Server-Timing-Header). Mit `pool` (z.B. ein Prozesspool) läuft
+    nur die Berechnung bei einem Cache-Fehlschlag dort; Cache, Zusammenfassen
+    und Zähler bleiben in diesem Prozess."""
+    with messung if messung is not None else Messung(STUFEN_ZEITEN):
+        return _planet_data_antwort(data, accept, accept_encoding, pool)
+
+def planet_data_body(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet, sichtbereich, format, kodierung):
+    """Berechnet, serialisiert und komprimiert eine Ansicht; liefert (Body,
+    Content-Encoding oder None). Läuft auch im Prozess-Pool (asgi.py)."""
+    EPHEMERIDEN_TABELLE.mitlesen()
+    planet_data = calculate_planet_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet, sichtbereich)
+    with stufe('serialisierung'):
+        if format == drahtformat.JSON:
+            body = app.json.dumps(planet_data, separators=(',', ':')).encode('utf-8')
+        else:
+            body = drahtformat.kodiere(planet_data, format)
+    if kodierung is None or len(body) < KOMPRIMIERUNG_AB:
+        return body, None
+    with stufe('kompression'):
+        return komprimierung.komprimieren(body, kodierung), kodierung
+
+def _planet_data_antwort(data, accept, accept_encoding, pool):
+    datum_uhrzeit_str = data.get('datum', datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
+    zoom_level = data.get('zoom_level', -10)
+    offset_x, offset_y, relativ = lese_offsets(data)
+    selected_planet = data.get('selected_planet')
+    format = drahtformat.waehle_format(accept)
+    kodierung = komprimierung.waehle_kodierung(accept_encoding)
+    
+    try:
+        # Datum auf die Sekunde normalisiert; außerhalb des Sonnensystems spielt es keine Rolle
+        ebene = get_current_level_range(zoom_level)
+        setze_ebene(ebene)
+        if ebene == 'sonnensystem':
+            with stufe('datum'):
+                datum_uhrzeit_str = parse_datum(datum_uhrzeit_str).strftime("%Y/%m/%d %H:%M:%S")
+            datum_schluessel = datum_uhrzeit_str
+        else:
+            datum_schluessel = None
+        # Relative Antworten sind unabhängig von der Verschiebung
+        offset_schluessel = 'relativ' if relativ else (offset_x, offset_y)
+        schluessel = (datum_schluessel, zoom_level, offset_schluessel, selected_planet, format, kodierung)
+
+        # Relativ verschiebt der Client selbst, dann gibt es keinen festen Ausschnitt
+        sichtbereich = None if relativ else (0, 0, FENSTER_GROESSE, FENSTER_GROESSE)
+
+        argumente = (datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet, sichtbereich, format, kodierung)
+
+        def berechnen():
+            if pool is None:
+                return planet_data_body(*argumente)
+            return pool.submit(planet_data_body, *argumente).result()
+
+        body, content_encoding = PLANET_DATA_CACHE.hole_oder_berechne(schluessel, berechnen)
+        return body, 200, format, content_encoding
+    except Exception as e:
+        return app.json.dumps({'error': str(e)}).encode('utf-8'), 500, drahtformat.JSON, None
+
+def server_timing_gewuenscht(wert):
+    """Opt-in pro Anfrage über den Header X-Server-Timing: 1 (wenn SERVER_TIMING erlaubt)"""
+    return SERVER_TIMING and wert in ('1', 'true')
+
+def planet_data_response(data):
+    messung = Messung(STUFEN_ZEITEN) if server_timing_gewuenscht(request.headers.get('X-Server-Timing')) else None
+    body, status, format, content_encoding = planet_data_antwort(
+        data, request.headers.get('Accept'), request.headers.get('Accept-Encoding'), messung
+    )
+    response = app.response_class(body, status=status, mimetype=format)
+    response.vary.add('Accept')
+    response.vary.add('Accept-Encoding')
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    if messung is not None:
+        response.headers['Server-Timing'] = messung.server_timing()
+    return response
 
 @app.route('/api/planet_data', methods=['POST'])
 def get_planet_data():
+    return planet_data_response(request.json)
+
+def kanonische_planet_data_anfrage(args):
+    """Anfrage-Daten und kanonischer Query-String für GET /api/planet_data,
+    oder (None, Fehlermeldung). Kanonisch: feste Reihenfolge, normalisierte
+    Werte, nichts Überflüssiges (z.B. kein Datum außerhalb des Sonnensystems)."""
+    zoom_level = normalisiere_zoom(args.get('zoom_level', -10))
+    if zoom_level is None:
+        return None, 'zoom_level muss eine Zahl sein'
+
+    data = {'zoom_level': zoom_level}
+    parameter = []
+    if 'datum' in args and get_current_level_range(zoom_level) == 'sonnensystem':
+        try:
+            ephem.Date(args['datum'])
+        except Exception:
+            # parse_datum fiele still auf "jetzt" zurück, das wäre als Cache-URL falsch
+            return None, f"Ungültiges Datum: {args['datum']}"
+        data['datum'] = parse_datum(args['datum']).strftime("%Y/%m/%d %H:%M:%S")
+        parameter.append(('datum', data['datum']))
+
+    if args.get('relativ') in ('1', 'true'):
+        data['relativ'] = True
+        parameter.append(('relativ', '1'))
+    else:
+        for name in ('offset_x', 'offset_y'):
+            wert = normalisiere_zoom(args.get(name, 0))
+            if wert is None:
+                return None, f"{name} muss eine Zahl sein"
+            data[name] = wert
+            if wert:
+                parameter.append((name, str(wert)))
+
+    if args.get('selected_planet'):
+        data['selected_planet'] = args['selected_planet']
+        parameter.append(('selected_planet', args['selected_planet']))
+    parameter.append(('zoom_level', str(zoom_level)))
+    return data, urlencode(parameter, quote_via=quote, safe='/:')
+
+@app.route('/api/planet_data', methods=['GET'])
+def get_planet_data_cachebar():
+    """Cachebare GET-Variante von /api/planet_data für Reverse-Proxies.
+    Nicht kanonische Query-Strings werden auf die kanonische URL umgeleitet,
+    damit jede Ansicht genau einen Cache-Eintrag hat."""
+    data, kanonisch = kanonische_planet_data_anfrage(request.args)
+    if data is None:
+        return jsonify({'error': kanonisch}), 400
+    if request.query_string.decode('latin-1') != kanonisch:
+        response = redirect(f"{request.path}?{kanonisch}", code=308)
+        response.cache_control.public = True
+        response.cache_control.max_age = LAYOUT_MAX_AGE
+        return response
+
+    response = planet_data_response(data)
+    if response.status_code == 200:
+        # Je Format und Kompression eigene Bytes, also auch eigener ETag
+        response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+        response.cache_control.public = True
+        if 'datum' in data or get_current_level_range(data['zoom_level']) != 'sonnensystem':
+            # Fester Zeitpunkt bzw. zeitunabhängige Ebene: Antwort ändert sich nicht
+            response.cache_control.max_age = LAYOUT_MAX_AGE
+        else:
+            # "Jetzt": höchstens eine Sekunde alt
+            response.cache_control.max_age = 1
+    return response.make_conditional(request)
+
+@app.route('/api/cache_statistik', methods=['GET'])
+def get_cache_statistik():
+    """Treffer-/Fehlschlag-Zähler des Ergebnis-Caches von /api/planet_data"""
+    return jsonify(PLANET_DATA_CACHE.statistik())
+
+@app.route('/api/planet_timeline', methods=['POST'])
+def get_planet_timeline():
+    """Liefert mehrere Wiedergabe-Frames (Tag/Monat/Jahr-Schritte) in einer Antwort"""
     data = request.json
     datum_uhrzeit_str = data.get('datum', datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
+    schritt = data.get('schritt', 'day')
+    richtung = data.get('richtung', 1)
+    anzahl_frames = data.get('anzahl_frames', 10)
     zoom_level = data.get('zoom_level', -10)
-    offset_x = data.get('offset_x', 0)
-    offset_y = data.get('offset_y', 0)
+    offset_x, offset_y, _ = lese_offsets(data)
     selected_planet = data.get('selected_planet')
-    
+    nur_laengen = bool(data.get('nur_laengen', False))
+
+    if schritt not in ('day', 'month', 'year'):
+        return jsonify({'error': f"Unbekannter Zeitschritt: {schritt}"}), 400
     try:
-        planet_data = calculate_planet_data(datum_uhrzeit_str, zoom_level, offset_x, offset_y, selected_planet)
-        return jsonify(planet_data)
+        anzahl_frames = max(1, min(int(anzahl_frames), MAX_TIMELINE_FRAMES))
+        richtung = 1 if int(richtung) >= 0 else -1
+    except (TypeError, ValueError):
+        return jsonify({'error': 'anzahl_frames und richtung müssen Zahlen sein'}), 400
+
+    try:
+        # Frames beginnen NACH dem Startdatum, wie ein Wiedergabe-Tick im Client
+        start = parse_datum(datum_uhrzeit_str)
+        daten = []
+        datum = start
+        for _ in range(anzahl_frames):
+            datum = verschiebe_datum(datum, schritt, richtung)
+            daten.append(datum)
+        datum_strings = [d.strftime("%Y/%m/%d %H:%M:%S") for d in daten]
+
+        if nur_laengen and get_current_level_range(zoom_level) == 'sonnensystem':
+            # Client kombiniert selbst mit dem gecachten /api/layout
+            alle_laengen = berechne_helio_laengen([ephem.Date(d) for d in daten])
+            frames = [
+                {'datum': datum_string, 'laengen': runde_laengen(laengen)}
+                for datum_string, laengen in zip(datum_strings, alle_laengen)
+            ]
+            return jsonify({'frames': frames})
+
+        # Zeitunabhängige Teile (Bahnen, Zodiak, Status) nur einmal berechnen
+        basis = calculate_planet_data(datum_strings[0], zoom_level, offset_x, offset_y, selected_planet)
+
+        if basis['ebene'] == 'sonnensystem':
+            layout = berechne_sonnensystem_layout(zoom_level)
+            center_x = basis['sonne']['x']
+            center_y = basis['sonne']['y']
+            alle_laengen = berechne_helio_laengen([ephem.Date(d) for d in daten])
+            frames = [
+                {
+                    'datum': datum_string,
+                    'planeten': erzeuge_planeten(laengen, layout, center_x, center_y, selected_planet)
+                }
+                for datum_string, laengen in zip(datum_strings, alle_laengen)
+            ]
+        else:
+            # Milchstraße und Galaxien sind zeitunabhängig
+            frames = [{'datum': datum_string} for datum_string in datum_strings]
+
+        return jsonify({'basis': basis, 'frames': frames})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def lese_stapel_eintrag(eintrag):
+    """(datum, zoom_level, selected_planet) eines Stapel-Eintrags oder (None, Fehlertext).
+    Einträge sind Objekte wie bei /api/planet_data oder Listen [datum, zoom_level, selected_planet].
+    Das Datum ist auf die Sekunde normalisiert und außerhalb des Sonnensystems None,
+    gleiche Ansichten haben also denselben Schlüssel."""
+    if isinstance(eintrag, list) and 1 <= len(eintrag) <= 3:
+        eintrag = dict(zip(('datum', 'zoom_level', 'selected_planet'), eintrag))
+    if not isinstance(eintrag, dict):
+        return None, 'Eintrag muss ein Objekt oder eine Liste [datum, zoom_level, selected_planet] sein'
+
+    zoom_level = normalisiere_zoom(eintrag.get('zoom_level', -10))
+    if zoom_level is None:
+        return None, 'zoom_level muss eine Zahl sein'
+    selected_planet = eintrag.get('selected_planet')
+    if selected_planet is not None and not isinstance(selected_planet, str):
+        return None, 'selected_planet muss ein Name sein'
+    if get_current_level_range(zoom_level) != 'sonnensystem':
+        return (None, zoom_level, selected_planet), None
+
+    datum = eintrag.get('datum')
+    if datum is None:
+        return (datetime.now().strftime("%Y/%m/%d %H:%M:%S"), zoom_level, selected_planet), None
+    try:
+        ephem.Date(datum)
+    except Exception:
+        return None, f"Ungültiges Datum: {datum}"
+    return (parse_datum(datum).strftime("%Y/%m/%d %H:%M:%S"), zoom_level, selected_planet), None
+
+def berechne_stapel_gruppen(gruppen):
+    """Relative Sonnensystem-Ansichten, nach Datum gruppiert: `gruppen` ist
+    [(datum, [(zoom_level, selected_planet), ...]), ...]. Die Längen aller Daten
+    kommen aus einem berechne_helio_laengen-Aufruf, jede weitere Zoomstufe
+    desselben Datums ist nur noch Geometrie. Liefert je Ansicht JSON-Bytes oder
+    einen Fehlertext; läuft auch im Prozess-Pool (STAPEL_POOL)."""
+    EPHEMERIDEN_TABELLE.mitlesen()
+    alle_laengen = berechne_helio_laengen([ephem.Date(datum) for datum, _ in gruppen])
+    ergebnisse = []
+    for (datum, ansichten), laengen in zip(gruppen, alle_laengen):
+        for zoom_level, selected_planet in ansichten:
+            try:
+                planet_data = calculate_sonnensystem_data(
+                    datum, zoom_level, -ZENTRUM, -ZENTRUM, selected_planet, helio_laengen=laengen
+                )
+                ergebnisse.append(app.json.dumps(planet_data, separators=(',', ':')).encode('utf-8'))
+            except Exception as e:
+                ergebnisse.append(str(e))
+    return ergebnisse
+
+def stapel_zeilen(eintraege):
+    """NDJSON-Zeilen eines Stapels in Eingabereihenfolge.
+
+    Gearbeitet wird in Fenstern zu STAPEL_FENSTER Einträgen: neue Ansichten
+    eines Fensters werden nach Datum gruppiert (ein ephem-Durchlauf je Datum,
+    egal wie viele Zoomstufen) und bei mehreren Gruppen auf den Pool verteilt.
+    Fertige Antworten bleiben nur bis zu ihrer letzten Verwendung im Stapel
+    im Speicher.
+    """
+    letzte_verwendung = {schluessel: i for i, (schluessel, _) in enumerate(eintraege) if schluessel is not None}
+    fertig = {}
+    anzahl_fehler = 0
+
+    for anfang in range(0, len(eintraege), STAPEL_FENSTER):
+        fenster = eintraege[anfang:anfang + STAPEL_FENSTER]
+        gruppen = {}
+        for schluessel, _ in fenster:
+            if schluessel is None or schluessel in fertig:
+                continue
+            datum, zoom_level, selected_planet = schluessel
+            if datum is None:
+                # Milchstraße und Galaxien sind zeitunabhängig und schnell, immer hier
+                try:
+                    planet_data = calculate_planet_data(None, zoom_level, -ZENTRUM, -ZENTRUM, selected_planet)
+                    fertig[schluessel] = app.json.dumps(planet_data, separators=(',', ':')).encode('utf-8')
+                except Exception as e:
+                    fertig[schluessel] = str(e)
+                continue
+            ansichten = gruppen.setdefault(datum, [])
+            if (zoom_level, selected_planet) not in ansichten:
+                ansichten.append((zoom_level, selected_planet))
+
+        gruppen = list(gruppen.items())
+        if STAPEL_POOL is not None and len(gruppen) > 1:
+            teil_groesse = -(-len(gruppen) // STAPEL_POOL.prozesse)
+            teile = [gruppen[i:i + teil_groesse] for i in range(0, len(gruppen), teil_groesse)]
+            auftraege = [(teil, STAPEL_POOL.submit(berechne_stapel_gruppen, teil)) for teil in teile]
+            ergebnisse = [(teil, auftrag.result()) for teil, auftrag in auftraege]
+        else:
+            ergebnisse = [(gruppen, berechne_stapel_gruppen(gruppen))] if gruppen else []
+        for teil, werte in ergebnisse:
+            werte = iter(werte)
+            for datum, ansichten in teil:
+                for zoom_level, selected_planet in ansichten:
+                    fertig[(datum, zoom_level, selected_planet)] = next(werte)
+
+        zeilen = []
+        for i, (schluessel, fehler) in enumerate(fenster, anfang):
+            wert = fertig[schluessel] if schluessel is not None else fehler
+            if isinstance(wert, bytes):
+                zeilen.append(b'{"index":%d,"ansicht":%s}\n' % (i, wert))
+            else:
+                anzahl_fehler += 1
+                zeilen.append(json.dumps({'index': i, 'error': wert}, ensure_ascii=False).encode('utf-8') + b'\n')
+            if schluessel is not None and letzte_verwendung[schluessel] == i:
+                del fertig[schluessel]
+        yield b''.join(zeilen)
+
+    yield json.dumps({
+        'fertig': True,
+        'anzahl': len(eintraege),
+        'fehler': anzahl_fehler,
+        'ansichten': len(letzte_verwendung)
+    }).encode('utf-8') + b'\n'
+
+@app.route('/api/planet_batch', methods=['POST'])
+def get_planet_batch():
+    """Viele relative Ansichten in einem Aufruf, z.B. {"ansichten": [["2010/05/17", -10, "Erde"],
+    {"datum": "2011/02/03", "zoom_level": 5}, ...]}. Antwort als NDJSON in Eingabereihenfolge:
+    {"index": i, "ansicht": {...}} bzw. {"index": i, "error": "..."}, zuletzt
+    {"fertig": true, "anzahl": n, "fehler": k, "ansichten": m} (m = verschiedene Ansichten)"""
+    data = request.get_json(silent=True)
+    ansichten = data.get('ansichten') if isinstance(data, dict) else None
+    if not isinstance(ansichten, list):
+        return jsonify({'error': 'ansichten muss eine Liste sein'}), 400
+    if len(ansichten) > STAPEL_MAX_ANSICHTEN:
+        return jsonify({'error': f"Höchstens {STAPEL_MAX_ANSICHTEN} Ansichten pro Anfrage"}), 413
+
+    # Prüfen vorab, rechnen erst beim Streamen
+    eintraege = []
+    for eintrag in ansichten:
+        schluessel, fehler = lese_stapel_eintrag(eintrag)
+        eintraege.append((schluessel, None) if schluessel is not None else (None, fehler))
+    return Response(stapel_zeilen(eintraege), mimetype='application/x-ndjson')
+
+def runde_zeit(datum, sekunden):
+    """datetime auf ein Vielfaches von `sekunden` (seit 1970) abrunden"""
+    zeitstempel = (datum - datetime(1970, 1, 1)).total_seconds()
+    return datetime(1970, 1, 1) + timedelta(seconds=zeitstempel // sekunden * sekunden)
+
+@app.route('/api/bild', methods=['GET'])
+def get_bild():
+    """Zentrierte Ansicht als SVG oder PNG für Clients ohne Canvas (Kiosk).
+    Parameter: zoom_level, datum (optional, sonst jetzt), format=svg|png, groesse
+    (Pixel, 100-2400). Bilder werden nach (Ebene, Zoom, gerundete Zeit) gecacht."""
+    zoom_level = normalisiere_zoom(request.args.get('zoom_level', -10))
+    if zoom_level is None:
+        return jsonify({'error': 'zoom_level muss eine Zahl sein'}), 400
+    format = request.args.get('format', 'svg')
+    if format not in BILD_FORMATE:
+        return jsonify({'error': 'format muss svg oder png sein'}), 400
+    if format == 'png' and not darstellung.PNG_VERFUEGBAR:
+        return jsonify({'error': 'PNG braucht Pillow (pip install pillow), SVG geht immer'}), 501
+    try:
+        groesse = min(max(int(request.args.get('groesse', darstellung.FENSTER_GROESSE)), 100), 2400)
+    except ValueError:
+        return jsonify({'error': 'groesse muss eine ganze Zahl sein'}), 400
+
+    ebene = get_current_level_range(zoom_level)
+    fester_zeitpunkt = 'datum' in request.args
+    if ebene != 'sonnensystem':
+        zeit = None
+    elif fester_zeitpunkt:
+        try:
+            ephem.Date(request.args['datum'])
+        except Exception:
+            return jsonify({'error': f"Ungültiges Datum: {request.args['datum']}"}), 400
+        zeit = runde_zeit(parse_datum(request.args['datum']), BILD_ZEIT_RUNDUNG)
+    else:
+        zeit = runde_zeit(datetime.now(), BILD_ZEIT_RUNDUNG)
+
+    def rendern():
+        datum_uhrzeit_str = (zeit or datetime.now()).strftime("%Y/%m/%d %H:%M:%S")
+        planet_data = calculate_planet_data(
+            datum_uhrzeit_str, zoom_level, 0, 0, sichtbereich=(0, 0, FENSTER_GROESSE, FENSTER_GROESSE)
+        )
+        befehle = darstellung.szene(planet_data, zoom_level)
+        return darstellung.svg(befehle, groesse) if format == 'svg' else darstellung.png(befehle, groesse)
+
+    body = BILD_CACHE.hole_oder_berechne((ebene, zoom_level, zeit, format, groesse), rendern)
+    response = app.response_class(body, mimetype=BILD_FORMATE[format])
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    response.cache_control.public = True
+    if zeit is None or fester_zeitpunkt:
+        response.cache_control.max_age = LAYOUT_MAX_AGE
+    else:
+        # Bis zum nächsten Rundungsschritt gilt dasselbe Bild
+        response.cache_control.max_age = max(1, int((zeit - datetime.now()).total_seconds()) + BILD_ZEIT_RUNDUNG)
+    return response.make_conditional(request)
+
+@app.route('/api/layout', methods=['GET'])
+def get_layout():
+    """Zeitunabhängige Geometrie einer Zoomstufe, per ETag und Cache-Control cachebar"""
+    zoom_level = normalisiere_zoom(request.args.get('zoom_level', -10))
+    if zoom_level is None:
+        return jsonify({'error': 'zoom_level muss eine Zahl sein'}), 400
+    if get_current_level_range(zoom_level) != 'sonnensystem':
+        return jsonify({'error': 'Layout gibt es nur für die Sonnensystem-Ebene'}), 400
+
+    body, etag = layout_antwort(zoom_level)
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = LAYOUT_MAX_AGE
+    return response.make_conditional(request)
+
+@app.route('/api/planet_positions', methods=['GET'])
+def get_planet_positions():
+    """Minimaler Zeit-Endpunkt: nur Name → heliozentrische Länge"""
+    datum_uhrzeit_str = request.args.get('datum', datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
+    try:
+        beobachtungszeit = ephem.Date(datum_uhrzeit_str)
+    except:
+        return jsonify({'error': f"Ungültiges Datum: {datum_uhrzeit_str}"}), 400
+
+    laengen = berechne_helio_laengen([beobachtungszeit])[0]
+    response = jsonify({'datum': datum_uhrzeit_str, 'laengen': runde_laengen(laengen)})
+    response.cache_control.public = True
+    if 'datum' in request.args:
+        # Fester Zeitpunkt: Antwort ändert sich nicht
+        response.cache_control.max_age = LAYOUT_MAX_AGE
+    else:
+        # "Jetzt": höchstens eine Sekunde alt
+        response.cache_control.max_age = 1
+    return response
+
+def lese_ereignis_anfrage(args):
+    """(start, ende, arten, koerper) aus den Query-Parametern oder (None, Fehlertext)"""
+    try:
+        start = ephem.Date(args['start'])
+        ende = ephem.Date(args['ende'])
+    except (KeyError, ValueError, TypeError):
+        return None, 'start und ende müssen gültige Daten sein (z.B. 2020/01/01)'
+    if not 0 < ende - start <= EREIGNIS_MAX_TAGE:
+        return None, f"ende muss nach start liegen, höchstens {EREIGNIS_MAX_TAGE} Tage"
+
+    arten = tuple(filter(None, args.get('arten', ','.join(EREIGNIS_ARTEN)).split(',')))
+    unbekannt = [art for art in arten if art not in EREIGNIS_ARTEN]
+    if unbekannt or not arten:
+        return None, f"Unbekannte Ereignisarten: {', '.join(unbekannt)} (erlaubt: {', '.join(EREIGNIS_ARTEN)})"
+
+    koerper = tuple(filter(None, args.get('koerper', '').split(','))) or None
+    if koerper and any(name not in EPHEMERIDEN_KOERPER for name in koerper):
+        return None, f"Unbekannte Körper (erlaubt: {', '.join(EPHEMERIDEN_KOERPER)})"
+    return (float(start), float(ende), arten, koerper), None
+
+@app.route('/api/ereignisse', methods=['GET'])
+def get_ereignisse():
+    """Konjunktionen, Oppositionen und Tierkreis-Eintritte (heliozentrisch) in einem
+    Zeitraum als NDJSON: eine Zeile pro Ereignis, zeitlich sortiert, blockweise
+    gestreamt; die letzte Zeile ist {"fertig": true, "anzahl": n}"""
+    anfrage, fehler = lese_ereignis_anfrage(request.args)
+    if anfrage is None:
+        return jsonify({'error': fehler}), 400
+    start, ende, arten, koerper = anfrage
+
+    def zeilen():
+        anzahl = 0
+        # Ein Teil pro Block: der Server (auch asgi.py) gibt ihn sofort weiter
+        for ereignisse in EREIGNIS_SUCHE.bloecke(start, ende, arten, koerper):
+            if ereignisse:
+                anzahl += len(ereignisse)
+                yield ''.join(json.dumps(ereignis, ensure_ascii=False, separators=(',', ':')) + '\n' for ereignis in ereignisse)
+        yield json.dumps({'fertig': True, 'anzahl': anzahl}) + '\n'
+
+    response = Response(zeilen(), mimetype='application/x-ndjson')
+    # Ergebnis hängt nur von der Anfrage ab
+    response.cache_control.public = True
+    response.cache_control.max_age = LAYOUT_MAX_AGE
+    # Reverse-Proxys (nginx) sollen die Zeilen nicht bis zum Ende sammeln
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/ephemeriden', methods=['GET'])
+def get_ephemeriden():
+    """Tschebyschow-Koeffizienten der heliozentrischen Längen für einen Zeitraum
+    (Format siehe tschebyschow.py); der Browser rechnet Wiedergabe-Frames damit
+    selbst und fragt erst beim Verlassen des Zeitraums wieder an"""
+    try:
+        start = ephem.Date(request.args['start'])
+        ende = ephem.Date(request.args['ende'])
+    except (KeyError, ValueError, TypeError):
+        return jsonify({'error': 'start und ende müssen gültige Daten sein (z.B. 2020/01/01)'}), 400
+    if not 0 < ende - start <= TSCHEBYSCHOW_MAX_TAGE:
+        return jsonify({'error': f"ende muss nach start liegen, höchstens {TSCHEBYSCHOW_MAX_TAGE} Tage"}), 400
+
+    body, etag = tschebyschow_antwort(float(start), float(ende))
+    response = app.response_class(body, mimetype=tschebyschow.MEDIENTYP)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = LAYOUT_MAX_AGE
+    return response.make_conditional(request)
+
+def stream_nachricht(kanal):
+    """Eine Stream-Nachricht pro Takt, geteilt von allen Abonnenten eines Kanals"""
+    ebene, _ = kanal
+    datum_uhrzeit_str = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+    nachricht = {'datum': datum_uhrzeit_str, 'ebene': ebene}
+    if ebene == 'sonnensystem':
+        laengen = berechne_helio_laengen([ephem.Date(parse_datum(datum_uhrzeit_str))])[0]
+        nachricht['laengen'] = runde_laengen(laengen)
+    return json.dumps(nachricht, ensure_ascii=False, separators=(',', ':'))
+
+STREAM_VERTEILER = Verteiler(stream_nachricht, STREAM_PUFFER)
+
+def lese_stream_kanal(args):
+    """Kanal (Ebene, Intervall) aus den Query-Parametern, None bei ungültigen Werten"""
+    zoom_level = normalisiere_zoom(args.get('zoom_level', -10))
+    try:
+        intervall = float(args.get('intervall', 1.0))
+    except (TypeError, ValueError):
+        return None
+    if zoom_level is None or not math.isfinite(intervall):
+        return None
+    intervall = min(max(intervall, STREAM_INTERVALL_MIN), STREAM_INTERVALL_MAX)
+    # Nur die Ebene bestimmt den Inhalt; so teilen sich alle Zoomstufen einer Ebene den Kanal
+    return (get_current_level_range(zoom_level), intervall)
+
+@app.route('/api/stream', methods=['GET'])
+def get_stream():
+    """Server-Sent Events: heliozentrische Längen im gewünschten Takt"""
+    kanal = lese_stream_kanal(request.args)
+    if kanal is None:
+        return jsonify({'error': 'zoom_level und intervall müssen Zahlen sein'}), 400
+
+    def ereignisse():
+        abonnement = STREAM_VERTEILER.abonnieren(kanal)
+        try:
+            yield f"retry: {int(kanal[1] * 2000)}\n\n"
+            while True:
+                try:
+                    nachricht = abonnement.warteschlange.get(timeout=STREAM_KEEPALIVE)
+                except queue.Empty:
+                    # Kommentarzeile hält Proxies und Browser-Verbindung offen
+                    yield ": keepalive\n\n"
+                    continue
+                if nachricht is None:
+                    # Vom Verteiler getrennt (zu langsamer Client)
+                    return
+                yield f"data: {nachricht}\n\n"
+        finally:
+            STREAM_VERTEILER.abbestellen(abonnement)
+
+    return Response(ereignisse(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/bereit', methods=['GET'])
+def get_bereit():
+    """Fortschritt des Aufwärmens; 503 bis alle Stufen abgeschlossen sind (Readiness-Probe)"""
+    status = AUFWAERMEN.status()
+    response = jsonify(status)
+    response.status_code = 200 if status['bereit'] else 503
+    response.cache_control.no_store = True
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus-Textformat: Stufen-Histogramme, Cache-Zähler, Streams, Aufwärm-Fortschritt"""
+    cache = PLANET_DATA_CACHE.statistik()
+    zeilen = STUFEN_ZEITEN.prometheus()
+    for name in ('treffer', 'fehlschlaege', 'zusammengefasst'):
+        metrik = f"planetenuhr_planet_data_cache_{name}_total"
+        zeilen += [f"# TYPE {metrik} counter", f"{metrik} {cache[name]}"]
+    bilder = BILD_CACHE.statistik()
+    for name in ('treffer', 'fehlschlaege'):
+        metrik = f"planetenuhr_bild_cache_{name}_total"
+        zeilen += [f"# TYPE {metrik} counter", f"{metrik} {bilder[name]}"]
+    zeilen += [
+        "# TYPE planetenuhr_bild_cache_bytes gauge",
+        f"planetenuhr_bild_cache_bytes {bilder['bytes']}"
+    ]
+    streams = STREAM_VERTEILER.statistik()
+    for name in ('kanaele', 'abonnenten'):
+        zeilen += [f"# TYPE planetenuhr_stream_{name} gauge", f"planetenuhr_stream_{name} {streams[name]}"]
+    for name in ('gesendet', 'getrennt'):
+        metrik = f"planetenuhr_stream_{name}_total"
+        zeilen += [f"# TYPE {metrik} counter", f"{metrik} {streams[name]}"]
+    zeilen += [
+        "# TYPE planetenuhr_aufwaermen_fortschritt gauge",
+        f"planetenuhr_aufwaermen_fortschritt {AUFWAERMEN.status()['fortschritt']}"
+    ]
+    response = app.response_class('\n'.join(zeilen) + '\n', mimetype='text/plain')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.cache_control.no_store = True
+    return response
+
+@app.route('/api/profiler', methods=['GET', 'POST'])
+def profiler():
+    """Sampling-Profiler zur Laufzeit. POST {"aktion": "start", "intervall_ms": 10,
+    "dauer_s": 30} bzw. {"aktion": "stop"}; GET liefert die gefalteten Stacks
+    (z.B. für flamegraph.pl oder speedscope). Nur mit PROFILER_ERLAUBT."""
+    if PROFILER is None:
+        return jsonify({'error': 'Profiler ist deaktiviert (PROFILER_ERLAUBT)'}), 404
+    if request.method == 'GET':
+        return app.response_class(PROFILER.gefaltet(), mimetype='text/plain')
+
+    data = request.get_json(silent=True) or {}
+    if data.get('aktion') == 'stop':
+        PROFILER.stoppen()
+    elif data.get('aktion') == 'start':
+        try:
+            intervall = min(max(float(data.get('intervall_ms', 10)), 1.0), 1000.0) / 1000
+            dauer = min(max(float(data.get('dauer_s', 30)), 0.1), 3600.0)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'intervall_ms und dauer_s müssen Zahlen sein'}), 400
+        if not PROFILER.starten(intervall, dauer):
+            return jsonify({'error': 'Profiler läuft bereits', **PROFILER.status()}), 409
+    else:
+        return jsonify({'error': 'aktion muss start oder stop sein'}), 400
+    return jsonify(PROFILER.status())
+
 @app.route('/favicon.ico')
 def favicon():
     return '', 204
 
+def waerme_layouts_auf(executor):
+    # Billig, aber pro Prozess (lru_cache): direkt im Thread
+    for zoom_level in range(-10, 21):
+        layout_antwort(zoom_level)
+
+def lade_kataloge(executor):
+    for katalog in KATALOGE:
+        katalog.laden(executor)
+
+def katalog_fortschritt():
+    return sum(katalog.bereit for katalog in KATALOGE) / len(KATALOGE)
+
+KATALOGE = [katalog for katalog in (STERNKATALOG, GALAXIENKATALOG) if katalog is not None]
+
+# Tabelle im Hintergrund aufbauen bzw. von der Platte mappen; bis dahin rechnet ephem live
+AUFWAERMEN.stufe('layouts', waerme_layouts_auf)
+AUFWAERMEN.stufe('ephemeriden', EPHEMERIDEN_TABELLE.aufbauen, EPHEMERIDEN_TABELLE.fortschritt)
+if KATALOGE:
+    AUFWAERMEN.stufe('kataloge', lade_kataloge, katalog_fortschritt)
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    AUFWAERMEN.starten()
+    app.run(host=app.config['HOST'], port=app.config['PORT'], debug=app.config['DEBUG'])
 
 application = app
@@ -0,0 +1,314 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qsl
+
+import app as planetenuhr
+from aufwaermen import Prozesspool
+from metriken import Messung
+from verteiler import AsyncAbonnement
+
+# --- ASGI-EINSTIEGSPUNKT ---
+# Start z.B. mit:  uvicorn asgi:application --workers 4
+# /api/planet_data und /api/stream laufen asynchron, die blockierende
+# ephem-Arbeit geht in einen begrenzten Pool. Alle übrigen Routen bedient
+# die Flask-App (WSGI) in einem eigenen Thread-Pool; ihre Antworten gehen
+# Teil für Teil hinaus, gestreamte Antworten also ohne Puffern.
+
+# Einstellungen aus config.py (PLANETENUHR_ASGI_* überschreibt)
+ASGI_POOL = planetenuhr.app.config['ASGI_POOL']  # 'thread' oder 'process'
+ASGI_WORKER = planetenuhr.app.config['ASGI_WORKER']
+ASGI_MAX_GLEICHZEITIG = planetenuhr.app.config['ASGI_MAX_GLEICHZEITIG']
+ASGI_MAX_WARTESCHLANGE = planetenuhr.app.config['ASGI_MAX_WARTESCHLANGE']
+ASGI_MAX_STREAMS = planetenuhr.app.config['ASGI_MAX_STREAMS']
+ASGI_MAX_BODY = 1024 * 1024
+
+
+class Ueberlastet(Exception):
+    pass
+
+
+class Begrenzer:
+    """Begrenzt gleichzeitige Pool-Aufträge. Warten schon `max_warteschlange`
+    Anfragen auf einen freien Platz, wird sofort mit Ueberlastet abgelehnt."""
+
+    def __init__(self, max_gleichzeitig, max_warteschlange):
+        self._semaphore = asyncio.Semaphore(max_gleichzeitig)
+        self.max_warteschlange = max_warteschlange
+        self.wartend = 0
+
+    async def ausfuehren(self, pool, funktion, *args):
+        if self._semaphore.locked() and self.wartend >= self.max_warteschlange:
+            raise Ueberlastet()
+
+        self.wartend += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.wartend -= 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, funktion, *args)
+        finally:
+            self._semaphore.release()
+
+
+ANFRAGE_POOL = ThreadPoolExecutor(max_workers=ASGI_WORKER, thread_name_prefix='asgi-ephem')
+if ASGI_POOL == 'process':
+    # Eigene Prozesse umgehen den GIL; jeder mappt die Ephemeriden-Tabelle von
+    # der Platte. Cache, Zusammenfassen und Zähler bleiben im Elternprozess
+    # (ANFRAGE_POOL), nur Cache-Fehlschläge rechnet der Prozess-Pool.
+    RECHEN_POOL = Prozesspool(ASGI_WORKER)
+else:
+    RECHEN_POOL = None
+WSGI_POOL = ThreadPoolExecutor(max_workers=ASGI_WORKER, thread_name_prefix='asgi-wsgi')
+BEGRENZER = Begrenzer(ASGI_MAX_GLEICHZEITIG, ASGI_MAX_WARTESCHLANGE)
+offene_streams = 0
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    try:
+        if scope['path'] == '/api/planet_data' and scope['method'] == 'POST':
+            await _planet_data(scope, receive, send)
+        elif scope['path'] == '/api/stream' and scope['method'] == 'GET':
+            await _stream(scope, receive, send)
+        else:
+            await _wsgi(scope, receive, send)
+    except Ueberlastet:
+        await _antworten(send, 503, b'{"error": "Server ausgelastet"}', headers=[(b'retry-after', b'1')])
+
+
+async def _lifespan(receive, send):
+    while True:
+        nachricht = await receive()
+        if nachricht['type'] == 'lifespan.startup':
+            planetenuhr.AUFWAERMEN.starten()
+            await send({'type': 'lifespan.startup.complete'})
+        elif nachricht['type'] == 'lifespan.shutdown':
+            ANFRAGE_POOL.shutdown(wait=False)
+            if RECHEN_POOL is not None:
+                RECHEN_POOL.beenden()
+            WSGI_POOL.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def _planet_data(scope, receive, send):
+    body = await _lese_body(receive)
+    if body is None:
+        await _antworten(send, 413, b'{"error": "Anfrage zu gross"}')
+        return
+    try:
+        data = planetenuhr.app.json.loads(body or b'{}')
+    except ValueError:
+        await _antworten(send, 400, b'{"error": "Ungueltiges JSON"}')
+        return
+
+    # Die Stufenzeiten der Berechnung im Prozess-Pool kämen nicht zurück
+    messung = None
+    if RECHEN_POOL is None and planetenuhr.server_timing_gewuenscht(_header(scope, b'x-server-timing')):
+        messung = Messung(planetenuhr.STUFEN_ZEITEN)
+
+    antwort, status, format, kodierung = await BEGRENZER.ausfuehren(
+        ANFRAGE_POOL, planetenuhr.planet_data_antwort, data,
+        _header(scope, b'accept'), _header(scope, b'accept-encoding'), messung, RECHEN_POOL
+    )
+    headers = [(b'vary', b'Accept, Accept-Encoding')]
+    if kodierung:
+        headers.append((b'content-encoding', kodierung.encode('latin-1')))
+    if messung is not None:
+        headers.append((b'server-timing', messung.server_timing().encode('latin-1')))
+    await _antworten(send, status, antwort, content_type=format.encode('latin-1'), headers=headers)
+
+
+async def _stream(scope, receive, send):
+    global offene_streams
+
+    kanal = planetenuhr.lese_stream_kanal(dict(parse_qsl(scope['query_string'].decode('latin-1'))))
+    if kanal is None:
+        await _antworten(send, 400, b'{"error": "zoom_level und intervall muessen Zahlen sein"}')
+        return
+    if offene_streams >= ASGI_MAX_STREAMS:
+        raise Ueberlastet()
+
+    abonnement = AsyncAbonnement(kanal, planetenuhr.STREAM_PUFFER, asyncio.get_running_loop())
+
+    async def beobachte_verbindung():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        abonnement.trennen()
+
+    offene_streams += 1
+    planetenuhr.STREAM_VERTEILER.abonnieren(kanal, abonnement)
+    waechter = asyncio.create_task(beobachte_verbindung())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')
+            ]
+        })
+        await _sende_teil(send, f"retry: {int(kanal[1] * 2000)}\n\n")
+
+        while True:
+            try:
+                nachricht = await abonnement.holen(planetenuhr.STREAM_KEEPALIVE)
+            except asyncio.TimeoutError:
+                await _sende_teil(send, ": keepalive\n\n")
+                continue
+            if nachricht is None:
+                # Client weg oder vom Verteiler als zu langsam getrennt
+                break
+            await _sende_teil(send, f"data: {nachricht}\n\n")
+
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    finally:
+        offene_streams -= 1
+        planetenuhr.STREAM_VERTEILER.abbestellen(abonnement)
+        waechter.cancel()
+
+
+async def _wsgi(scope, receive, send):
+    body = await _lese_body(receive)
+    if body is None:
+        await _antworten(send, 413, b'{"error": "Anfrage zu gross"}')
+        return
+
+    status, headers, ergebnis, teile, teil = await BEGRENZER.ausfuehren(
+        WSGI_POOL, _wsgi_aufruf, _wsgi_environ(scope, body)
+    )
+    loop = asyncio.get_running_loop()
+    getrennt = asyncio.Event()
+
+    async def beobachte_verbindung():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        getrennt.set()
+
+    waechter = asyncio.create_task(beobachte_verbindung())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (name.lower().encode('latin-1'), wert.encode('latin-1'))
+                for name, wert in headers
+                # Date setzt der ASGI-Server selbst
+                if name.lower() != 'date'
+            ]
+        })
+        # Jeden Teil sofort weitergeben (gestreamte Antworten wie /api/ereignisse);
+        # den nächsten rechnet die App wieder im Pool
+        while teil is not None and not getrennt.is_set():
+            if teil:
+                await send({'type': 'http.response.body', 'body': teil, 'more_body': True})
+            teil = await loop.run_in_executor(WSGI_POOL, next, teile, None)
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    finally:
+        waechter.cancel()
+        if hasattr(ergebnis, 'close'):
+            await loop.run_in_executor(WSGI_POOL, ergebnis.close)
+
+
+def _wsgi_environ(scope, body):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, wert in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        wert = wert.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = wert
+        elif name != 'CONTENT_LENGTH':
+            schluessel = f"HTTP_{name}"
+            environ[schluessel] = f"{environ[schluessel]},{wert}" if schluessel in environ else wert
+    return environ
+
+
+def _wsgi_aufruf(environ):
+    """Ruft die Flask-App auf und liest den ersten Teil der Antwort (spätestens dann
+    steht der Status fest). Liefert (status, headers, Ergebnis, Iterator, erster Teil);
+    der erste Teil ist None, wenn die Antwort schon zu Ende ist."""
+    antwort = {}
+    geschrieben = []
+
+    def start_response(status, headers, exc_info=None):
+        antwort['status'] = int(status.split(' ', 1)[0])
+        antwort['headers'] = headers
+        return geschrieben.append
+
+    ergebnis = planetenuhr.app(environ, start_response)
+    try:
+        teile = iter(ergebnis)
+        teil = next(teile, None)
+    except BaseException:
+        if hasattr(ergebnis, 'close'):
+            ergebnis.close()
+        raise
+    if geschrieben:
+        # Über write() Geschriebenes kommt vor dem Iterator
+        teil = b''.join(geschrieben) + (teil or b'')
+    return antwort['status'], antwort['headers'], ergebnis, teile, teil
+
+
+def _header(scope, name):
+    """Alle Werte eines Request-Headers, kommagetrennt (None wenn nicht vorhanden)"""
+    werte = [wert.decode('latin-1') for schluessel, wert in scope['headers'] if schluessel == name]
+    return ','.join(werte) if werte else None
+
+
+async def _lese_body(receive):
+    """Liest den Request-Body; None wenn er ASGI_MAX_BODY überschreitet"""
+    teile = []
+    groesse = 0
+    while True:
+        nachricht = await receive()
+        if nachricht['type'] == 'http.disconnect':
+            break
+        teil = nachricht.get('body', b'')
+        groesse += len(teil)
+        if groesse > ASGI_MAX_BODY:
+            return None
+        teile.append(teil)
+        if not nachricht.get('more_body', False):
+            break
+    return b''.join(teile)
+
+
+async def _antworten(send, status, body, content_type=b'application/json', headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode('latin-1'))] + list(headers)
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _sende_teil(send, text):
+    await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
@@ -0,0 +1,123 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# --- AUFWÄRMEN BEIM START ---
+# Die teuren Vorberechnungen (Ephemeriden-Tabelle, Kataloge, Layouts) laufen
+# nacheinander in einem Hintergrund-Thread; rechenintensive Stufen verteilen
+# ihre Arbeit auf einen Prozess-Pool. Ergebnisse landen in Dateien unter
+# cache/, die alle Worker-Prozesse mappen. Der Fortschritt steht in
+# /api/bereit.
+
+logger = logging.getLogger('planetenuhr')
+
+# Gesetzt in den Pool-Prozessen (Initializer), nie im Elternprozess: dort
+# darf das Aufwärmen nicht noch einmal starten
+POOL_VARIABLE = 'PLANETENUHR_AUFWAERMEN_POOL'
+
+
+def ist_pool_prozess():
+    return os.environ.get(POOL_VARIABLE) == '1'
+
+
+def _markiere_pool_prozess():
+    os.environ[POOL_VARIABLE] = '1'
+
+
+class Prozesspool:
+    """Prozess-Pool, der erst beim ersten Auftrag startet (Aufwärmen, /api/planet_batch).
+
+    'spawn' statt 'fork': der Pool startet aus einem Thread heraus, und so
+    verhält es sich auf Linux, macOS und Windows gleich.
+    """
+
+    def __init__(self, prozesse):
+        self.prozesse = prozesse
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, funktion, *args):
+        with self._lock:
+            if self._executor is None:
+                kontext = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(
+                    self.prozesse, mp_context=kontext, initializer=_markiere_pool_prozess
+                )
+        return self._executor.submit(funktion, *args)
+
+    def beenden(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+class Aufwaermen:
+    """Stufen werden mit `stufe(name, funktion, fortschritt)` registriert.
+
+    `funktion(executor)` bekommt einen Pool mit `submit` (oder None bei
+    prozesse=0, dann rechnet sie im Thread); `fortschritt()` liefert 0..1
+    für Stufen, die das selbst messen können.
+    """
+
+    def __init__(self, prozesse=None):
+        # None = ein Prozess pro CPU, 0 = ohne Prozess-Pool
+        self.prozesse = prozesse
+        self._stufen = []
+        self._status = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def stufe(self, name, funktion, fortschritt=None):
+        self._stufen.append((name, funktion, fortschritt))
+        self._status[name] = {'status': 'wartend'}
+
+    def starten(self):
+        """Startet das Aufwärmen einmalig (weitere Aufrufe kosten nur einen Vergleich)"""
+        if self._thread is None and not ist_pool_prozess():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._ausfuehren, name='aufwaermen', daemon=True)
+                    self._thread.start()
+        return self._thread
+
+    def _ausfuehren(self):
+        pool = Prozesspool(self.prozesse) if self.prozesse != 0 else None
+        try:
+            for name, funktion, _ in self._stufen:
+                beginn = time.perf_counter()
+                self._status[name] = {'status': 'laeuft'}
+                try:
+                    funktion(pool)
+                    self._status[name] = {'status': 'fertig', 'dauer_s': round(time.perf_counter() - beginn, 3)}
+                except Exception as fehler:
+                    logger.exception("Aufwärmen: Stufe %s fehlgeschlagen", name)
+                    self._status[name] = {'status': 'fehler', 'fehler': str(fehler)}
+                else:
+                    logger.info("Aufwärmen: %s fertig in %.2f s", name, self._status[name]['dauer_s'])
+        finally:
+            if pool is not None:
+                pool.beenden()
+
+    @property
+    def bereit(self):
+        # Fehlgeschlagene Stufen zählen als abgeschlossen: die App rechnet dann live
+        return all(eintrag['status'] in ('fertig', 'fehler') for eintrag in self._status.values())
+
+    def status(self):
+        stufen = {}
+        for name, _, fortschritt in self._stufen:
+            eintrag = dict(self._status[name])
+            if eintrag['status'] in ('fertig', 'fehler'):
+                eintrag['fortschritt'] = 1.0
+            elif fortschritt is not None:
+                eintrag['fortschritt'] = round(fortschritt(), 3)
+            else:
+                eintrag['fortschritt'] = 0.0
+            stufen[name] = eintrag
+
+        gesamt = sum(eintrag['fortschritt'] for eintrag in stufen.values()) / len(stufen) if stufen else 1.0
+        return {'bereit': self.bereit, 'fortschritt': round(gesamt, 3), 'stufen': stufen}
@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Messungen im Produktivprofil (kein Debug-Logging im Hot Path)
+os.environ.setdefault('PLANETENUHR_PROFIL', 'production')
+
+import app as planetenuhr
+import drahtformat
+import tschebyschow
+from projektion import NumpyProjektion, PythonProjektion, np
+
+# --- BENCHMARK DER EBENEN-BERECHNUNGEN ---
+# Aufruf:
+#   python benchmark.py --ausgabe ergebnis.json
+#   python benchmark.py --vergleich baseline.json --toleranz 0.2
+# Misst Latenz-Perzentile, Durchsatz und Speicher (tracemalloc) je Szenario.
+# Mit --vergleich endet das Skript mit Exit-Code 1, wenn ein Szenario im
+# Median um mehr als --toleranz langsamer ist als die Baseline.
+# Szenarien 'kodierung/...' messen nur die Serialisierung je Ebene und
+# Antwortformat (Spalte Bytes = Größe der Antwort).
+# --gleichheit vergleicht stattdessen NumPy- und Python-Projektion auf allen
+# Ebenen (Exit-Code 1 bei Abweichung).
+# --tschebyschow prüft die Koeffizienten für den Browser (/api/ephemeriden)
+# gegen ephem (Exit-Code 1 über tschebyschow.TOLERANZ_RAD).
+
+DATUMSBEREICHE = {
+    # Innerhalb der Ephemeriden-Tabelle bzw. außerhalb (Live-ephem)
+    'tabelle': (datetime(1950, 1, 1), datetime(2050, 1, 1)),
+    'live': (datetime(2300, 1, 1), datetime(2400, 1, 1))
+}
+SONNENSYSTEM_ZOOMS = [-10, -5, 0, 5, 10, 20]
+MILCHSTRASSE_ZOOMS = [-11, -15, -20]
+GALAXIEN_ZOOMS = [-21, -25, -30]
+API_ZOOMS = [-10, -15, -25]
+
+
+def zufalls_daten(bereich, anzahl, seed):
+    start, ende = DATUMSBEREICHE[bereich]
+    zufall = random.Random(seed)
+    spanne = (ende - start).total_seconds()
+    return [
+        datetime.fromtimestamp(start.timestamp() + zufall.random() * spanne).strftime("%Y/%m/%d %H:%M:%S")
+        for _ in range(anzahl)
+    ]
+
+
+def szenarien(anzahl, seed):
+    """Liefert (Name, Aufruf(i)) je Szenario; i ist die laufende Aufrufnummer"""
+    for bereich in DATUMSBEREICHE:
+        daten = zufalls_daten(bereich, anzahl, seed)
+        for zoom_level in SONNENSYSTEM_ZOOMS:
+            yield (
+                f"sonnensystem/zoom={zoom_level}/{bereich}",
+                lambda i, z=zoom_level, d=daten: planetenuhr.calculate_sonnensystem_data(d[i % len(d)], z, 0, 0, 'Erde')
+            )
+
+    for zoom_level in MILCHSTRASSE_ZOOMS:
+        yield (
+            f"milchstrasse/zoom={zoom_level}",
+            lambda i, z=zoom_level: planetenuhr.calculate_milchstrasse_data(z, 0, 0, 'Sirius A')
+        )
+
+    for zoom_level in GALAXIEN_ZOOMS:
+        yield (
+            f"galaxien/zoom={zoom_level}",
+            lambda i, z=zoom_level: planetenuhr.calculate_galaxien_data(z, 0, 0, 'Andromeda-Galaxie')
+        )
+
+    client = planetenuhr.app.test_client()
+    daten = zufalls_daten('tabelle', anzahl, seed)
+    for zoom_level in API_ZOOMS:
+        def api_aufruf(i, z=zoom_level):
+            # Ergebnis-Cache leeren: gemessen wird der volle Rundlauf inkl. Berechnung
+            planetenuhr.PLANET_DATA_CACHE.leeren()
+            response = client.post('/api/planet_data', json={
+                'datum': daten[i % len(daten)], 'zoom_level': z, 'relativ': True
+            })
+            assert response.status_code == 200, response.data
+        yield f"api/planet_data/zoom={zoom_level}", api_aufruf
+
+    for zoom_level in API_ZOOMS:
+        ansicht = planetenuhr.calculate_planet_data(daten[0], zoom_level, -planetenuhr.ZENTRUM, -planetenuhr.ZENTRUM, None)
+        ebene = planetenuhr.get_current_level_range(zoom_level)
+        yield (
+            f"kodierung/{ebene}/json",
+            lambda i, a=ansicht: planetenuhr.app.json.dumps(a, separators=(',', ':')).encode('utf-8')
+        )
+        for format in drahtformat.ANGEBOTEN:
+            if format != drahtformat.JSON:
+                kurz = format.rsplit('/', 1)[-1].replace('vnd.planetenuhr.', '')
+                yield f"kodierung/{ebene}/{kurz}", lambda i, a=ansicht, f=format: drahtformat.kodiere(a, f)
+
+
+def vergleiche_werte(a, b, toleranz, pfad=''):
+    """Liste der Abweichungen zweier Antworten; Zahlen mit absoluter Toleranz"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() != b.keys():
+            return [f"{pfad}: Schlüssel {sorted(a)} != {sorted(b)}"]
+        return [f for k in a for f in vergleiche_werte(a[k], b[k], toleranz, f"{pfad}.{k}")]
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return [f"{pfad}: Länge {len(a)} != {len(b)}"]
+        return [f for i, (x, y) in enumerate(zip(a, b)) for f in vergleiche_werte(x, y, toleranz, f"{pfad}[{i}]")]
+    if isinstance(a, float) or isinstance(b, float):
+        return [] if abs(a - b) <= toleranz else [f"{pfad}: {a} != {b}"]
+    return [] if a == b else [f"{pfad}: {a!r} != {b!r}"]
+
+
+def pruefe_gleichheit(anzahl, seed, toleranz=1e-6):
+    """Rechnet jede Ebene mit beiden Engines; liefert die Anzahl Abweichungen"""
+    if np is None:
+        print("NumPy ist nicht installiert, nichts zu vergleichen")
+        return 0
+
+    aufrufe = []
+    for datum in zufalls_daten('tabelle', anzahl, seed):
+        for zoom_level in SONNENSYSTEM_ZOOMS:
+            aufrufe.append((f"sonnensystem/zoom={zoom_level}", lambda d=datum, z=zoom_level:
+                            planetenuhr.calculate_sonnensystem_data(d, z, 13, -7, 'Erde')))
+    for zoom_level in MILCHSTRASSE_ZOOMS:
+        for sichtbereich in (None, (0, 0, planetenuhr.FENSTER_GROESSE, planetenuhr.FENSTER_GROESSE)):
+            aufrufe.append((f"milchstrasse/zoom={zoom_level}", lambda z=zoom_level, s=sichtbereich:
+                            planetenuhr.calculate_milchstrasse_data(z, 25, -40, 'Sirius A', s)))
+    for zoom_level in GALAXIEN_ZOOMS:
+        aufrufe.append((f"galaxien/zoom={zoom_level}", lambda z=zoom_level:
+                        planetenuhr.calculate_galaxien_data(z, 25, -40, 'Andromeda-Galaxie')))
+
+    vorher = planetenuhr.PROJEKTION
+    abweichungen = 0
+
+    katalog = planetenuhr.STERNKATALOG
+    if katalog is not None and katalog.bereit:
+        # Auswahl direkt prüfen, auch mit Radien und Limits, die keine Zoomstufe erreicht
+        for max_entfernung in (100, 1000, 50000):
+            for rechteck in (None, (-300.0, -200.0, 150.0, 400.0)):
+                for limit in (1, 50, 2000):
+                    erwartet = PythonProjektion().katalog_auswahl(katalog.daten, max_entfernung, rechteck, limit)
+                    erhalten = NumpyProjektion().katalog_auswahl(katalog.daten, max_entfernung, rechteck, limit)
+                    if erwartet != erhalten:
+                        print(f"katalog/{max_entfernung}/{rechteck}/{limit}: Auswahl weicht ab")
+                        abweichungen += 1
+    try:
+        for name, aufruf in aufrufe:
+            planetenuhr.PROJEKTION = PythonProjektion()
+            referenz = aufruf()
+            planetenuhr.PROJEKTION = NumpyProjektion()
+            fehler = vergleiche_werte(referenz, aufruf(), toleranz)
+            for meldung in fehler[:5]:
+                print(f"{name}{meldung}")
+            abweichungen += len(fehler)
+    finally:
+        planetenuhr.PROJEKTION = vorher
+
+    print(f"{len(aufrufe)} Ansichten verglichen, {abweichungen} Abweichung(en) über {toleranz}")
+    return abweichungen
+
+
+def pruefe_tschebyschow(stichproben=2000):
+    """Größte Abweichung der Tschebyschow-Auswertung von ephem je Datumsbereich und Körper"""
+    ueberschritten = 0
+    for bereich, (von, bis) in DATUMSBEREICHE.items():
+        # Zeitraum so lang, wie /api/ephemeriden höchstens liefert
+        start = float(planetenuhr.ephem.Date(von))
+        ende = min(float(planetenuhr.ephem.Date(bis)), start + planetenuhr.TSCHEBYSCHOW_MAX_TAGE)
+        abweichungen = tschebyschow.pruefe_genauigkeit(
+            planetenuhr.berechne_koerper_laengen, planetenuhr.EPHEMERIDEN_KOERPER, start, ende, stichproben
+        )
+        for name, abweichung in abweichungen.items():
+            zu_gross = abweichung > tschebyschow.TOLERANZ_RAD
+            ueberschritten += zu_gross
+            print(f"{bereich + '/' + name:<20} {abweichung:.2e} rad{'  ÜBER TOLERANZ' if zu_gross else ''}")
+    print(f"Toleranz {tschebyschow.TOLERANZ_RAD:.0e} rad, {ueberschritten} Überschreitung(en)")
+    return ueberschritten
+
+
+def messen(aufruf, iterationen, aufwaermen, speicher_iterationen):
+    for i in range(aufwaermen):
+        aufruf(i)
+
+    dauern = []
+    ergebnis = None
+    gesamt_start = time.perf_counter()
+    for i in range(iterationen):
+        start = time.perf_counter()
+        ergebnis = aufruf(i)
+        dauern.append(time.perf_counter() - start)
+    gesamt = time.perf_counter() - gesamt_start
+
+    # Speicher separat messen, tracemalloc verfälscht die Laufzeit
+    spitzen = []
+    tracemalloc.start()
+    try:
+        for i in range(speicher_iterationen):
+            tracemalloc.reset_peak()
+            vorher, _ = tracemalloc.get_traced_memory()
+            aufruf(i)
+            _, spitze = tracemalloc.get_traced_memory()
+            spitzen.append(spitze - vorher)
+    finally:
+        tracemalloc.stop()
+
+    dauern_ms = sorted(d * 1000 for d in dauern)
+    return {
+        'iterationen': iterationen,
+        'p50_ms': perzentil(dauern_ms, 50),
+        'p90_ms': perzentil(dauern_ms, 90),
+        'p99_ms': perzentil(dauern_ms, 99),
+        'mittel_ms': statistics.fmean(dauern_ms),
+        'max_ms': dauern_ms[-1],
+        'durchsatz_pro_s': iterationen / gesamt if gesamt else 0.0,
+        'speicher_spitze_bytes': int(statistics.fmean(spitzen)) if spitzen else 0,
+        # Antwortgröße, falls das Szenario Bytes liefert (Kodierung)
+        'antwort_bytes': len(ergebnis) if isinstance(ergebnis, bytes) else None
+    }
+
+
+def perzentil(sortiert, p):
+    if not sortiert:
+        return 0.0
+    position = (len(sortiert) - 1) * p / 100
+    unten = int(position)
+    oben = min(unten + 1, len(sortiert) - 1)
+    return sortiert[unten] + (sortiert[oben] - sortiert[unten]) * (position - unten)
+
+
+def vergleichen(ergebnisse, baseline, toleranz):
+    """Gibt die Liste der Szenarien zurück, deren Median die Toleranz überschreitet"""
+    regressionen = []
+    print(f"\n{'Szenario':<40} {'Baseline p50':>13} {'Aktuell p50':>12} {'Faktor':>8}")
+    for name, aktuell in ergebnisse.items():
+        alt = baseline.get('ergebnisse', {}).get(name)
+        if alt is None:
+            continue
+        faktor = aktuell['p50_ms'] / alt['p50_ms'] if alt['p50_ms'] else float('inf')
+        markierung = '  REGRESSION' if faktor > 1 + toleranz else ''
+        print(f"{name:<40} {alt['p50_ms']:>11.3f}ms {aktuell['p50_ms']:>10.3f}ms {faktor:>7.2f}x{markierung}")
+        if markierung:
+            regressionen.append(name)
+    return regressionen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark der Planetenuhr-Berechnungen')
+    parser.add_argument('--iterationen', type=int, default=200)
+    parser.add_argument('--aufwaermen', type=int, default=20)
+    parser.add_argument('--speicher-iterationen', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--filter', default='', help='Nur Szenarien, deren Name diesen Text enthält')
+    parser.add_argument('--ausgabe', help='Ergebnisse als JSON in diese Datei schreiben')
+    parser.add_argument('--vergleich', help='Baseline-JSON zum Vergleich')
+    parser.add_argument('--toleranz', type=float, default=0.2, help='Erlaubte Verlangsamung des Medians (0.2 = 20%%)')
+    parser.add_argument('--gleichheit', action='store_true', help='NumPy- gegen Python-Projektion prüfen statt messen')
+    parser.add_argument('--tschebyschow', action='store_true', help='Koeffizienten für den Browser gegen ephem prüfen')
+    args = parser.parse_args(argv)
+
+    # Ephemeriden-Tabelle fertig laden, sonst misst der erste Teil Live-ephem
+    planetenuhr.EPHEMERIDEN_TABELLE.aufbauen()
+    for katalog in (planetenuhr.STERNKATALOG, planetenuhr.GALAXIENKATALOG):
+        if katalog is not None:
+            katalog.laden()
+
+    if args.gleichheit:
+        return 1 if pruefe_gleichheit(20, args.seed) else 0
+    if args.tschebyschow:
+        return 1 if pruefe_tschebyschow() else 0
+
+    ergebnisse = {}
+    print(f"{'Szenario':<40} {'p50':>9} {'p90':>9} {'p99':>9} {'Aufrufe/s':>10} {'Speicher':>10} {'Bytes':>8}")
+    for name, aufruf in szenarien(args.iterationen, args.seed):
+        if args.filter not in name:
+            continue
+        ergebnis = messen(aufruf, args.iterationen, args.aufwaermen, args.speicher_iterationen)
+        ergebnisse[name] = ergebnis
+        print(f"{name:<40} {ergebnis['p50_ms']:>7.3f}ms {ergebnis['p90_ms']:>7.3f}ms {ergebnis['p99_ms']:>7.3f}ms "
+              f"{ergebnis['durchsatz_pro_s']:>10.0f} {ergebnis['speicher_spitze_bytes'] / 1024:>8.1f}KB "
+              f"{ergebnis['antwort_bytes'] if ergebnis['antwort_bytes'] is not None else '':>8}")
+
+    bericht = {
+        'meta': {
+            'zeit': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plattform': platform.platform(),
+            'iterationen': args.iterationen,
+            'projektion': planetenuhr.PROJEKTION.name,
+            'seed': args.seed
+        },
+        'ergebnisse': ergebnisse
+    }
+
+    if args.ausgabe:
+        with open(args.ausgabe, 'w', encoding='utf-8') as datei:
+            json.dump(bericht, datei, indent=2, ensure_ascii=False)
+
+    if args.vergleich:
+        with open(args.vergleich, encoding='utf-8') as datei:
+            baseline = json.load(datei)
+        regressionen = vergleichen(ergebnisse, baseline, args.toleranz)
+        if regressionen:
+            print(f"\n{len(regressionen)} Regression(en) über {args.toleranz:.0%} Toleranz")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# --- KONFIGURATION ---
+# Reihenfolge: Profil (PLANETENUHR_PROFIL) → optionale Konfigurationsdatei
+# (PLANETENUHR_KONFIG=/pfad/zur/datei.py) → einzelne Umgebungsvariablen
+# PLANETENUHR_<NAME>, z.B. PLANETENUHR_LOG_LEVEL=INFO.
+
+BASIS_VERZEICHNIS = os.path.dirname(os.path.abspath(__file__))
+
+
+class Config:
+    """Entwicklungsprofil (Standard)"""
+    DEBUG = True
+    HOST = '127.0.0.1'
+    PORT = 5000
+
+    # Logging: LOG_FORMAT 'text' oder 'json'; LOG_PUFFER schreibt über eine
+    # Queue in einem eigenen Thread; LOG_STICHPROBE = Anteil protokollierter
+    # Hot-Path-Meldungen (0 = aus, kostet dann nur einen Vergleich)
+    LOG_LEVEL = 'DEBUG'
+    LOG_FORMAT = 'text'
+    LOG_PUFFER = False
+    LOG_STICHPROBE = 1.0
+
+    MAX_TIMELINE_FRAMES = 400
+
+    # Stapel-API (/api/planet_batch): höchstens STAPEL_MAX_ANSICHTEN pro Anfrage,
+    # verarbeitet in Fenstern zu STAPEL_FENSTER Einträgen (begrenzt den Speicher);
+    # Prozesse im Pool: None = einer pro CPU, 0 oder 1 = im Anfrage-Thread
+    STAPEL_MAX_ANSICHTEN = 10000
+    STAPEL_FENSTER = 512
+    STAPEL_PROZESSE = None
+    LAYOUT_MAX_AGE = 86400
+
+    # Statische Dateien mit Inhalts-Hash in der URL (ein Jahr, immutable);
+    # gzip/Brotli erst ab KOMPRIMIERUNG_AB Bytes
+    STATIC_MAX_AGE = 31536000
+    KOMPRIMIERUNG_AB = 1024
+
+    # Stufenzeiten: Server-Timing-Header, wenn die Anfrage "X-Server-Timing: 1"
+    # mitschickt; Sampling-Profiler über /api/profiler. /metrics ist immer an.
+    SERVER_TIMING = True
+    PROFILER_ERLAUBT = True
+
+    # Serverseitig gerenderte Bilder (/api/bild): Cache-Budget in Bytes und
+    # Rundung der Zeit in Sekunden (alle Clients derselben Minute teilen ein Bild)
+    BILD_CACHE_BYTES = 32 * 1024 * 1024
+    BILD_ZEIT_RUNDUNG = 60
+
+    PLANET_DATA_CACHE_TTL = 2.0
+    PLANET_DATA_CACHE_GROESSE = 2048
+
+    STREAM_INTERVALL_MIN = 0.25
+    STREAM_INTERVALL_MAX = 60.0
+    STREAM_PUFFER = 16
+    STREAM_KEEPALIVE = 15.0
+
+    # Ereignissuche (/api/ereignisse): längster Zeitraum pro Anfrage in Tagen
+    # und Anzahl gecachter 100-Tage-Blöcke
+    EREIGNIS_MAX_TAGE = 36525
+    EREIGNIS_CACHE_BLOECKE = 4096
+    # Tschebyschow-Koeffizienten für die Wiedergabe im Browser
+    # (/api/ephemeriden): längster Zeitraum pro Anfrage in Tagen
+    TSCHEBYSCHOW_MAX_TAGE = 7320
+
+    CACHE_VERZEICHNIS = os.path.join(BASIS_VERZEICHNIS, 'cache')
+    EPHEMERIDEN_START = '1800/01/01'
+    EPHEMERIDEN_ENDE = '2200/01/01'
+    EPHEMERIDEN_SCHRITT_TAGE = 1.0
+    # Aufwärmen beim Start (Tabelle, Kataloge, Layouts): Prozesse im Pool,
+    # None = einer pro CPU, 0 = ohne Pool im Hintergrund-Thread
+    AUFWAERMEN_PROZESSE = None
+
+    # Katalogdatei (python katalogdatei.py sterne hyg.csv sterne.bin) oder direkt eine
+    # HYG-artige CSV (proper, ra, dist, mag, absmag, spect, lum); None = eingebaute Sterne.
+    # Pro Antwort höchstens STERNKATALOG_MAX_STERNE, die hellsten zuerst
+    STERNKATALOG_PFAD = None
+    STERNKATALOG_MAX_STERNE = 2000
+    # Galaxien: Katalogdatei oder CSV (name, entfernung_lj, durchmesser_lj, optional
+    # sterne, ra_grad, typ); pro Antwort höchstens GALAXIENKATALOG_MAX_GALAXIEN, die
+    # mit der größten scheinbaren Größe zuerst
+    GALAXIENKATALOG_PFAD = None
+    GALAXIENKATALOG_MAX_GALAXIEN = 2000
+
+    # Projektions-Engine: 'auto' (NumPy falls installiert), 'numpy' oder 'python'
+    PROJEKTION = 'auto'
+
+    ASGI_POOL = 'thread'
+    ASGI_WORKER = 8
+    ASGI_MAX_GLEICHZEITIG = 32
+    ASGI_MAX_WARTESCHLANGE = 256
+    ASGI_MAX_STREAMS = 10000
+
+
+class ProductionConfig(Config):
+    """Produktivprofil: kein Debugger/Reloader, JSON-Logs ab WARNING, gepuffert"""
+    DEBUG = False
+    HOST = '0.0.0.0'
+    LOG_LEVEL = 'WARNING'
+    LOG_FORMAT = 'json'
+    LOG_PUFFER = True
+    LOG_STICHPROBE = 0.0
+    SERVER_TIMING = False
+    PROFILER_ERLAUBT = False
+
+
+PROFILE = {
+    'development': Config,
+    'production': ProductionConfig
+}
+
+
+def lade_konfiguration(app):
+    profil = os.environ.get('PLANETENUHR_PROFIL', 'development')
+    if profil not in PROFILE:
+        raise ValueError(f"Unbekanntes Profil: {profil} (erlaubt: {', '.join(PROFILE)})")
+
+    app.config.from_object(PROFILE[profil])
+    app.config['PROFIL'] = profil
+    app.config.from_envvar('PLANETENUHR_KONFIG', silent=True)
+    app.config.from_prefixed_env('PLANETENUHR')
+
+
+class JsonFormatter(logging.Formatter):
+    """Eine JSON-Zeile pro Meldung, zusätzliche Felder über `extra=`"""
+
+    STANDARD_FELDER = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        eintrag = {
+            'zeit': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'meldung': record.getMessage()
+        }
+        for name, wert in vars(record).items():
+            if name not in self.STANDARD_FELDER:
+                eintrag[name] = wert
+        if record.exc_info:
+            eintrag['fehler'] = self.formatException(record.exc_info)
+        return json.dumps(eintrag, ensure_ascii=False, default=str)
+
+
+def richte_logging_ein(config):
+    """Konfiguriert den 'planetenuhr'-Logger gemäß LOG_LEVEL, LOG_FORMAT und LOG_PUFFER"""
+    handler = logging.StreamHandler(sys.stdout)
+    if config['LOG_FORMAT'] == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    if config['LOG_PUFFER']:
+        # Request-Threads legen Meldungen nur in die Queue, geschrieben wird im Listener-Thread
+        warteschlange = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(warteschlange, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        handler = logging.handlers.QueueHandler(warteschlange)
+
+    level = logging.getLevelName(str(config['LOG_LEVEL']).upper())
+    for name in ('planetenuhr', 'werkzeug'):
+        logger = logging.getLogger(name)
+        logger.handlers[:] = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
+
+    return logging.getLogger('planetenuhr')
@@ -0,0 +1,314 @@
+import io
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    from PIL import Image, ImageColor, ImageDraw, ImageFont
+except ImportError:  # Pillow ist optional, ohne gibt es nur SVG
+    Image = None
+
+# --- SERVERSEITIGE DARSTELLUNG ---
+# Für Clients, denen das Canvas-Zeichnen zu teuer ist (Kiosk-Tablets): eine
+# Ansicht aus calculate_planet_data wird zuerst in einfache Zeichenbefehle
+# (Kreis, Linie, Text) übersetzt – mit denselben Farben, Strichmustern und
+# Regeln wie drawSonnensystem/drawMilchstrasse/drawGalaxien in script.js –
+# und dann als SVG (reines Python) oder PNG (Pillow, headless) ausgegeben.
+
+FENSTER_GROESSE = 600
+HINTERGRUND = '#000000'
+PNG_VERFUEGBAR = Image is not None
+# PNG wird in doppelter Auflösung gezeichnet und verkleinert (Kantenglättung)
+PNG_UEBERABTASTUNG = 2
+
+
+def szene(planet_data, zoom_level):
+    """Zeichenbefehle in Canvas-Reihenfolge:
+    ('kreis', x, y, r, fuellung, rand, breite, strich),
+    ('linie', x1, y1, x2, y2, farbe, breite, strich),
+    ('text', x, y, text, farbe, groesse, fett, drehung_grad, zentriert)"""
+    befehle = []
+    if planet_data['ebene'] == 'sonnensystem':
+        _sonnensystem(planet_data, befehle)
+    elif planet_data['ebene'] == 'milchstrasse':
+        _milchstrasse(planet_data, befehle)
+    else:
+        _galaxien(planet_data, zoom_level, befehle)
+    return befehle
+
+
+def _sonnensystem(data, befehle):
+    sonne = data['sonne']
+    sx, sy = sonne['x'], sonne['y']
+    for bahn in data['umlaufbahnen']:
+        if bahn['radius'] > 0:
+            befehle.append(('kreis', sx, sy, bahn['radius'], None, 'rgba(128, 128, 128, 0.6)', 1, (2, 4)))
+
+    befehle.append(('kreis', sx, sy, sonne['radius'], sonne['farbe'],
+                    'white' if sonne['selected'] else 'orange', 3 if sonne['selected'] else 1, None))
+
+    for planet in data['planeten']:
+        gewaehlt = planet['selected']
+        befehle.append(('linie', sx, sy, planet['x'], planet['y'],
+                        'rgba(255, 255, 255, 0.8)' if gewaehlt else 'rgba(105, 105, 105, 0.4)',
+                        2 if gewaehlt else 1, None if gewaehlt else (1, 3)))
+        befehle.append(('kreis', planet['x'], planet['y'], planet['point_radius'], planet['farbe'],
+                        'white', 2 if gewaehlt else 0.5, None))
+
+    zodiak = data.get('zodiak')
+    if not zodiak or not zodiak['show']:
+        return
+    radius = zodiak['radius']
+    befehle.append(('kreis', sx, sy, radius, None, 'rgba(255, 255, 255, 0.6)', 2, None))
+    for name, grad in zodiak['zeichen']:
+        winkel = math.radians(grad)
+        befehle.append(('linie', sx + radius * math.cos(winkel), sy - radius * math.sin(winkel),
+                        sx + (radius + 8) * math.cos(winkel), sy - (radius + 8) * math.sin(winkel),
+                        'rgba(255, 215, 0, 0.6)', 1, None))
+        text_winkel = winkel + math.radians(15)
+        befehle.append(('text', sx + (radius + 25) * math.cos(text_winkel), sy - (radius + 25) * math.sin(text_winkel),
+                        name, 'rgba(255, 215, 0, 0.8)', 10, True, math.degrees(math.pi - text_winkel), True))
+
+    for planet in data['planeten']:
+        gewaehlt = planet['selected']
+        zx = sx + radius * math.cos(planet['helio_lon_rad'])
+        zy = sy - radius * math.sin(planet['helio_lon_rad'])
+        befehle.append(('linie', planet['x'], planet['y'], zx, zy,
+                        'rgba(255, 255, 255, 0.8)' if gewaehlt else 'rgba(255, 255, 255, 0.3)',
+                        2 if gewaehlt else 1, None))
+        befehle.append(('text', zx + 8, zy + 4, planet['name'][0], planet['farbe'], 14 if gewaehlt else 12, True, 0, False))
+
+
+def _milchstrasse(data, befehle):
+    sonne = data['sonne']
+    zoom_info = data.get('zoom_info') or {}
+    relative_level = zoom_info.get('relative_level', 0)
+
+    if relative_level >= 5 and data.get('spiralarme'):
+        for arm in data['spiralarme']:
+            radius = arm['entfernung_ly'] / zoom_info['max_entfernung'] * (FENSTER_GROESSE / 2 - 40)
+            befehle.append(('kreis', sonne['x'], sonne['y'], radius, None, 'rgba(100, 100, 255, 0.3)', 2, (5, 15)))
+            if relative_level >= 7:
+                befehle.append(('text', sonne['x'] + radius + 10, sonne['y'], arm['name'],
+                                'rgba(150, 150, 255, 0.8)', 10, False, 0, False))
+
+    for stern in data.get('sterne') or []:
+        gewaehlt = stern['selected']
+        befehle.append(('kreis', stern['x'], stern['y'], stern['radius'], stern.get('farbe') or 'white',
+                        'cyan' if gewaehlt else 'rgba(255, 255, 255, 0.3)', 3 if gewaehlt else 1, None))
+        if relative_level <= 4 or gewaehlt:
+            befehle.append(('text', stern['x'] + stern['radius'] + 5, stern['y'], stern['name'], 'white', 10, False, 0, False))
+
+    befehle.append(('kreis', sonne['x'], sonne['y'], sonne['radius'], sonne.get('farbe') or 'yellow',
+                    'cyan' if sonne['selected'] else 'orange', 3 if sonne['selected'] else 2, None))
+    befehle.append(('text', sonne['x'] + sonne['radius'] + 5, sonne['y'], sonne['name'], 'yellow', 12, True, 0, False))
+
+
+def _galaxien(data, zoom_level, befehle):
+    for galaxie in data['galaxien']:
+        gewaehlt = galaxie['selected']
+        befehle.append(('kreis', galaxie['x'], galaxie['y'], galaxie['radius'], galaxie.get('farbe', 'rgba(200, 200, 255, 0.7)'),
+                        'cyan' if gewaehlt else 'lightblue', 3 if gewaehlt else 1, None))
+        if (zoom_level >= -25 and galaxie.get('beschriftung', True)) or gewaehlt:
+            befehle.append(('text', galaxie['x'] + galaxie['radius'] + 5, galaxie['y'], galaxie['name'], 'white', 9, False, 0, False))
+
+    milchstrasse = data['milchstrasse']
+    befehle.append(('kreis', milchstrasse['x'], milchstrasse['y'], milchstrasse['radius'], 'rgba(255, 255, 200, 0.8)',
+                    'cyan' if milchstrasse['selected'] else 'yellow', 3 if milchstrasse['selected'] else 2, None))
+
+
+def svg(befehle, groesse=FENSTER_GROESSE):
+    """SVG mit viewBox in Fensterkoordinaten, `groesse` nur als Anzeigegröße"""
+    teile = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{groesse}" height="{groesse}" '
+        f'viewBox="0 0 {FENSTER_GROESSE} {FENSTER_GROESSE}" font-family="Arial, sans-serif">',
+        f'<rect width="100%" height="100%" fill="{HINTERGRUND}"/>'
+    ]
+    for befehl in befehle:
+        art = befehl[0]
+        if art == 'kreis':
+            _, x, y, r, fuellung, rand, breite, strich = befehl
+            teile.append(
+                f'<circle cx="{x:.2f}" cy="{y:.2f}" r="{r:.2f}" fill={quoteattr(fuellung or "none")} '
+                f'stroke={quoteattr(rand)} stroke-width="{breite}"{_svg_strich(strich)}/>'
+            )
+        elif art == 'linie':
+            _, x1, y1, x2, y2, farbe, breite, strich = befehl
+            teile.append(
+                f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" '
+                f'stroke={quoteattr(farbe)} stroke-width="{breite}"{_svg_strich(strich)}/>'
+            )
+        else:
+            _, x, y, text, farbe, schriftgroesse, fett, drehung, zentriert = befehl
+            attribute = f'font-size="{schriftgroesse}" fill={quoteattr(farbe)}'
+            if fett:
+                attribute += ' font-weight="bold"'
+            if zentriert:
+                attribute += ' text-anchor="middle"'
+            if drehung:
+                attribute += f' transform="translate({x:.2f} {y:.2f}) rotate({drehung:.2f})"'
+                x = y = 0
+            teile.append(f'<text x="{x:.2f}" y="{y:.2f}" {attribute}>{escape(text)}</text>')
+    teile.append('</svg>')
+    return '\n'.join(teile).encode('utf-8')
+
+
+def _svg_strich(strich):
+    return f' stroke-dasharray="{strich[0]} {strich[1]}"' if strich else ''
+
+
+def png(befehle, groesse=FENSTER_GROESSE):
+    """PNG über Pillow (braucht kein Display); ohne Pillow RuntimeError"""
+    if Image is None:
+        raise RuntimeError("PNG-Ausgabe braucht Pillow (pip install pillow)")
+
+    faktor = groesse * PNG_UEBERABTASTUNG / FENSTER_GROESSE
+    seite = groesse * PNG_UEBERABTASTUNG
+    bild = Image.new('RGBA', (seite, seite), HINTERGRUND)
+    zeichnen = ImageDraw.Draw(bild, 'RGBA')
+
+    for befehl in befehle:
+        art = befehl[0]
+        if art == 'kreis':
+            _, x, y, r, fuellung, rand, breite, strich = befehl
+            x, y, r = x * faktor, y * faktor, r * faktor
+            linie = max(1, round(breite * faktor))
+            box = [x - r, y - r, x + r, y + r]
+            if fuellung:
+                zeichnen.ellipse(box, fill=_farbe(fuellung))
+            if strich:
+                _gestrichelter_kreis(zeichnen, x, y, r, seite, [s * faktor for s in strich], _farbe(rand), linie)
+            else:
+                zeichnen.ellipse(box, outline=_farbe(rand), width=linie)
+        elif art == 'linie':
+            _, x1, y1, x2, y2, farbe, breite, strich = befehl
+            x1, y1, x2, y2 = x1 * faktor, y1 * faktor, x2 * faktor, y2 * faktor
+            linie = max(1, round(breite * faktor))
+            if strich:
+                laenge = math.hypot(x2 - x1, y2 - y1)
+                periode = (strich[0] + strich[1]) * faktor
+                position = 0.0
+                while position < laenge:
+                    ende = min(position + strich[0] * faktor, laenge)
+                    zeichnen.line([x1 + (x2 - x1) * position / laenge, y1 + (y2 - y1) * position / laenge,
+                                   x1 + (x2 - x1) * ende / laenge, y1 + (y2 - y1) * ende / laenge],
+                                  fill=_farbe(farbe), width=linie)
+                    position += periode
+            else:
+                zeichnen.line([x1, y1, x2, y2], fill=_farbe(farbe), width=linie)
+        else:
+            _, x, y, text, farbe, schriftgroesse, fett, drehung, zentriert = befehl
+            schrift = _schrift(max(1, round(schriftgroesse * faktor)))
+            # Wie auf dem Canvas: y ist die Grundlinie, zentriert um x
+            anker = 'ms' if zentriert else 'ls'
+            if drehung:
+                _gedrehter_text(bild, x * faktor, y * faktor, text, _farbe(farbe), schrift, drehung, anker)
+            else:
+                zeichnen.text((x * faktor, y * faktor), text, fill=_farbe(farbe), font=schrift, anchor=anker)
+
+    bild = bild.convert('RGB').resize((groesse, groesse), Image.LANCZOS)
+    puffer = io.BytesIO()
+    bild.save(puffer, format='PNG', optimize=True)
+    return puffer.getvalue()
+
+
+def _gestrichelter_kreis(zeichnen, x, y, r, seite, strich, farbe, linie):
+    """Strichmuster als kurze Sehnen, Längen in Pixeln wie auf dem Canvas. Nur im
+    Winkelbereich, der das Bild schneiden kann: weit herausgezoomte Bahnen haben
+    sonst Zehntausende Striche."""
+    bereich = _sichtbare_winkel(x, y, r, seite)
+    if bereich is None or r <= 0:
+        return
+    anfang, ende = bereich
+    strich_winkel = strich[0] / r
+    periode = (strich[0] + strich[1]) / r
+    winkel = anfang
+    while winkel < ende:
+        zeichnen.line([x + r * math.cos(winkel), y + r * math.sin(winkel),
+                       x + r * math.cos(winkel + strich_winkel), y + r * math.sin(winkel + strich_winkel)],
+                      fill=farbe, width=linie)
+        winkel += periode
+
+
+def _sichtbare_winkel(x, y, r, seite):
+    """Winkelbereich (rad), in dem der Kreis das Bild [0, seite]² treffen kann,
+    None wenn er ganz daneben liegt oder das Bild ganz umschließt"""
+    naechster = math.hypot(x - min(max(x, 0), seite), y - min(max(y, 0), seite))
+    fernster = math.hypot(max(abs(x), abs(x - seite)), max(abs(y), abs(y - seite)))
+    if naechster > r or fernster < r:
+        return None
+    if 0 <= x <= seite and 0 <= y <= seite:
+        return 0.0, 2 * math.pi
+    # Mittelpunkt außerhalb: das Bild liegt in einem Sektor < π, begrenzt von den Ecken
+    ecken = [math.atan2(ey - y, ex - x) for ex in (0, seite) for ey in (0, seite)]
+    relativ = [(w - ecken[0] + math.pi) % (2 * math.pi) - math.pi for w in ecken]
+    return ecken[0] + min(relativ), ecken[0] + max(relativ)
+
+
+def _gedrehter_text(bild, x, y, text, farbe, schrift, drehung, anker):
+    """Text in ein eigenes Bild zeichnen, um den Ankerpunkt drehen und einfügen"""
+    links, oben, rechts, unten = schrift.getbbox(text, anchor=anker)
+    rand = max(rechts - links, unten - oben)
+    seite = 2 * rand + 4
+    ebene = Image.new('RGBA', (seite, seite), (0, 0, 0, 0))
+    ImageDraw.Draw(ebene).text((seite / 2, seite / 2), text, fill=farbe, font=schrift, anchor=anker)
+    # Canvas dreht im Uhrzeigersinn (y nach unten), Pillow gegen den Uhrzeigersinn
+    ebene = ebene.rotate(-drehung, resample=Image.BICUBIC, center=(seite / 2, seite / 2))
+    bild.alpha_composite(ebene, (round(x - seite / 2), round(y - seite / 2)))
+
+
+@lru_cache(maxsize=256)
+def _farbe(css):
+    """CSS-Farbe → RGBA-Tupel; rgba() mit Deckkraft 0..1 wie im Browser"""
+    if css.startswith('rgba('):
+        r, g, b, a = (teil.strip() for teil in css[5:-1].split(','))
+        return int(r), int(g), int(b), round(float(a) * 255)
+    return ImageColor.getcolor(css, 'RGBA')
+
+
+@lru_cache(maxsize=32)
+def _schrift(groesse):
+    try:
+        return ImageFont.load_default(size=groesse)
+    except TypeError:  # Pillow < 10.1: nur die feste Bitmap-Schrift
+        return ImageFont.load_default()
+
+
+class BildCache:
+    """LRU für gerenderte Bilder mit Obergrenze in Bytes statt Einträgen"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.belegt = 0
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self._eintraege = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hole_oder_berechne(self, schluessel, berechnen):
+        with self._lock:
+            bild = self._eintraege.get(schluessel)
+            if bild is not None:
+                self._eintraege.move_to_end(schluessel)
+                self.treffer += 1
+                return bild
+            self.fehlschlaege += 1
+
+        bild = berechnen()
+        if len(bild) > self.max_bytes:
+            return bild
+        with self._lock:
+            if schluessel not in self._eintraege:
+                self._eintraege[schluessel] = bild
+                self.belegt += len(bild)
+            while self.belegt > self.max_bytes:
+                _, alt = self._eintraege.popitem(last=False)
+                self.belegt -= len(alt)
+        return bild
+
+    def statistik(self):
+        with self._lock:
+            return {'treffer': self.treffer, 'fehlschlaege': self.fehlschlaege,
+                    'eintraege': len(self._eintraege), 'bytes': self.belegt}
@@ -0,0 +1,125 @@
+import json
+import struct
+import sys
+from array import array
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    import msgpack
+except ImportError:  # MessagePack ist optional und wird ohne Bibliothek nicht angeboten
+    msgpack = None
+
+# --- ANTWORTFORMATE FÜR /api/planet_data ---
+# Ausgehandelt über den Accept-Header; ohne passenden Eintrag bleibt es beim
+# bisherigen JSON.
+#
+# Kompakt (JSON oder MessagePack): Objektlisten (planeten, sterne, galaxien,
+# umlaufbahnen) werden zu Spalten {"anzahl": n, "spalten": {feld: [...]},
+# "markiert": {feld: [indizes]}}; boolesche Felder stehen als Liste der
+# Indizes mit true in "markiert". Pixelwerte sind auf 2 Nachkommastellen
+# gerundet, Winkel auf 6. Die Tierkreiszeichen (zodiak.zeichen) fehlen, sie
+# sind statisch und stehen in /api/layout.
+#
+# Float32: b'PUF1', uint32 Kopflänge, Kopf (kompaktes JSON), Auffüllung auf
+# 4 Byte, danach je Objektliste die in "float32" genannten Spalten als
+# Float32-Blöcke (Little-Endian, je anzahl * 4 Byte) in Kopfreihenfolge.
+
+JSON = 'application/json'
+KOMPAKT = 'application/vnd.planetenuhr.kompakt+json'
+FLOAT32 = 'application/vnd.planetenuhr.float32'
+MSGPACK = 'application/msgpack'
+
+ANGEBOTEN = [JSON, KOMPAKT, FLOAT32] + ([MSGPACK] if msgpack is not None else [])
+FORMAT_VERSION = 1
+
+OBJEKTLISTEN = ('planeten', 'sterne', 'galaxien', 'umlaufbahnen')
+PIXEL_FELDER = {'x', 'y', 'radius', 'point_radius', 'orbit_radius'}
+WINKEL_FELDER = {'helio_lon_rad'}
+FLOAT32_MAGIC = b'PUF1'
+
+
+def waehle_format(accept):
+    """Bestes angebotenes Format für einen Accept-Header (Standard: JSON)"""
+    if not accept:
+        return JSON
+    return parse_accept_header(accept, MIMEAccept).best_match(ANGEBOTEN, default=JSON)
+
+
+def kompakt(planet_data):
+    """Wandelt eine Ansicht in das spaltenorientierte Format um"""
+    ergebnis = {'format': FORMAT_VERSION}
+    for schluessel, wert in planet_data.items():
+        if schluessel in OBJEKTLISTEN and isinstance(wert, list):
+            ergebnis[schluessel] = _spalten(wert)
+        elif schluessel == 'zodiak':
+            ergebnis[schluessel] = {k: v for k, v in wert.items() if k != 'zeichen'}
+        elif isinstance(wert, dict) and schluessel in ('sonne', 'milchstrasse'):
+            ergebnis[schluessel] = {k: _runde(k, v) for k, v in wert.items()}
+        else:
+            ergebnis[schluessel] = wert
+    return ergebnis
+
+
+def kodiere(planet_data, format):
+    """Serialisiert eine Ansicht in einem der Nicht-Standard-Formate"""
+    if format == KOMPAKT:
+        return _json(kompakt(planet_data))
+    if format == MSGPACK:
+        return msgpack.packb(kompakt(planet_data), use_bin_type=True)
+    if format == FLOAT32:
+        return _float32(kompakt(planet_data))
+    raise ValueError(f"Unbekanntes Format: {format}")
+
+
+def _spalten(objekte):
+    felder = {}
+    for objekt in objekte:
+        for feld in objekt:
+            felder.setdefault(feld, None)
+
+    spalten = {}
+    markiert = {}
+    for feld in felder:
+        werte = [objekt.get(feld) for objekt in objekte]
+        if werte and all(isinstance(wert, bool) for wert in werte):
+            markiert[feld] = [i for i, wert in enumerate(werte) if wert]
+        elif feld in PIXEL_FELDER:
+            spalten[feld] = [round(wert, 2) for wert in werte]
+        elif feld in WINKEL_FELDER:
+            spalten[feld] = [round(wert, 6) for wert in werte]
+        else:
+            spalten[feld] = werte
+    return {'anzahl': len(objekte), 'spalten': spalten, 'markiert': markiert}
+
+
+def _runde(feld, wert):
+    if feld in PIXEL_FELDER and isinstance(wert, float):
+        return round(wert, 2)
+    return wert
+
+
+def _float32(daten):
+    """Zahlenspalten der Objektlisten als Float32-Blöcke hinter einem JSON-Kopf"""
+    bloecke = []
+    for schluessel in OBJEKTLISTEN:
+        liste = daten.get(schluessel)
+        if liste is None:
+            continue
+        binaer = [feld for feld in liste['spalten'] if feld in PIXEL_FELDER or feld in WINKEL_FELDER]
+        for feld in binaer:
+            block = array('f', liste['spalten'].pop(feld))
+            if sys.byteorder != 'little':
+                block.byteswap()
+            bloecke.append(block.tobytes())
+        liste['float32'] = binaer
+
+    kopf = _json(daten)
+    # Mit Leerzeichen (gültiges JSON) auffüllen, damit die Blöcke 4-Byte-ausgerichtet sind
+    kopf += b' ' * (-(len(FLOAT32_MAGIC) + 4 + len(kopf)) % 4)
+    return b''.join([FLOAT32_MAGIC, struct.pack('<I', len(kopf)), kopf] + bloecke)
+
+
+def _json(daten):
+    return json.dumps(daten, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,313 @@
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from concurrent.futures import as_completed
+
+import ephem
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    import msvcrt
+    fcntl = None
+
+# --- EPHEMERIDEN-TABELLE ---
+# Heliozentrische Längen ändern sich glatt und sind für alle Nutzer gleich.
+# Sie werden deshalb einmal auf einem festen Zeitgitter vorberechnet und
+# danach nur noch interpoliert.
+#
+# Datei (per mmap von allen Prozessen geteilt): Kopf, ein Byte pro Block
+# (1 = fertig), danach je Körper ein float32-Array. Gerechnet wird in
+# Blöcken, die um den heutigen Tag zuerst; jeder fertige Block ist sofort
+# für alle nutzbar.
+
+DATEI_KENNUNG = b'PUEPH2'
+BLOCK_GROESSE = 1024  # Gitterpunkte pro Block
+WARTEZEIT = 0.5  # Sekunden zwischen zwei Blicken auf einen fremden Aufbau
+ZWEI_PI = 2 * math.pi
+
+
+class EphemeridenTabelle:
+    """Vorberechnete heliozentrische Längen (hlong) mit kubischer Interpolation.
+
+    Pro Himmelskörper wird hlong als float32 (0..2π) auf einem Gitter mit
+    `schritt_tage` Abstand gespeichert. Abgefragt wird mit 4-Punkt-Lagrange-
+    Interpolation über die lokal entfaltete Länge.
+
+    Fehlerschranke gegenüber direktem ephem (Tagesgitter, 1800-2200, geprüft
+    mit `pruefe_genauigkeit`): < 2e-6 rad (≈ 0,4 Bogensekunden) für alle
+    Körper, Merkur ist der ungünstigste Fall. Das liegt weit unter einem
+    Pixel bei jeder Zoomstufe.
+    """
+
+    def __init__(self, objekte, start, ende, schritt_tage=1.0, pfad=None):
+        self.objekte = dict(objekte)
+        self.namen = list(self.objekte)
+        self.start = float(ephem.Date(start))
+        self.schritt = float(schritt_tage)
+        self.anzahl = int((float(ephem.Date(ende)) - self.start) / self.schritt) + 1
+        self.ende = self.start + (self.anzahl - 1) * self.schritt
+        self.bloecke = -(-self.anzahl // BLOCK_GROESSE)
+        self.pfad = pfad
+        self._daten = None
+        self._fertig = None
+        self._mmap = None
+        self._vollstaendig = False
+        self._lock = threading.Lock()
+
+    @property
+    def bereit(self):
+        """True, sobald alle Blöcke fertig sind (auch wenn ein anderer Prozess sie gerechnet hat)"""
+        if not self._vollstaendig and self._fertig is not None and all(self._fertig):
+            self._vollstaendig = True
+        return self._vollstaendig
+
+    def im_bereich(self, zeit):
+        # Für 4-Punkt-Interpolation wird je ein Nachbar links und rechts gebraucht
+        return self.start + self.schritt <= zeit < self.ende - self.schritt
+
+    def laengen(self, zeit):
+        """Liefert {Name: hlong} für einen Zeitpunkt oder None außerhalb der Tabelle"""
+        daten = self._daten
+        if daten is None:
+            return None
+
+        zeit = float(zeit)
+        if not self.im_bereich(zeit):
+            return None
+
+        position = (zeit - self.start) / self.schritt
+        i = int(position)
+        t = position - i
+        if not self._vollstaendig:
+            # Während des Aufbaus nur aus fertigen Blöcken (Stützstellen i-1..i+2)
+            fertig = self._fertig
+            if not (fertig[(i - 1) // BLOCK_GROESSE] and fertig[(i + 2) // BLOCK_GROESSE]):
+                return None
+
+        # Lagrange-Gewichte für die Stützstellen i-1, i, i+1, i+2
+        w0 = -t * (t - 1) * (t - 2) / 6
+        w1 = (t + 1) * (t - 1) * (t - 2) / 2
+        w2 = -(t + 1) * t * (t - 2) / 2
+        w3 = (t + 1) * t * (t - 1) / 6
+
+        ergebnis = {}
+        for name, werte in zip(self.namen, daten):
+            y0, y1, y2, y3 = werte[i - 1], werte[i], werte[i + 1], werte[i + 2]
+            # Sprünge über 0/2π lokal entfalten (Tagesbewegung << π)
+            y0 = _entfalte(y0, y1)
+            y2 = _entfalte(y2, y1)
+            y3 = _entfalte(y3, y2)
+            ergebnis[name] = (w0 * y0 + w1 * y1 + w2 * y2 + w3 * y3) % ZWEI_PI
+
+        return ergebnis
+
+    def aufbauen(self, executor=None):
+        """Öffnet bzw. berechnet die Tabelle.
+
+        Mit `pfad` teilen sich alle Prozesse eine Datei: wer die Dateisperre
+        bekommt, rechnet fehlende Blöcke (mit `executor` parallel in einem
+        Prozess-Pool), alle anderen mappen die Datei und nutzen fertige Blöcke
+        schon während des Aufbaus.
+        """
+        with self._lock:
+            if self.bereit:
+                return
+            if not self.pfad:
+                self._im_speicher()
+                self._berechne_fehlende(executor)
+                return
+
+            self._oeffnen(anlegen=False)
+            if self.bereit:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.pfad) or '.', exist_ok=True)
+                sperre = _Dateisperre(f"{self.pfad}.lock")
+            except OSError:
+                self._im_speicher()
+                self._berechne_fehlende(executor)
+                return
+
+            with sperre:
+                while not sperre.versuchen():
+                    # Ein anderer Prozess rechnet: mitlesen, bis er fertig ist
+                    self._oeffnen(anlegen=False)
+                    if self.bereit:
+                        return
+                    time.sleep(WARTEZEIT)
+                self._oeffnen(anlegen=True)
+                self._berechne_fehlende(executor)
+
+    def mitlesen(self):
+        """Mappt die Tabellendatei, ohne selbst zu rechnen (z.B. in Pool-Prozessen);
+        fertige Blöcke sind sofort nutzbar, fehlende rechnet `laengen` nicht"""
+        # Baut gerade jemand (Sperre belegt), ist die Datei schon gemappt oder
+        # wird es gleich; warten wäre hier falsch
+        if self._daten is None and self.pfad and self._lock.acquire(blocking=False):
+            try:
+                self._oeffnen(anlegen=False)
+            finally:
+                self._lock.release()
+
+    def fortschritt(self):
+        """Anteil fertiger Blöcke (0..1)"""
+        fertig = self._fertig
+        return 0.0 if fertig is None else sum(fertig) / self.bloecke
+
+    def pruefe_genauigkeit(self, stichproben=2000):
+        """Maximale Abweichung (rad) je Körper gegenüber direktem ephem"""
+        self.aufbauen()
+        abweichungen = dict.fromkeys(self.namen, 0.0)
+        instanzen = {name: klasse() for name, klasse in self.objekte.items()}
+        spanne = self.ende - self.start - 4 * self.schritt
+
+        for k in range(stichproben):
+            # Deterministische, über den Bereich verteilte Zeitpunkte zwischen den Gitterpunkten
+            zeit = self.start + 2 * self.schritt + (k * 0.618033988749895 % 1.0) * spanne
+            interpoliert = self.laengen(zeit)
+            for name, obj in instanzen.items():
+                obj.compute(zeit)
+                fehler = abs((interpoliert[name] - float(obj.hlong) + math.pi) % ZWEI_PI - math.pi)
+                abweichungen[name] = max(abweichungen[name], fehler)
+
+        return abweichungen
+
+    def _berechne_fehlende(self, executor):
+        """Rechnet alle offenen Blöcke, die um den heutigen Tag zuerst"""
+        heute = int((float(ephem.now()) - self.start) / self.schritt) // BLOCK_GROESSE
+        offen = sorted((b for b in range(self.bloecke) if not self._fertig[b]), key=lambda b: abs(b - heute))
+        objekte = list(self.objekte.items())
+        auftraege = [(b, b * BLOCK_GROESSE, min((b + 1) * BLOCK_GROESSE, self.anzahl)) for b in offen]
+
+        if executor is None:
+            ergebnisse = ((b, _berechne_block(objekte, self.start, self.schritt, i0, i1)) for b, i0, i1 in auftraege)
+        else:
+            futures = {
+                executor.submit(_berechne_block, objekte, self.start, self.schritt, i0, i1): b
+                for b, i0, i1 in auftraege
+            }
+            ergebnisse = ((futures[future], future.result()) for future in as_completed(futures))
+
+        for block, spalten in ergebnisse:
+            i0 = block * BLOCK_GROESSE
+            for werte, neu in zip(self._daten, spalten):
+                werte[i0:i0 + len(neu)] = neu
+            # Erst nach den Daten als fertig markieren (andere Prozesse lesen mit)
+            self._fertig[block] = 1
+
+        if self._mmap is not None:
+            self._mmap.flush()
+        self._vollstaendig = True
+
+    def _kopf(self):
+        namen = '\0'.join(self.namen).encode('utf-8')
+        return DATEI_KENNUNG + struct.pack('<ddIH', self.start, self.schritt, self.anzahl, len(namen)) + namen
+
+    def _aufteilung(self):
+        """Offsets von Blockmarkierungen und Daten sowie Dateigröße"""
+        markierungen = _ausrichten(len(self._kopf()))
+        daten = _ausrichten(markierungen + self.bloecke)
+        return markierungen, daten, daten + 4 * self.anzahl * len(self.namen)
+
+    def _im_speicher(self):
+        if self._daten is None:
+            self._fertig = bytearray(self.bloecke)
+            self._daten = [array('f', bytes(4 * self.anzahl)) for _ in self.namen]
+
+    def _oeffnen(self, anlegen):
+        """Mappt die Tabellendatei; mit `anlegen` wird eine fehlende oder
+        unpassende Datei (anderer Bereich, andere Körper) leer neu angelegt"""
+        if self._daten is not None:
+            return
+        markierungen, daten, groesse = self._aufteilung()
+        kopf = self._kopf()
+        datei = None
+        try:
+            datei = open(self.pfad, 'r+b')
+            if datei.read(len(kopf)) != kopf or os.fstat(datei.fileno()).st_size != groesse:
+                datei.close()
+                datei = None
+        except OSError:
+            datei = None
+
+        if datei is None:
+            if not anlegen:
+                return
+            try:
+                temp_pfad = f"{self.pfad}.{os.getpid()}.tmp"
+                with open(temp_pfad, 'wb') as neu:
+                    neu.write(kopf)
+                    neu.truncate(groesse)
+                os.replace(temp_pfad, self.pfad)
+                datei = open(self.pfad, 'r+b')
+            except OSError:
+                self._im_speicher()
+                return
+
+        with datei:
+            self._mmap = mmap.mmap(datei.fileno(), groesse)
+        puffer = memoryview(self._mmap)
+        self._fertig = puffer[markierungen:markierungen + self.bloecke]
+        laenge = 4 * self.anzahl
+        self._daten = [
+            puffer[daten + k * laenge:daten + (k + 1) * laenge].cast('f')
+            for k in range(len(self.namen))
+        ]
+
+
+def _berechne_block(objekte, start, schritt, i0, i1):
+    """hlong aller Körper für die Gitterpunkte i0..i1-1 (läuft auch im Prozess-Pool)"""
+    spalten = []
+    for _, klasse in objekte:
+        obj = klasse()
+        werte = array('f', bytes(4 * (i1 - i0)))
+        for i in range(i0, i1):
+            obj.compute(start + i * schritt)
+            werte[i - i0] = obj.hlong
+        spalten.append(werte)
+    return spalten
+
+
+class _Dateisperre:
+    """Exklusive, nicht blockierende Sperre über eine Datei (fcntl bzw. msvcrt);
+    wird beim Schließen bzw. Prozessende automatisch frei"""
+
+    def __init__(self, pfad):
+        self._datei = open(pfad, 'a+b')
+
+    def versuchen(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._datei.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._datei.seek(0)
+                msvcrt.locking(self._datei.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *fehler):
+        self._datei.close()
+
+
+def _ausrichten(position):
+    return (position + 7) // 8 * 8
+
+
+def _entfalte(wert, referenz):
+    """Verschiebt `wert` um ±2π, sodass er möglichst nahe an `referenz` liegt"""
+    differenz = wert - referenz
+    if differenz > math.pi:
+        return wert - ZWEI_PI
+    if differenz < -math.pi:
+        return wert + ZWEI_PI
+    return wert
@@ -0,0 +1,176 @@
+import math
+from functools import lru_cache
+
+import ephem
+
+try:
+    import numpy as np
+except ImportError:  # ohne NumPy läuft der Grobscan als Python-Schleife
+    np = None
+
+# --- EREIGNISSUCHE: KONJUNKTIONEN, OPPOSITIONEN, TIERKREIS-EINTRITTE ---
+# Heliozentrisch, mit denselben Längen wie die Ansicht. Gesucht wird in
+# festen Blöcken: Grobscan auf einem Tagesgitter (Vorzeichenwechsel der
+# Ereignisfunktion), danach Nullstellen-Verfeinerung mit Regula falsi
+# (Illinois-Variante). Blöcke sind am Gitter ausgerichtet und werden
+# gecacht, überlappende Suchen teilen sich also die Arbeit.
+
+ARTEN = ('konjunktion', 'opposition', 'eintritt')
+ZWEI_PI = 2 * math.pi
+ZEICHEN_BREITE = math.radians(30)
+# Zeitgenauigkeit der Verfeinerung in Tagen (≈ 1 Sekunde)
+ZEIT_TOLERANZ = 1e-5
+MAX_ITERATIONEN = 40
+
+
+def _wickeln(winkel):
+    """Winkel auf [-π, π)"""
+    return (winkel + math.pi) % ZWEI_PI - math.pi
+
+
+class EreignisSuche:
+    """Sucht Ereignisse in [start, ende) (ephem-Tage).
+
+    `laengen_funktion(zeiten)` liefert je Zeitpunkt {Name: heliozentrische
+    Länge in rad}, z.B. berechne_helio_laengen. Das Gitter (`schritt_tage`)
+    muss fein genug sein, dass zwischen zwei Stützstellen höchstens ein
+    Ereignis je Funktion liegt; Merkur braucht für 30° mindestens ~5 Tage.
+    """
+
+    def __init__(self, laengen_funktion, zeichen, schritt_tage=1.0, block_tage=100, cache_bloecke=4096):
+        self.laengen_funktion = laengen_funktion
+        self.zeichen = [name for name, _ in zeichen]
+        self.schritt = float(schritt_tage)
+        self.block_tage = block_tage
+        self._block = lru_cache(maxsize=cache_bloecke)(self._berechne_block)
+
+    def suche(self, start, ende, arten=ARTEN, koerper=None):
+        """Generator: Ereignisse zeitlich sortiert, blockweise sobald gefunden"""
+        for ereignisse in self.bloecke(start, ende, arten, koerper):
+            yield from ereignisse
+
+    def bloecke(self, start, ende, arten=ARTEN, koerper=None):
+        """Generator: je Block die Ereignisse in [start, ende) als Liste (auch leer)"""
+        arten = tuple(art for art in ARTEN if art in arten)
+        koerper = tuple(koerper) if koerper else None
+        block = math.floor(start / self.block_tage) * self.block_tage
+        while block < ende:
+            yield [ereignis for ereignis in self._block(block, arten, koerper) if start <= ereignis['zeit'] < ende]
+            block += self.block_tage
+
+    def cache_statistik(self):
+        info = self._block.cache_info()
+        return {'treffer': info.hits, 'fehlschlaege': info.misses, 'bloecke': info.currsize}
+
+    def _berechne_block(self, block_start, arten, koerper):
+        anzahl = int(round(self.block_tage / self.schritt))
+        zeiten = [block_start + i * self.schritt for i in range(anzahl + 1)]
+        laengen = self.laengen_funktion(zeiten)
+        namen = [name for name in laengen[0] if koerper is None or name in koerper]
+
+        kandidaten = _grobscan_numpy(laengen, namen, arten) if np is not None else _grobscan(laengen, namen, arten)
+
+        ereignisse = []
+        for i, art, koerper_paar, ziel in kandidaten:
+            zeit = self._verfeinern(zeiten[i], zeiten[i + 1], art, koerper_paar, ziel)
+            ereignisse.append(self._ereignis(zeit, art, koerper_paar, ziel))
+        ereignisse.sort(key=lambda ereignis: ereignis['zeit'])
+        return tuple(ereignisse)
+
+    def _funktion(self, zeit, art, koerper_paar, ziel):
+        laengen = self.laengen_funktion([zeit])[0]
+        if art == 'eintritt':
+            return _wickeln(laengen[koerper_paar[0]] - ziel * ZEICHEN_BREITE)
+        differenz = laengen[koerper_paar[0]] - laengen[koerper_paar[1]]
+        return _wickeln(differenz if art == 'konjunktion' else differenz - math.pi)
+
+    def _verfeinern(self, t0, t1, art, koerper_paar, ziel):
+        """Regula falsi (Illinois): wie Bisektion garantiert, aber meist in wenigen Schritten"""
+        f0 = self._funktion(t0, art, koerper_paar, ziel)
+        f1 = self._funktion(t1, art, koerper_paar, ziel)
+        seite = 0
+        for _ in range(MAX_ITERATIONEN):
+            if t1 - t0 < ZEIT_TOLERANZ or f0 == f1:
+                break
+            t = t1 - f1 * (t1 - t0) / (f1 - f0)
+            f = self._funktion(t, art, koerper_paar, ziel)
+            if f == 0:
+                return t
+            if (f < 0) == (f1 < 0):
+                t1, f1 = t, f
+                if seite == -1:
+                    f0 /= 2
+                seite = -1
+            else:
+                t0, f0 = t, f
+                if seite == 1:
+                    f1 /= 2
+                seite = 1
+        return (t0 + t1) / 2
+
+    def _ereignis(self, zeit, art, koerper_paar, ziel):
+        laengen = self.laengen_funktion([zeit])[0]
+        ereignis = {
+            'art': art,
+            'zeit': zeit,
+            'datum': ephem.Date(zeit).datetime().strftime("%Y/%m/%d %H:%M:%S"),
+            'koerper': list(koerper_paar),
+            'laenge_grad': round(math.degrees(laengen[koerper_paar[0]] % ZWEI_PI), 4)
+        }
+        if art == 'eintritt':
+            ereignis['zeichen'] = self.zeichen[ziel % len(self.zeichen)]
+        return ereignis
+
+
+def _paare(namen):
+    return [(a, b) for i, a in enumerate(namen) for b in namen[i + 1:]]
+
+
+def _grobscan(laengen, namen, arten):
+    """Kandidaten (Intervallindex, Art, Körper, Zielzeichen) per Vorzeichenwechsel"""
+    kandidaten = []
+    for i in range(len(laengen) - 1):
+        vorher, nachher = laengen[i], laengen[i + 1]
+        for a, b in _paare(namen):
+            d0 = vorher[a] - vorher[b]
+            d1 = nachher[a] - nachher[b]
+            for art, versatz in (('konjunktion', 0.0), ('opposition', math.pi)):
+                if art in arten:
+                    f0, f1 = _wickeln(d0 - versatz), _wickeln(d1 - versatz)
+                    # Wechsel nahe 0, nicht der Sprung bei ±π
+                    if (f0 < 0) != (f1 < 0) and abs(f0) < math.pi / 2 and abs(f1) < math.pi / 2:
+                        kandidaten.append((i, art, (a, b), None))
+        if 'eintritt' in arten:
+            for name in namen:
+                zeichen0 = int((vorher[name] % ZWEI_PI) // ZEICHEN_BREITE)
+                zeichen1 = int((nachher[name] % ZWEI_PI) // ZEICHEN_BREITE)
+                if zeichen0 != zeichen1:
+                    # Heliozentrisch immer rechtläufig: Eintritt in das neue Zeichen
+                    kandidaten.append((i, 'eintritt', (name,), zeichen1))
+    return kandidaten
+
+
+def _grobscan_numpy(laengen, namen, arten):
+    """Wie _grobscan, aber als Array-Operationen über alle Stützstellen und Paare"""
+    matrix = np.array([[werte[name] for name in namen] for werte in laengen], dtype=np.float64)
+    kandidaten = []
+
+    paare = _paare(namen)
+    if paare and ('konjunktion' in arten or 'opposition' in arten):
+        links = [namen.index(a) for a, _ in paare]
+        rechts = [namen.index(b) for _, b in paare]
+        differenz = matrix[:, links] - matrix[:, rechts]
+        for art, versatz in (('konjunktion', 0.0), ('opposition', math.pi)):
+            if art not in arten:
+                continue
+            f = (differenz - versatz + math.pi) % ZWEI_PI - math.pi
+            wechsel = ((f[:-1] < 0) != (f[1:] < 0)) & (np.abs(f[:-1]) < math.pi / 2) & (np.abs(f[1:]) < math.pi / 2)
+            for i, p in zip(*np.nonzero(wechsel)):
+                kandidaten.append((int(i), art, paare[p], None))
+
+    if 'eintritt' in arten:
+        zeichen = np.floor_divide(np.mod(matrix, ZWEI_PI), ZEICHEN_BREITE).astype(np.int64)
+        for i, k in zip(*np.nonzero(zeichen[:-1] != zeichen[1:])):
+            kandidaten.append((int(i), 'eintritt', (namen[k],), int(zeichen[i + 1, k])))
+
+    return kandidaten
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+# --- ERGEBNIS-CACHE ---
+# Gleichzeitige identische Anfragen teilen sich eine Berechnung, fertige
+# Ergebnisse bleiben für kurze Zeit in einem größenbegrenzten LRU-Cache.
+
+
+class _LaufendeBerechnung:
+    def __init__(self):
+        self.fertig = threading.Event()
+        self.wert = None
+        self.fehler = None
+
+
+class ErgebnisCache:
+    """Größenbegrenzter TTL-Cache, der gleichzeitige Anfragen zusammenfasst.
+
+    Für jeden Schlüssel läuft höchstens eine Berechnung; weitere Anfragen
+    warten auf deren Ergebnis (oder Fehler). Zähler: `treffer` (aus dem Cache),
+    `fehlschlaege` (neu berechnet) und `zusammengefasst` (auf eine laufende
+    Berechnung gewartet).
+    """
+
+    def __init__(self, max_eintraege=1024, ttl_sekunden=1.0):
+        self.max_eintraege = max_eintraege
+        self.ttl_sekunden = ttl_sekunden
+        self._eintraege = OrderedDict()
+        self._laufend = {}
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self.zusammengefasst = 0
+
+    def hole_oder_berechne(self, schluessel, berechnen):
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is not None:
+                ablauf, wert = eintrag
+                if ablauf > time.monotonic():
+                    self._eintraege.move_to_end(schluessel)
+                    self.treffer += 1
+                    return wert
+                del self._eintraege[schluessel]
+
+            laufend = self._laufend.get(schluessel)
+            besitzer = laufend is None
+            if besitzer:
+                laufend = _LaufendeBerechnung()
+                self._laufend[schluessel] = laufend
+                self.fehlschlaege += 1
+            else:
+                self.zusammengefasst += 1
+
+        if not besitzer:
+            laufend.fertig.wait()
+            if laufend.fehler is not None:
+                raise laufend.fehler
+            return laufend.wert
+
+        try:
+            wert = berechnen()
+        except BaseException as fehler:
+            laufend.fehler = fehler
+            with self._lock:
+                del self._laufend[schluessel]
+            laufend.fertig.set()
+            raise
+
+        with self._lock:
+            self._eintraege[schluessel] = (time.monotonic() + self.ttl_sekunden, wert)
+            self._eintraege.move_to_end(schluessel)
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+            del self._laufend[schluessel]
+
+        laufend.wert = wert
+        laufend.fertig.set()
+        return wert
+
+    def leeren(self):
+        with self._lock:
+            self._eintraege.clear()
+
+    def statistik(self):
+        with self._lock:
+            anfragen = self.treffer + self.fehlschlaege + self.zusammengefasst
+            return {
+                'eintraege': len(self._eintraege),
+                'max_eintraege': self.max_eintraege,
+                'ttl_sekunden': self.ttl_sekunden,
+                'treffer': self.treffer,
+                'fehlschlaege': self.fehlschlaege,
+                'zusammengefasst': self.zusammengefasst,
+                'trefferquote': (self.treffer + self.zusammengefasst) / anfragen if anfragen else 0.0
+            }
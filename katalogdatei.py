@@ -0,0 +1,153 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# --- SPALTENORIENTIERTES KATALOGFORMAT (memory-mapped) ---
+# Eine Datei pro Katalog: Kopf, Spaltenverzeichnis, danach jede Spalte als
+# zusammenhängender Block (Little-Endian, auf 8 Byte ausgerichtet). Die App
+# öffnet die Datei per mmap; alle Worker-Prozesse teilen sich so dieselben
+# Seiten im Page-Cache und starten ohne zu parsen.
+#
+# Spaltentypen: 'f' float32, 'd' float64, 'B' uint8, 'I' uint32, 'Q' uint64,
+# 'T' Text (uint32-Offsets[anzahl + 1], danach die UTF-8-Bytes).
+
+MAGIC = b'PUKAT1\x00\x00'
+VERSION = 1
+KOPF = struct.Struct('<8sIII')
+SPALTE = struct.Struct('<16sc7xQQ')
+ZAHLENTYPEN = 'fdBIQ'
+
+
+def schreibe_katalog(pfad, anzahl, spalten):
+    """Schreibt `spalten` = [(name, typ, werte), ...] atomar nach `pfad`"""
+    bloecke = []
+    for name, typ, werte in spalten:
+        if typ == 'T':
+            kodiert = [str(wert).encode('utf-8') for wert in werte]
+            offsets = array('I', [0])
+            for text in kodiert:
+                offsets.append(offsets[-1] + len(text))
+            daten = _little_endian(offsets) + b''.join(kodiert)
+            eintraege = len(kodiert)
+        elif typ in ZAHLENTYPEN:
+            zahlen = array(typ, werte)
+            daten = _little_endian(zahlen)
+            eintraege = len(zahlen)
+        else:
+            raise ValueError(f"Unbekannter Spaltentyp: {typ}")
+        if eintraege != anzahl:
+            raise ValueError(f"Spalte {name} hat {eintraege} statt {anzahl} Einträge")
+        bloecke.append((name, typ, daten))
+
+    position = _ausrichten(KOPF.size + SPALTE.size * len(bloecke))
+    verzeichnis = []
+    for name, typ, daten in bloecke:
+        verzeichnis.append(SPALTE.pack(name.encode('ascii'), typ.encode('ascii'), position, len(daten)))
+        position = _ausrichten(position + len(daten))
+
+    temp_pfad = f"{pfad}.{os.getpid()}.tmp"
+    with open(temp_pfad, 'wb') as datei:
+        datei.write(KOPF.pack(MAGIC, VERSION, anzahl, len(bloecke)))
+        datei.write(b''.join(verzeichnis))
+        for _, _, daten in bloecke:
+            datei.write(b'\x00' * (_ausrichten(datei.tell()) - datei.tell()))
+            datei.write(daten)
+    os.replace(temp_pfad, pfad)
+
+
+class Katalogdatei:
+    """Nur-lesender Zugriff auf eine Katalogdatei über mmap.
+
+    Zahlenspalten sind memoryviews direkt auf die gemappten Seiten; Texte
+    werden erst beim Zugriff dekodiert.
+    """
+
+    def __init__(self, pfad):
+        if sys.byteorder != 'little':
+            raise ValueError("Katalogdateien werden nur auf Little-Endian-Systemen unterstützt")
+        self.pfad = pfad
+        with open(pfad, 'rb') as datei:
+            self._mmap = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+        puffer = memoryview(self._mmap)
+
+        magic, version, self.anzahl, spaltenzahl = KOPF.unpack_from(puffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{pfad} ist keine Katalogdatei (Version {VERSION})")
+
+        self._zahlen = {}
+        self._texte = {}
+        for i in range(spaltenzahl):
+            name, typ, position, laenge = SPALTE.unpack_from(puffer, KOPF.size + i * SPALTE.size)
+            name = name.rstrip(b'\x00').decode('ascii')
+            typ = typ.decode('ascii')
+            block = puffer[position:position + laenge]
+            if typ == 'T':
+                grenze = 4 * (self.anzahl + 1)
+                self._texte[name] = (block[:grenze].cast('I'), block[grenze:])
+            else:
+                self._zahlen[name] = block.cast(typ)
+
+    def __len__(self):
+        return self.anzahl
+
+    def spalte(self, name):
+        return self._zahlen[name]
+
+    def text(self, name, i):
+        offsets, blob = self._texte[name]
+        return str(blob[offsets[i]:offsets[i + 1]], 'utf-8')
+
+
+class Speicherkatalog:
+    """Gleiche Schnittstelle wie Katalogdatei, die Spalten liegen aber im
+    Speicher (eingebaute Kataloge); `spalten` wie bei schreibe_katalog"""
+
+    def __init__(self, anzahl, spalten):
+        self.pfad = None
+        self.anzahl = anzahl
+        self._zahlen = {}
+        self._texte = {}
+        for name, typ, werte in spalten:
+            if typ == 'T':
+                self._texte[name] = [str(wert) for wert in werte]
+            elif typ in ZAHLENTYPEN:
+                self._zahlen[name] = array(typ, werte)
+            else:
+                raise ValueError(f"Unbekannter Spaltentyp: {typ}")
+
+    def __len__(self):
+        return self.anzahl
+
+    def spalte(self, name):
+        return self._zahlen[name]
+
+    def text(self, name, i):
+        return self._texte[name][i]
+
+
+def _little_endian(werte):
+    if sys.byteorder != 'little':
+        werte = array(werte.typecode, werte)
+        werte.byteswap()
+    return werte.tobytes()
+
+
+def _ausrichten(position):
+    return (position + 7) // 8 * 8
+
+
+if __name__ == '__main__':
+    import argparse
+    from sternkatalog import konvertiere_galaxien_csv, konvertiere_sterne_csv
+
+    parser = argparse.ArgumentParser(description='CSV-Katalog in das Binärformat umwandeln')
+    parser.add_argument('art', choices=['sterne', 'galaxien'])
+    parser.add_argument('csv')
+    parser.add_argument('ziel')
+    args = parser.parse_args()
+
+    konvertieren = konvertiere_sterne_csv if args.art == 'sterne' else konvertiere_galaxien_csv
+    anzahl = konvertieren(args.csv, args.ziel)
+    print(f"{anzahl} Einträge nach {args.ziel} geschrieben")
@@ -0,0 +1,64 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # Brotli ist optional, ohne wird nur gzip angeboten
+    brotli = None
+
+# --- KOMPRESSION VON ANTWORTEN ---
+# gzip bzw. Brotli je nach Accept-Encoding, erst ab einer Mindestgröße.
+# Antworten mit ETag werden komprimiert zwischengespeichert, damit statische
+# Dateien und Layouts nicht bei jeder Anfrage neu gepackt werden.
+
+KODIERUNGEN = (['br'] if brotli is not None else []) + ['gzip']
+KOMPRIMIERBAR = {
+    'application/json', 'application/javascript', 'application/msgpack',
+    'application/vnd.planetenuhr.float32', 'application/x-ndjson', 'image/svg+xml'
+}
+
+
+def ist_komprimierbar(mimetype):
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype.endswith('+json') or mimetype in KOMPRIMIERBAR)
+
+
+def waehle_kodierung(accept_encoding):
+    """'br', 'gzip' oder None für einen Accept-Encoding-Header"""
+    if not accept_encoding:
+        return None
+    return parse_accept_header(accept_encoding, Accept).best_match(KODIERUNGEN)
+
+
+def komprimieren(body, kodierung):
+    if kodierung == 'br':
+        return brotli.compress(body, quality=5)
+    # mtime=0: gleicher Inhalt ergibt gleiche Bytes (stabile ETags)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class KompressionsCache:
+    """LRU für komprimierte Bodies, Schlüssel (ETag, Kodierung)"""
+
+    def __init__(self, max_eintraege=256):
+        self.max_eintraege = max_eintraege
+        self._eintraege = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hole_oder_komprimiere(self, etag, kodierung, body):
+        schluessel = (etag, kodierung)
+        with self._lock:
+            komprimiert = self._eintraege.get(schluessel)
+            if komprimiert is not None:
+                self._eintraege.move_to_end(schluessel)
+                return komprimiert
+
+        komprimiert = komprimieren(body, kodierung)
+        with self._lock:
+            self._eintraege[schluessel] = komprimiert
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+        return komprimiert
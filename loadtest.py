@@ -0,0 +1,562 @@
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+
+# --- LASTTEST MIT VIRTUELLEN CLIENTS ---
+# Aufruf (Server läuft bereits bzw. wird mit --starten gestartet):
+#   python loadtest.py --clients 50 --dauer 60 --ausgabe last.json
+#   python loadtest.py --clients 50 --dauer 60 --vergleich last.json --toleranz 0.2
+#   python loadtest.py --starten "uvicorn asgi:application --port 5000" --clients 200
+# Jeder virtuelle Client ist eine asyncio-Task, die wie static/script.js
+# anfragt: Ziehen/Zentrieren mit entprelltem scheduleUpdate, Wiedergabe
+# (Tag/Monat/Jahr, vorwärts/rückwärts) wie togglePlayback samt Timeline-Puffer
+# bzw. lokalen Ephemeriden, Echtzeit-Polling wie updatePlanetPositions und
+# Zoom-Durchläufe über alle drei Ebenen. Szenarien wechseln zufällig nach
+# --mix; die Auswertung je Endpunkt (Methode + Pfad) hat für jeden Lauf
+# dieselben Felder, damit sich Läufe mit --vergleich gegenüberstellen lassen.
+# HTTP/1.1 mit Keep-Alive über asyncio-Streams, ohne Zusatzpakete.
+
+# Wie im Client (script.js)
+UPDATE_DELAY = 0.1
+PLAYBACK_SPEEDS = {'realtime': 1.0, 'day': 0.5, 'month': 0.333, 'year': 0.25}
+TIMELINE_BUFFER_S = 3.0
+LOKALE_EPHEMERIDEN_JAHRE = 10
+KOMPAKT_FORMAT = 'application/vnd.planetenuhr.kompakt+json'
+ZOOM_MIN, ZOOM_MAX = -30, 20
+PLANETEN = ['Merkur', 'Venus', 'Erde', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptun', 'Pluto']
+
+SZENARIEN = ('ziehen', 'wiedergabe', 'echtzeit', 'zoom')
+STANDARD_MIX = 'ziehen=3,wiedergabe=3,echtzeit=2,zoom=2'
+# Länge einer Szenario-Episode in Sekunden, danach wählt der Client neu
+EPISODE_S = (5.0, 20.0)
+
+
+def ebene(zoom_level):
+    """Wie getCurrentLevelRange im Client"""
+    if zoom_level >= -10:
+        return 'sonnensystem'
+    if zoom_level >= -20:
+        return 'milchstrasse'
+    return 'galaxien'
+
+
+def format_datum(datum):
+    return datum.strftime('%Y/%m/%d %H:%M:%S')
+
+
+def verschiebe_datum(datum, schritt, anzahl):
+    """Wie Date.setDate/setMonth/setFullYear im Client (siehe app.verschiebe_datum)"""
+    if schritt == 'day':
+        return datum + timedelta(days=anzahl)
+    if schritt == 'month':
+        jahr, monat = divmod(datum.year * 12 + datum.month - 1 + anzahl, 12)
+        monat += 1
+    else:
+        jahr, monat = datum.year + anzahl, datum.month
+    return datetime(jahr, monat, 1, datum.hour, datum.minute, datum.second) + timedelta(days=datum.day - 1)
+
+
+def perzentil(sortiert, p):
+    if not sortiert:
+        return 0.0
+    position = (len(sortiert) - 1) * p / 100
+    unten = int(position)
+    oben = min(unten + 1, len(sortiert) - 1)
+    return sortiert[unten] + (sortiert[oben] - sortiert[unten]) * (position - unten)
+
+
+class HttpFehler(Exception):
+    pass
+
+
+async def ohne_fehler(aufruf):
+    """Für Hintergrund-Anfragen: Fehler sind schon in der Statistik erfasst"""
+    try:
+        return await aufruf
+    except HttpFehler:
+        return None
+
+
+class Statistik:
+    """Dauern, Statuscodes und Bytes je Endpunkt"""
+
+    def __init__(self):
+        self.endpunkte = {}
+        self.szenarien = {name: 0 for name in SZENARIEN}
+
+    def erfasse(self, endpunkt, dauer, status, bytes_anzahl):
+        eintrag = self.endpunkte.get(endpunkt)
+        if eintrag is None:
+            eintrag = self.endpunkte[endpunkt] = {'dauern': [], 'fehler': {}, 'bytes': 0}
+        eintrag['dauern'].append(dauer)
+        eintrag['bytes'] += bytes_anzahl
+        if not isinstance(status, int) or status >= 400:
+            eintrag['fehler'][str(status)] = eintrag['fehler'].get(str(status), 0) + 1
+
+    def bericht(self, laufzeit):
+        ergebnisse = {}
+        for endpunkt, eintrag in sorted(self.endpunkte.items()):
+            ergebnisse[endpunkt] = _kennzahlen(eintrag['dauern'], eintrag['fehler'], eintrag['bytes'], laufzeit)
+        alle = [d for eintrag in self.endpunkte.values() for d in eintrag['dauern']]
+        fehler = {}
+        for eintrag in self.endpunkte.values():
+            for art, anzahl in eintrag['fehler'].items():
+                fehler[art] = fehler.get(art, 0) + anzahl
+        gesamt = _kennzahlen(alle, fehler, sum(e['bytes'] for e in self.endpunkte.values()), laufzeit)
+        return ergebnisse, gesamt
+
+
+def _kennzahlen(dauern, fehler, bytes_anzahl, laufzeit):
+    dauern_ms = sorted(d * 1000 for d in dauern)
+    anzahl = len(dauern_ms)
+    fehler_anzahl = sum(fehler.values())
+    return {
+        'anfragen': anzahl,
+        'durchsatz_pro_s': anzahl / laufzeit if laufzeit else 0.0,
+        'p50_ms': perzentil(dauern_ms, 50),
+        'p90_ms': perzentil(dauern_ms, 90),
+        'p99_ms': perzentil(dauern_ms, 99),
+        'max_ms': dauern_ms[-1] if dauern_ms else 0.0,
+        'fehler': fehler_anzahl,
+        'fehlerquote': fehler_anzahl / anzahl if anzahl else 0.0,
+        'fehlerarten': dict(sorted(fehler.items())),
+        'bytes_pro_anfrage': bytes_anzahl / anzahl if anzahl else 0.0
+    }
+
+
+class HttpClient:
+    """Minimaler HTTP/1.1-Client mit Keep-Alive; wie ein Browser mehrere
+    Verbindungen pro Client (parallele Anfragen, z.B. Layout + Positionen)"""
+
+    MAX_VERBINDUNGEN = 6
+
+    def __init__(self, basis_url, statistik, timeout):
+        teile = urlsplit(basis_url)
+        self.host = teile.hostname
+        self.port = teile.port or 80
+        self.statistik = statistik
+        self.timeout = timeout
+        self._frei = []
+        self._plaetze = asyncio.Semaphore(self.MAX_VERBINDUNGEN)
+
+    async def anfrage(self, methode, pfad, query=None, json_body=None, accept='application/json'):
+        """Antwort-Body (bytes); Dauer, Status und Größe landen in der Statistik"""
+        endpunkt = f"{methode} {pfad}"
+        ziel = pfad + ('?' + urlencode(query) if query else '')
+        body = json.dumps(json_body).encode('utf-8') if json_body is not None else b''
+        kopf = [
+            f"{methode} {ziel} HTTP/1.1", f"Host: {self.host}:{self.port}",
+            f"Accept: {accept}", "Accept-Encoding: gzip, br"
+        ]
+        if json_body is not None:
+            kopf += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        daten = ('\r\n'.join(kopf) + '\r\n\r\n').encode('latin-1') + body
+
+        async with self._plaetze:
+            start = time.perf_counter()
+            try:
+                status, antwort = await asyncio.wait_for(self._senden(daten), self.timeout)
+            except asyncio.TimeoutError:
+                self.statistik.erfasse(endpunkt, time.perf_counter() - start, 'timeout', 0)
+                raise HttpFehler(f"{endpunkt}: Timeout")
+            except (OSError, HttpFehler, asyncio.IncompleteReadError) as fehler:
+                self.statistik.erfasse(endpunkt, time.perf_counter() - start, type(fehler).__name__, 0)
+                raise HttpFehler(f"{endpunkt}: {fehler}")
+            self.statistik.erfasse(endpunkt, time.perf_counter() - start, status, len(antwort))
+        if status >= 400:
+            raise HttpFehler(f"{endpunkt}: HTTP {status}")
+        return antwort
+
+    async def _senden(self, daten):
+        # Wiederverwendete Verbindungen kann der Server inzwischen geschlossen haben
+        for versuch in range(2):
+            wiederverwendet = bool(self._frei)
+            leser, schreiber = self._frei.pop() if wiederverwendet else await asyncio.open_connection(self.host, self.port)
+            try:
+                schreiber.write(daten)
+                await schreiber.drain()
+                status, antwort, offen = await self._lesen(leser)
+            except (OSError, asyncio.IncompleteReadError, HttpFehler):
+                schreiber.close()
+                if wiederverwendet and versuch == 0:
+                    continue
+                raise
+            except BaseException:
+                schreiber.close()
+                raise
+            if offen:
+                self._frei.append((leser, schreiber))
+            else:
+                schreiber.close()
+            return status, antwort
+
+    async def _lesen(self, leser):
+        zeile = await leser.readline()
+        if not zeile:
+            raise HttpFehler('Verbindung geschlossen')
+        version, status = zeile.decode('latin-1').split(None, 2)[:2]
+        kopf = {}
+        while True:
+            zeile = await leser.readline()
+            if zeile in (b'\r\n', b'\n', b''):
+                break
+            name, _, wert = zeile.decode('latin-1').partition(':')
+            kopf[name.strip().lower()] = wert.strip()
+
+        offen = version == 'HTTP/1.1' and kopf.get('connection', '').lower() != 'close'
+        if 'chunked' in kopf.get('transfer-encoding', '').lower():
+            teile = []
+            while True:
+                groesse = int((await leser.readline()).split(b';')[0], 16)
+                if groesse == 0:
+                    # Trailer bis zur Leerzeile
+                    while (await leser.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                teile.append(await leser.readexactly(groesse))
+                await leser.readexactly(2)
+            antwort = b''.join(teile)
+        elif 'content-length' in kopf:
+            antwort = await leser.readexactly(int(kopf['content-length']))
+        elif int(status) in (204, 304):
+            antwort = b''
+        else:
+            antwort = await leser.read()
+            offen = False
+        return int(status), antwort, offen
+
+    def schliessen(self):
+        for _, schreiber in self._frei:
+            schreiber.close()
+        self._frei.clear()
+
+
+class VirtuellerClient:
+    """Zustand eines Browsers: Datum, Zoom, Auswahl, Layout-Cache, Entprellung"""
+
+    def __init__(self, nummer, http, rng, lokale_ephemeriden):
+        self.nummer = nummer
+        self.http = http
+        self.rng = rng
+        self.lokale_ephemeriden = lokale_ephemeriden
+        self.datum = self.zufallsdatum()
+        self.zoom_level = -10
+        self.selected_planet = None
+        self.layouts = {}
+        self.ephemeriden_mitte = None
+        self._entprellt = None
+        self._laufend = set()
+
+    def zufallsdatum(self):
+        return datetime(1900, 1, 1) + timedelta(seconds=self.rng.randrange(200 * 365 * 86400))
+
+    # --- Anfragen wie in script.js ---
+
+    async def hole_layout(self):
+        if ebene(self.zoom_level) == 'sonnensystem' and self.zoom_level not in self.layouts:
+            await self.http.anfrage('GET', '/api/layout', {'zoom_level': self.zoom_level})
+            self.layouts[self.zoom_level] = True
+
+    async def update_planet_data(self):
+        await self.http.anfrage('POST', '/api/planet_data', json_body={
+            'datum': format_datum(self.datum), 'zoom_level': self.zoom_level,
+            'relativ': True, 'selected_planet': self.selected_planet
+        }, accept=KOMPAKT_FORMAT)
+        # fromKompakt holt die Tierkreiszeichen aus dem Layout
+        await self.hole_layout()
+
+    async def update_planet_positions(self):
+        if ebene(self.zoom_level) != 'sonnensystem':
+            return await self.update_planet_data()
+        await asyncio.gather(
+            self.hole_layout(),
+            self.http.anfrage('GET', '/api/planet_positions', {'datum': format_datum(self.datum)})
+        )
+
+    def schedule_update(self):
+        """Entprellt wie scheduleUpdate: erst UPDATE_DELAY nach dem letzten Aufruf;
+        wie clearTimeout bricht ein neuer Aufruf nur den Timer ab, keine laufende Anfrage"""
+        if self._entprellt is not None:
+            self._entprellt.cancel()
+        self._entprellt = asyncio.get_running_loop().call_later(UPDATE_DELAY, self._update_starten)
+
+    def _update_starten(self):
+        self._entprellt = None
+        aufgabe = asyncio.ensure_future(ohne_fehler(self.update_planet_data()))
+        self._laufend.add(aufgabe)
+        aufgabe.add_done_callback(self._laufend.discard)
+
+    async def entprellung_abwarten(self):
+        if self._entprellt is not None:
+            await asyncio.sleep(UPDATE_DELAY)
+        if self._laufend:
+            await asyncio.gather(*self._laufend)
+
+    # --- Szenarien ---
+
+    async def ziehen(self, ende):
+        """Verschieben zeichnet lokal (Antworten sind relativ); Auswahl,
+        Zentrieren und Zoom-Presets am Gestenende rufen scheduleUpdate"""
+        self.zoom_level = self.rng.choice([-10, -5, 0, 3, 5, 10, -12, -15, -22, -25])
+        await self.update_planet_data()
+        while time.monotonic() < ende:
+            # Geste: Mausbewegungen im 16-ms-Takt
+            await asyncio.sleep(self.rng.randint(10, 60) * 0.016)
+            aktion = self.rng.random()
+            if aktion < 0.4:
+                # Himmelskörper antippen und zentrieren (30-ms-Animation)
+                self.selected_planet = self.rng.choice(PLANETEN + [None])
+                self.schedule_update()
+                await asyncio.sleep(self.rng.randint(5, 20) * 0.03)
+                self.schedule_update()
+            elif aktion < 0.6:
+                # Preset oder Zentrier-Button mehrfach schnell geklickt
+                for _ in range(self.rng.randint(1, 4)):
+                    self.zoom_level = self.rng.choice([-10, 0, 3, 20])
+                    self.schedule_update()
+                    await asyncio.sleep(self.rng.uniform(0.03, 0.15))
+            await asyncio.sleep(self.rng.uniform(0.2, 1.5))
+        await self.entprellung_abwarten()
+
+    async def wiedergabe(self, ende):
+        """togglePlayback: Frames aus lokalen Ephemeriden (Sonnensystem) oder
+        gepuffert von /api/planet_timeline, ein Frame pro Intervall"""
+        modus = self.rng.choice(['day', 'month', 'year'])
+        richtung = self.rng.choice([1, -1])
+        intervall = PLAYBACK_SPEEDS[modus]
+        self.zoom_level = self.rng.choice([-10, -10, -5, 0, 5, -15, -25])
+        sonnensystem = ebene(self.zoom_level) == 'sonnensystem'
+        frames_pro_block = max(2, math.ceil(TIMELINE_BUFFER_S / intervall))
+
+        await self.hole_layout()
+        puffer = 0
+        laden = None
+        naechster_tick = time.monotonic()
+        while time.monotonic() < ende:
+            if sonnensystem and self.lokale_ephemeriden:
+                # Koeffizienten für 20 Jahre um das nächste volle Jahrzehnt
+                mitte = round(self.datum.year / LOKALE_EPHEMERIDEN_JAHRE) * LOKALE_EPHEMERIDEN_JAHRE
+                if mitte != self.ephemeriden_mitte:
+                    self.ephemeriden_mitte = mitte
+                    await self.http.anfrage('GET', '/api/ephemeriden', {
+                        'start': f"{mitte - LOKALE_EPHEMERIDEN_JAHRE:04d}/01/01 00:00:00",
+                        'ende': f"{mitte + LOKALE_EPHEMERIDEN_JAHRE:04d}/01/01 00:00:00"
+                    }, accept='*/*')
+                self.datum = verschiebe_datum(self.datum, modus, richtung)
+            else:
+                if puffer < frames_pro_block / 2 and (laden is None or laden.done()):
+                    laden = asyncio.ensure_future(ohne_fehler(self.http.anfrage('POST', '/api/planet_timeline', json_body={
+                        'datum': format_datum(self.datum), 'schritt': modus, 'richtung': richtung,
+                        'anzahl_frames': frames_pro_block, 'zoom_level': self.zoom_level, 'relativ': True,
+                        'selected_planet': self.selected_planet, 'nur_laengen': sonnensystem
+                    })))
+                    if puffer == 0:
+                        # Ohne Frames wartet die Wiedergabe auf die Antwort
+                        await laden
+                    puffer += frames_pro_block
+                if puffer > 0:
+                    puffer -= 1
+                    self.datum = verschiebe_datum(self.datum, modus, richtung)
+            naechster_tick += intervall
+            await asyncio.sleep(max(0.0, naechster_tick - time.monotonic()))
+        if laden is not None:
+            await laden
+
+    async def echtzeit(self, ende):
+        """Echtzeit-Polling (Fallback ohne EventSource): jede Sekunde aktuelle Zeit"""
+        self.zoom_level = self.rng.choice([-10, -10, 0, 10, -15, -25])
+        naechster_tick = time.monotonic()
+        while time.monotonic() < ende:
+            self.datum = datetime.now().replace(microsecond=0)
+            try:
+                await self.update_planet_positions()
+            except HttpFehler:
+                pass
+            naechster_tick += PLAYBACK_SPEEDS['realtime']
+            await asyncio.sleep(max(0.0, naechster_tick - time.monotonic()))
+
+    async def zoom(self, ende):
+        """Zoom-Durchlauf über alle Ebenen mit +/- Klicks (changeZoom → scheduleUpdate)"""
+        schritt = self.rng.choice([1, -1])
+        while time.monotonic() < ende:
+            neu = self.zoom_level + schritt
+            if not ZOOM_MIN <= neu <= ZOOM_MAX:
+                schritt = -schritt
+                continue
+            self.zoom_level = neu
+            self.schedule_update()
+            # Schnelle Klickfolgen werden zusammengefasst, Pausen nicht
+            await asyncio.sleep(self.rng.choice([0.05, 0.08, 0.2, 0.4]))
+        await self.entprellung_abwarten()
+
+    async def laufen(self, ende, gewichte, statistik):
+        namen = list(gewichte)
+        while time.monotonic() < ende:
+            szenario = self.rng.choices(namen, weights=[gewichte[n] for n in namen])[0]
+            statistik.szenarien[szenario] += 1
+            if szenario != 'echtzeit':
+                self.datum = self.zufallsdatum()
+            episode_ende = min(ende, time.monotonic() + self.rng.uniform(*EPISODE_S))
+            try:
+                await getattr(self, szenario)(episode_ende)
+            except HttpFehler:
+                # Fehler sind erfasst; wie der Browser nach kurzer Pause weiter
+                await asyncio.sleep(0.5)
+
+
+def lese_mix(text):
+    gewichte = {}
+    for teil in filter(None, text.split(',')):
+        name, _, gewicht = teil.partition('=')
+        if name not in SZENARIEN:
+            raise argparse.ArgumentTypeError(f"Unbekanntes Szenario {name!r} (erlaubt: {', '.join(SZENARIEN)})")
+        gewichte[name] = float(gewicht or 1)
+    if not any(gewichte.values()):
+        raise argparse.ArgumentTypeError('Mindestens ein Szenario braucht ein Gewicht > 0')
+    return gewichte
+
+
+async def warte_auf_server(basis_url, timeout):
+    """Pollt /api/bereit, bis der Server fertig aufgewärmt ist (200)"""
+    statistik = Statistik()
+    http = HttpClient(basis_url, statistik, 5.0)
+    ende = time.monotonic() + timeout
+    try:
+        while time.monotonic() < ende:
+            try:
+                await http.anfrage('GET', '/api/bereit')
+                return True
+            except HttpFehler:
+                await asyncio.sleep(0.5)
+        return False
+    finally:
+        http.schliessen()
+
+
+async def lasttest(args, gewichte):
+    statistik = Statistik()
+    rng = random.Random(args.seed)
+    clients = []
+    for nummer in range(args.clients):
+        http = HttpClient(args.url, statistik, args.timeout)
+        clients.append(VirtuellerClient(nummer, http, random.Random(rng.random()), not args.nur_server))
+
+    start = time.monotonic()
+    ende = start + args.dauer
+    aufgaben = []
+    for client in clients:
+        # Clients über die Anlaufzeit verteilt starten
+        await asyncio.sleep(args.anlauf / max(1, args.clients))
+        aufgaben.append(asyncio.ensure_future(client.laufen(ende, gewichte, statistik)))
+    await asyncio.gather(*aufgaben)
+    laufzeit = time.monotonic() - start
+    for client in clients:
+        client.http.schliessen()
+    return statistik, laufzeit
+
+
+def vergleichen(ergebnisse, baseline, toleranz):
+    """Endpunkte, deren p50/p99 um mehr als `toleranz` langsamer oder deren
+    Fehlerquote höher ist als in der Baseline"""
+    regressionen = []
+    print(f"\n{'Endpunkt':<32} {'p50 alt':>9} {'p50 neu':>9} {'p99 alt':>9} {'p99 neu':>9} {'Anfr./s':>15} {'Fehler':>13}")
+    for name, aktuell in ergebnisse.items():
+        alt = baseline.get('endpunkte', {}).get(name)
+        if alt is None:
+            continue
+        langsamer = any(
+            aktuell[feld] > alt[feld] * (1 + toleranz) for feld in ('p50_ms', 'p99_ms') if alt[feld]
+        )
+        fehlerhafter = aktuell['fehlerquote'] > alt['fehlerquote'] + 0.001
+        markierung = '  REGRESSION' if langsamer or fehlerhafter else ''
+        print(f"{name:<32} {alt['p50_ms']:>7.1f}ms {aktuell['p50_ms']:>7.1f}ms {alt['p99_ms']:>7.1f}ms "
+              f"{aktuell['p99_ms']:>7.1f}ms {alt['durchsatz_pro_s']:>7.1f}→{aktuell['durchsatz_pro_s']:<7.1f}"
+              f"{alt['fehlerquote']:>6.1%}→{aktuell['fehlerquote']:<6.1%}{markierung}")
+        if markierung:
+            regressionen.append(name)
+    return regressionen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lasttest der Planetenuhr mit virtuellen Clients')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Basis-URL der laufenden Instanz')
+    parser.add_argument('--clients', type=int, default=20, help='Anzahl gleichzeitiger virtueller Clients')
+    parser.add_argument('--dauer', type=float, default=30.0, help='Laufzeit in Sekunden')
+    parser.add_argument('--anlauf', type=float, default=2.0, help='Zeit in Sekunden, über die die Clients starten')
+    parser.add_argument('--mix', type=lese_mix, default=lese_mix(STANDARD_MIX),
+                        help=f"Gewichte der Szenarien (Standard: {STANDARD_MIX})")
+    parser.add_argument('--nur-server', action='store_true',
+                        help='Wiedergabe ohne lokale Ephemeriden (nur /api/planet_timeline)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Timeout pro Anfrage in Sekunden')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--starten', help='Server vorher mit diesem Befehl starten und auf /api/bereit warten')
+    parser.add_argument('--ausgabe', help='Ergebnisse als JSON in diese Datei schreiben')
+    parser.add_argument('--vergleich', help='Ergebnis-JSON eines früheren Laufs zum Vergleich')
+    parser.add_argument('--toleranz', type=float, default=0.2, help='Erlaubte Verlangsamung von p50/p99 (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.starten:
+        server = subprocess.Popen(shlex.split(args.starten))
+    try:
+        if not asyncio.run(warte_auf_server(args.url, 300.0 if server else 10.0)):
+            print(f"Server unter {args.url} nicht bereit (/api/bereit)", file=sys.stderr)
+            return 2
+        statistik, laufzeit = asyncio.run(lasttest(args, args.mix))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    ergebnisse, gesamt = statistik.bericht(laufzeit)
+    print(f"{'Endpunkt':<32} {'Anfragen':>9} {'Anfr./s':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'Fehler':>7} {'KB/Anfr.':>9}")
+    for name, werte in list(ergebnisse.items()) + [('gesamt', gesamt)]:
+        print(f"{name:<32} {werte['anfragen']:>9} {werte['durchsatz_pro_s']:>9.1f} {werte['p50_ms']:>7.1f}ms "
+              f"{werte['p90_ms']:>7.1f}ms {werte['p99_ms']:>7.1f}ms {werte['max_ms']:>7.1f}ms "
+              f"{werte['fehlerquote']:>7.1%} {werte['bytes_pro_anfrage'] / 1024:>9.2f}")
+    print(f"Szenarien: {', '.join(f'{name} {anzahl}' for name, anzahl in statistik.szenarien.items())}")
+
+    bericht = {
+        'meta': {
+            'zeit': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plattform': platform.platform(),
+            'url': args.url,
+            'clients': args.clients,
+            'dauer_s': args.dauer,
+            'laufzeit_s': laufzeit,
+            'mix': args.mix,
+            'nur_server': args.nur_server,
+            'seed': args.seed,
+            'szenarien': statistik.szenarien
+        },
+        'endpunkte': ergebnisse,
+        'gesamt': gesamt
+    }
+
+    if args.ausgabe:
+        with open(args.ausgabe, 'w', encoding='utf-8') as datei:
+            json.dump(bericht, datei, indent=2, ensure_ascii=False)
+
+    if args.vergleich:
+        with open(args.vergleich, encoding='utf-8') as datei:
+            baseline = json.load(datei)
+        regressionen = vergleichen(ergebnisse, baseline, args.toleranz)
+        if regressionen:
+            print(f"\n{len(regressionen)} Regression(en) über {args.toleranz:.0%} Toleranz")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
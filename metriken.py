@@ -0,0 +1,173 @@
+import bisect
+import contextvars
+import sys
+import threading
+import time
+from collections import Counter
+
+# --- METRIKEN UND PROFILER ---
+# Stufenzeiten einer Anfrage (Datum, Ephemeriden, Geometrie, ...) sammelt
+# eine Messung; am Ende landen sie in Histogrammen je Stufe und Ebene, die
+# /metrics im Prometheus-Textformat ausgibt. Außerhalb einer Messung kostet
+# `stufe()` nur einen ContextVar-Zugriff.
+
+# Bucket-Grenzen in Sekunden (50 µs bis 2,5 s)
+GRENZEN = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_messung = contextvars.ContextVar('messung', default=None)
+
+
+class Histogramme:
+    """Prometheus-Histogramme mit festen Grenzen, ein Satz Buckets pro Label-Kombination"""
+
+    def __init__(self, name, hilfe, label_namen, grenzen=GRENZEN):
+        self.name = name
+        self.hilfe = hilfe
+        self.label_namen = label_namen
+        self.grenzen = grenzen
+        self._werte = {}
+        self._lock = threading.Lock()
+
+    def beobachte(self, labels, sekunden):
+        i = bisect.bisect_left(self.grenzen, sekunden)
+        with self._lock:
+            werte = self._werte.get(labels)
+            if werte is None:
+                # Buckets (nicht kumuliert), +Inf, Summe
+                werte = self._werte[labels] = [0] * (len(self.grenzen) + 1) + [0.0]
+            werte[i] += 1
+            werte[-1] += sekunden
+
+    def prometheus(self):
+        zeilen = [f"# HELP {self.name} {self.hilfe}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            eintraege = sorted((labels, list(werte)) for labels, werte in self._werte.items())
+        for labels, werte in eintraege:
+            basis = ','.join(f'{name}="{wert}"' for name, wert in zip(self.label_namen, labels))
+            kumuliert = 0
+            for grenze, anzahl in zip(self.grenzen + ('+Inf',), werte):
+                kumuliert += anzahl
+                zeilen.append(f'{self.name}_bucket{{{basis},le="{grenze}"}} {kumuliert}')
+            zeilen.append(f"{self.name}_sum{{{basis}}} {werte[-1]:.9f}")
+            zeilen.append(f"{self.name}_count{{{basis}}} {kumuliert}")
+        return zeilen
+
+
+class Messung:
+    """Stufenzeiten einer Anfrage; als Kontextmanager aktiv, beim Verlassen
+    kommen alle Stufen plus 'gesamt' in `histogramme` (Labels stufe, ebene)"""
+
+    def __init__(self, histogramme):
+        self.histogramme = histogramme
+        self.ebene = 'unbekannt'
+        self.stufen = {}
+        self._beginn = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _messung.set(self)
+        self._beginn = time.perf_counter()
+        return self
+
+    def __exit__(self, *fehler):
+        self.stufen['gesamt'] = time.perf_counter() - self._beginn
+        _messung.reset(self._token)
+        for name, dauer in self.stufen.items():
+            self.histogramme.beobachte((name, self.ebene), dauer)
+
+    def server_timing(self):
+        """Wert für den Server-Timing-Header (Millisekunden)"""
+        return ', '.join(f"{name};dur={dauer * 1000:.3f}" for name, dauer in self.stufen.items())
+
+
+class _Stufe:
+    __slots__ = ('name', 'messung', 'beginn')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.messung = _messung.get()
+        if self.messung is not None:
+            self.beginn = time.perf_counter()
+
+    def __exit__(self, *fehler):
+        messung = self.messung
+        if messung is not None:
+            # Mehrfach durchlaufene Stufen werden addiert
+            messung.stufen[self.name] = messung.stufen.get(self.name, 0.0) + time.perf_counter() - self.beginn
+
+
+def stufe(name):
+    """Zeitmessung eines Abschnitts: `with stufe('ephemeriden'): ...`"""
+    return _Stufe(name)
+
+
+def setze_ebene(ebene):
+    messung = _messung.get()
+    if messung is not None:
+        messung.ebene = ebene
+
+
+class StichprobenProfiler:
+    """Sampling-Profiler zur Laufzeit: ein Thread liest alle `intervall`
+    Sekunden die Stacks aller anderen Threads (sys._current_frames) und
+    zählt sie im gefalteten Format (Flamegraph-Werkzeuge)."""
+
+    MAX_STACKS = 20000
+
+    def __init__(self):
+        self._zaehler = Counter()
+        self._thread = None
+        self._stopp = threading.Event()
+        self._lock = threading.Lock()
+        self.intervall = None
+        self.proben = 0
+
+    @property
+    def aktiv(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def starten(self, intervall=0.01, dauer=30.0):
+        with self._lock:
+            if self.aktiv:
+                return False
+            self._zaehler = Counter()
+            self.proben = 0
+            self.intervall = intervall
+            self._stopp.clear()
+            self._thread = threading.Thread(target=self._laufen, args=(intervall, dauer), name='profiler', daemon=True)
+            self._thread.start()
+            return True
+
+    def stoppen(self):
+        self._stopp.set()
+
+    def status(self):
+        return {'aktiv': self.aktiv, 'proben': self.proben, 'stacks': len(self._zaehler), 'intervall_s': self.intervall}
+
+    def gefaltet(self):
+        """'modul:funktion;modul:funktion anzahl' je Zeile, häufigste zuerst"""
+        with self._lock:
+            zaehler = Counter(self._zaehler)
+        return ''.join(f"{stack} {anzahl}\n" for stack, anzahl in zaehler.most_common())
+
+    def _laufen(self, intervall, dauer):
+        eigener = threading.get_ident()
+        ende = time.monotonic() + dauer
+        while not self._stopp.wait(intervall) and time.monotonic() < ende:
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == eigener:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                stacks.append(';'.join(reversed(stack)))
+            with self._lock:
+                for schluessel in stacks:
+                    # Speicher begrenzen: neue Stacks nur bis MAX_STACKS
+                    if schluessel in self._zaehler or len(self._zaehler) < self.MAX_STACKS:
+                        self._zaehler[schluessel] += 1
+                self.proben += 1
@@ -0,0 +1,155 @@
+import math
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional, ohne läuft die reine Python-Projektion
+    np = None
+
+# --- PROJEKTIONS-ENGINES ---
+# Die Rechner aller Ebenen geben ihre Objekte als Spalten (Radien/Winkel bzw.
+# Positionen in Lichtjahren) hierher und bekommen Bildschirmkoordinaten als
+# Listen zurück. PythonProjektion ist die Referenz; NumpyProjektion rechnet
+# dasselbe als Array-Operationen und liefert bis auf Rundung gleiche Werte.
+# Für große Sternkataloge laufen hier auch Auswahl, Zählen, Radien und
+# Sichtbarkeit; die Zeilen baut der Aufrufer aus den fertigen Spalten. Die
+# übrigen Ebenen haben wenige Objekte (Sonnensystem, eingebaute Listen, die
+# Galaxien einer Antwort), dort bleiben Radien und Flags in Python.
+
+# Unterhalb dieser Objektanzahl ist die Python-Schleife schneller als der
+# Umweg über Arrays (Sonnensystem, eingebaute Sterne und Galaxien)
+NUMPY_AB_ANZAHL = 256
+
+
+class PythonProjektion:
+    name = 'python'
+
+    def polar(self, mitte_x, mitte_y, radien, winkel, y_richtung=1):
+        """Polarkoordinaten (Radius in Pixeln, Winkel in Radiant) → Bildschirm.
+        y_richtung=-1 für mathematisch positive Drehrichtung (y wächst nach unten)."""
+        xs = [mitte_x + radius * math.cos(w) for radius, w in zip(radien, winkel)]
+        ys = [mitte_y + y_richtung * radius * math.sin(w) for radius, w in zip(radien, winkel)]
+        return xs, ys
+
+    def skalieren(self, mitte_x, mitte_y, skala, xs, ys):
+        """Positionen um die Mitte skalieren und verschieben"""
+        return [mitte_x + skala * x for x in xs], [mitte_y + skala * y for y in ys]
+
+    def katalog_auswahl(self, index, max_entfernung, rechteck, limit):
+        """Indizes der hellsten Katalogsterne im Kreis und Rechteck (siehe SternIndex.abfrage)"""
+        return index.abfrage(max_entfernung, rechteck, limit)
+
+    def katalog_zaehlen(self, index, max_entfernung, rechteck):
+        """Anzahl Katalogsterne im Kreis und Rechteck (siehe SternIndex.zaehlen)"""
+        return index.zaehlen(max_entfernung, rechteck)
+
+    def katalog_sichtbar(self, index, treffer, mitte_x, mitte_y, skala, klasse, fenster=None, gewaehlt=None):
+        """Projiziert Katalogsterne (Indizes `treffer`) und lässt die weg, die mit
+        ihrem Radius der Größenklasse das Fenster nicht erreichen; der Stern
+        `gewaehlt` bleibt immer. Liefert (Indizes, xs, ys, Radien) als Listen."""
+        xs, ys = self.skalieren(mitte_x, mitte_y, skala, [index.x[i] for i in treffer], [index.y[i] for i in treffer])
+        radien = index.radien[klasse]
+        ergebnis = ([], [], [], [])
+        for i, x, y in zip(treffer, xs, ys):
+            radius = radien[i]
+            if fenster is not None and i != gewaehlt and not (
+                x + radius >= fenster[0] and x - radius <= fenster[2]
+                and y + radius >= fenster[1] and y - radius <= fenster[3]
+            ):
+                continue
+            for spalte, wert in zip(ergebnis, (i, x, y, radius)):
+                spalte.append(wert)
+        return ergebnis
+
+
+class NumpyProjektion(PythonProjektion):
+    name = 'numpy'
+
+    def __init__(self):
+        # Je Sternindex die Spalten als float64 samt Abstandsquadrat und Radien, einmal umgewandelt
+        self._katalog_spalten = weakref.WeakKeyDictionary()
+
+    def polar(self, mitte_x, mitte_y, radien, winkel, y_richtung=1):
+        if len(radien) < NUMPY_AB_ANZAHL:
+            return super().polar(mitte_x, mitte_y, radien, winkel, y_richtung)
+        radien = np.asarray(radien, dtype=np.float64)
+        winkel = np.asarray(winkel, dtype=np.float64)
+        xs = mitte_x + radien * np.cos(winkel)
+        ys = mitte_y + y_richtung * radien * np.sin(winkel)
+        return xs.tolist(), ys.tolist()
+
+    def skalieren(self, mitte_x, mitte_y, skala, xs, ys):
+        if len(xs) < NUMPY_AB_ANZAHL:
+            return super().skalieren(mitte_x, mitte_y, skala, xs, ys)
+        xs = mitte_x + skala * np.asarray(xs, dtype=np.float64)
+        ys = mitte_y + skala * np.asarray(ys, dtype=np.float64)
+        return xs.tolist(), ys.tolist()
+
+    def katalog_auswahl(self, index, max_entfernung, rechteck, limit):
+        """Vektor-Scan über alle Sterne statt Baumsuche: ein paar Vergleiche je
+        Stern als Array-Operation sind schneller als die Python-Schleife der
+        Baumsuche, gleiche Reihenfolge"""
+        if index.anzahl == 0 or limit <= 0:
+            return []
+        kandidaten = np.flatnonzero(self._katalog_maske(index, max_entfernung, rechteck))
+        mag = self._spalten(index)[3][kandidaten]
+        if len(kandidaten) > limit:
+            # Erst grob auf die hellsten `limit` (samt Gleichstand) kürzen, dann stabil sortieren
+            grenze = np.partition(mag, limit - 1)[limit - 1]
+            behalten = mag <= grenze
+            kandidaten, mag = kandidaten[behalten], mag[behalten]
+        reihenfolge = np.argsort(mag, kind='stable')[:limit]
+        return kandidaten[reihenfolge].tolist()
+
+    def katalog_zaehlen(self, index, max_entfernung, rechteck):
+        if index.anzahl == 0:
+            return 0
+        return int(np.count_nonzero(self._katalog_maske(index, max_entfernung, rechteck)))
+
+    def katalog_sichtbar(self, index, treffer, mitte_x, mitte_y, skala, klasse, fenster=None, gewaehlt=None):
+        if len(treffer) < NUMPY_AB_ANZAHL:
+            return super().katalog_sichtbar(index, treffer, mitte_x, mitte_y, skala, klasse, fenster, gewaehlt)
+        x, y, _, _, radien = self._spalten(index)
+        treffer = np.asarray(treffer, dtype=np.intp)
+        xs = mitte_x + skala * x[treffer]
+        ys = mitte_y + skala * y[treffer]
+        radien = radien[klasse][treffer]
+        if fenster is not None:
+            x0, y0, x1, y1 = fenster
+            sichtbar = (xs + radien >= x0) & (xs - radien <= x1) & (ys + radien >= y0) & (ys - radien <= y1)
+            if gewaehlt is not None:
+                sichtbar |= treffer == gewaehlt
+            treffer, xs, ys, radien = treffer[sichtbar], xs[sichtbar], ys[sichtbar], radien[sichtbar]
+        return treffer.tolist(), xs.tolist(), ys.tolist(), radien.tolist()
+
+    def _spalten(self, index):
+        """(x, y, Abstandsquadrat, Magnitude, Radien je Größenklasse) als Arrays"""
+        spalten = self._katalog_spalten.get(index)
+        if spalten is None:
+            # float64 wie in der Baumsuche, sonst entscheiden Grenzfälle anders
+            x = np.frombuffer(index.x, dtype=np.float32).astype(np.float64)
+            y = np.frombuffer(index.y, dtype=np.float32).astype(np.float64)
+            radien = tuple(np.frombuffer(spalte, dtype=np.float64) for spalte in index.radien)
+            spalten = (x, y, x * x + y * y, np.frombuffer(index.mag, dtype=np.float32), radien)
+            self._katalog_spalten[index] = spalten
+        return spalten
+
+    def _katalog_maske(self, index, max_entfernung, rechteck):
+        x, y, abstand2, _, _ = self._spalten(index)
+
+        maske = abstand2 <= max_entfernung * max_entfernung
+        if rechteck:
+            x0, y0, x1, y1 = rechteck
+            maske &= (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        return maske
+
+
+def waehle_projektion(art='auto'):
+    """'auto' nimmt NumPy, wenn installiert; 'numpy' ohne NumPy ist ein Konfigurationsfehler"""
+    if art == 'python' or (art == 'auto' and np is None):
+        return PythonProjektion()
+    if art in ('auto', 'numpy'):
+        if np is None:
+            raise ValueError("PROJEKTION='numpy', aber NumPy ist nicht installiert")
+        return NumpyProjektion()
+    raise ValueError(f"Unbekannte Projektion: {art} (erlaubt: auto, numpy, python)")
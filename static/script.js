@@ -18,6 +18,7 @@ let clickStartTime = 0;
 let clickStartX = 0;
 let clickStartY = 0;
 let currentPlanetData = null;
+let relativePlanetData = null;
 
 // Geschwindigkeiten für die Play-Buttons
 const PLAYBACK_SPEEDS = {
@@ -82,12 +83,12 @@ async function updatePlanetData() {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': KOMPAKT_FORMAT,
             },
             body: JSON.stringify({
                 datum: datumInput,
                 zoom_level: zoom_level,
-                offset_x: offset_x,
-                offset_y: offset_y,
+                relativ: true,
                 selected_planet: selectedPlanet
             })
         });
@@ -104,26 +105,7 @@ async function updatePlanetData() {
             return;
         }
 
-        // Speichere die aktuellen Daten für die Auswahl
-        currentPlanetData = data;
-
-        drawPlanetenuhr(data);
-
-        // VERBESSERTE FEHLERBEHANDLUNG FÜR STATUS
-        if (data.status) {
-            updateStatus(data.status);
-            updatePlanetInfo(data.selected_planet_info, data.status.selected_planet, data);
-        } else {
-            // Fallback für fehlenden Status
-            updateStatus({
-                zoom_level: zoom_level,
-                modus_anzeige: "UNBEKANNT",
-                datum_uhrzeit_str: datumInput,
-                sonnen_radius_info: "N/A",
-                selected_planet: selectedPlanet
-            });
-            updatePlanetInfo(data.selected_planet_info, selectedPlanet, data);
-        }
+        applyPlanetData(await fromKompakt(data), datumInput);
 
     } catch (error) {
         console.error('Update error:', error);
@@ -140,6 +122,177 @@ async function updatePlanetData() {
     }
 }
 
+// Spaltenformat (siehe drahtformat.py): Objektlisten als Spalten, boolesche
+// Felder als Indexlisten, Tierkreiszeichen kommen aus dem gecachten Layout
+const KOMPAKT_FORMAT = 'application/vnd.planetenuhr.kompakt+json';
+
+async function fromKompakt(data) {
+    if (data.format === undefined) {
+        return data;  // Server hat normales JSON geliefert
+    }
+
+    const result = Object.assign({}, data);
+    delete result.format;
+    ['planeten', 'sterne', 'galaxien', 'umlaufbahnen'].forEach(key => {
+        const liste = data[key];
+        if (!liste) return;
+
+        const objekte = [];
+        for (let i = 0; i < liste.anzahl; i++) {
+            const objekt = {};
+            Object.entries(liste.spalten).forEach(([feld, werte]) => { objekt[feld] = werte[i]; });
+            Object.keys(liste.markiert).forEach(feld => { objekt[feld] = false; });
+            objekte.push(objekt);
+        }
+        Object.entries(liste.markiert).forEach(([feld, indizes]) => {
+            indizes.forEach(i => { objekte[i][feld] = true; });
+        });
+        result[key] = objekte;
+    });
+
+    if (data.zodiak && !data.zodiak.zeichen) {
+        const layout = await getLayout(data.status.zoom_level);
+        result.zodiak = Object.assign({}, data.zodiak, { zeichen: layout.zodiak.zeichen });
+    }
+    return result;
+}
+
+// Server-Antworten sind relativ zum Zentrum (relativ: true); die Verschiebung
+// wird nur im Client angewendet, Verschieben braucht daher keinen Server-Request.
+function toScreenData(data) {
+    const dx = ZENTRUM + offset_x;
+    const dy = ZENTRUM + offset_y;
+    const shift = obj => Object.assign({}, obj, { x: obj.x + dx, y: obj.y + dy });
+
+    const screen = Object.assign({}, data);
+    ['sonne', 'milchstrasse'].forEach(key => {
+        if (data[key]) screen[key] = shift(data[key]);
+    });
+    ['planeten', 'sterne', 'galaxien'].forEach(key => {
+        if (data[key]) screen[key] = data[key].map(shift);
+    });
+    return screen;
+}
+
+function redrawWithOffset() {
+    if (relativePlanetData) {
+        currentPlanetData = toScreenData(relativePlanetData);
+        drawPlanetenuhr(currentPlanetData);
+    }
+}
+
+// Zeichnet eine (relative) Server-Antwort und aktualisiert Status und Info-Panel
+function applyPlanetData(data, datumInput) {
+    // Speichere die aktuellen Daten für die Auswahl
+    relativePlanetData = data;
+    currentPlanetData = toScreenData(data);
+
+    drawPlanetenuhr(currentPlanetData);
+
+    // VERBESSERTE FEHLERBEHANDLUNG FÜR STATUS
+    if (data.status) {
+        updateStatus(data.status);
+        updatePlanetInfo(data.selected_planet_info, data.status.selected_planet, data);
+    } else {
+        // Fallback für fehlenden Status
+        updateStatus({
+            zoom_level: zoom_level,
+            modus_anzeige: "UNBEKANNT",
+            datum_uhrzeit_str: datumInput,
+            sonnen_radius_info: "N/A",
+            selected_planet: selectedPlanet
+        });
+        updatePlanetInfo(data.selected_planet_info, selectedPlanet, data);
+    }
+}
+
+// --- GETEILTE ANTWORT: LAYOUT (pro Zoomstufe gecacht) + LÄNGEN (pro Zeitpunkt) ---
+const layoutCache = new Map();
+
+async function getLayout(level) {
+    if (layoutCache.has(level)) {
+        return layoutCache.get(level);
+    }
+
+    const response = await fetch(`/api/layout?zoom_level=${encodeURIComponent(level)}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const layout = await response.json();
+    layoutCache.set(level, layout);
+    return layout;
+}
+
+// Baut aus Layout und heliozentrischen Längen dieselbe (relative) Struktur wie /api/planet_data
+function combineLayout(layout, laengen, datum) {
+    const centerX = 0;
+    const centerY = 0;
+
+    const planeten = [];
+    layout.umlaufbahnen.forEach(bahn => {
+        const geometrie = layout.planeten[bahn.name];
+        const angle = laengen[bahn.name];
+        if (!geometrie || angle === undefined) return;
+
+        planeten.push({
+            name: bahn.name,
+            x: centerX + geometrie.orbit_radius * Math.cos(angle),
+            y: centerY - geometrie.orbit_radius * Math.sin(angle),
+            point_radius: geometrie.point_radius,
+            farbe: geometrie.farbe,
+            orbit_radius: geometrie.orbit_radius,
+            helio_lon_rad: angle,
+            selected: bahn.name === selectedPlanet
+        });
+    });
+
+    return {
+        ebene: layout.ebene,
+        sonne: {
+            radius: layout.sonne.radius,
+            x: centerX,
+            y: centerY,
+            farbe: layout.sonne.farbe,
+            selected: selectedPlanet === 'Sonne'
+        },
+        planeten: planeten,
+        umlaufbahnen: layout.umlaufbahnen,
+        zodiak: layout.zodiak,
+        selected_planet_info: selectedPlanet ? (layout.planeten_info[selectedPlanet] || null) : null,
+        status: Object.assign({}, layout.status, {
+            datum_uhrzeit_str: datum,
+            selected_planet: selectedPlanet
+        })
+    };
+}
+
+// Leichtgewichtiges Update für Echtzeit: nur Längen laden, Layout kommt aus dem Cache
+async function updatePlanetPositions() {
+    if (getCurrentLevelRange(zoom_level) !== 'sonnensystem') {
+        return updatePlanetData();
+    }
+
+    const datumInput = document.getElementById('datumInput').value;
+
+    try {
+        const [layout, response] = await Promise.all([
+            getLayout(zoom_level),
+            fetch(`/api/planet_positions?datum=${encodeURIComponent(datumInput)}`)
+        ]);
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const positions = await response.json();
+        applyPlanetData(combineLayout(layout, positions.laengen, datumInput), datumInput);
+    } catch (error) {
+        console.error('Position update error:', error);
+        updatePlanetData();
+    }
+}
+
 // Optimierte Zoom-Funktionen mit Ebenen-Unterstützung
 function changeZoom(amount) {
     const new_level = zoom_level + amount;
@@ -667,14 +820,14 @@ function drawGalaxien(data, ctx) {
     data.galaxien.forEach(galaxy => {
         ctx.beginPath();
         ctx.arc(galaxy.x, galaxy.y, galaxy.radius, 0, 2 * Math.PI);
-        ctx.fillStyle = 'rgba(200, 200, 255, 0.7)';
+        ctx.fillStyle = galaxy.farbe || 'rgba(200, 200, 255, 0.7)';
         ctx.fill();
         ctx.strokeStyle = galaxy.selected ? 'cyan' : 'lightblue';
         ctx.lineWidth = galaxy.selected ? 3 : 1;
         ctx.stroke();
 
-        // Galaxienname
-        if (zoom_level >= -25) {
+        // Galaxienname (nur die auffälligsten, siehe beschriftung)
+        if ((zoom_level >= -25 && galaxy.beschriftung !== false) || galaxy.selected) {
             ctx.fillStyle = 'white';
             ctx.font = '9px Arial';
             ctx.fillText(galaxy.name, galaxy.x + galaxy.radius + 5, galaxy.y);
@@ -713,9 +866,7 @@ function startAutoCenter() {
             scheduleUpdate();
         } else {
             // Zeichne direkt ohne Server-Request für flüssige Animation
-            if (currentPlanetData) {
-                drawPlanetenuhr(currentPlanetData);
-            }
+            redrawWithOffset();
             setTimeout(centerStep, 30);
         }
     }
@@ -749,22 +900,20 @@ function setupMouseDrag() {
         lastMouseY = e.clientY;
 
         // Zeichne direkt ohne Server-Request während Drag
-        if (currentPlanetData) {
-            drawPlanetenuhr(currentPlanetData);
-        }
+        redrawWithOffset();
     });
 
     canvas.addEventListener('mouseup', () => {
         isDragging = false;
         canvas.style.cursor = 'pointer';
-        scheduleUpdate(); // Nur ein Update am Ende
+        redrawWithOffset(); // Kein Server-Request: Daten sind verschiebungsunabhängig
     });
 
     canvas.addEventListener('mouseleave', () => {
         if (isDragging) {
             isDragging = false;
             canvas.style.cursor = 'pointer';
-            scheduleUpdate(); // Nur ein Update am Ende
+            redrawWithOffset();
         }
     });
 }
@@ -805,15 +954,13 @@ function setupTouchDrag() {
         lastTouchY = touch.clientY;
 
         // Zeichne direkt ohne Server-Request während Drag
-        if (currentPlanetData) {
-            drawPlanetenuhr(currentPlanetData);
-        }
+        redrawWithOffset();
     });
 
     canvas.addEventListener('touchend', () => {
         if (isTouchDragging) {
             isTouchDragging = false;
-            scheduleUpdate(); // Nur ein Update am Ende
+            redrawWithOffset(); // Kein Server-Request: Daten sind verschiebungsunabhängig
         }
     });
 
@@ -958,36 +1105,39 @@ function togglePlayback(mode, speed = 1) {
 
     const interval = PLAYBACK_SPEEDS[mode] || 500;
 
+    // Echtzeit bevorzugt per Server-Sent Events, Polling nur als Fallback
+    if (mode === 'realtime' && startRealtimeStream(interval)) {
+        markPlaybackButton(mode, speed);
+        return;
+    }
+
     playbackInterval = setInterval(() => {
         if (mode === 'realtime') {
             // Echtzeit: Immer aktuelle Zeit verwenden
             currentDate = new Date();
             document.getElementById('datumInput').value = formatDate(currentDate);
+            updatePlanetPositions();
         } else {
-            // Zeitmanipulation: Verwende das aktuelle Datum aus dem Eingabefeld
-            const currentInput = document.getElementById('datumInput').value;
-            try {
-                currentDate = parseDateFromString(currentInput);
-            } catch (error) {
-                currentDate = new Date();
-            }
-
-            // Zeit anpassen
-            if (mode === 'day') {
-                currentDate.setDate(currentDate.getDate() + speed);
-            } else if (mode === 'month') {
-                currentDate.setMonth(currentDate.getMonth() + speed);
-            } else if (mode === 'year') {
-                currentDate.setFullYear(currentDate.getFullYear() + speed);
-            }
+            // Zeitmanipulation: Frames kommen gepuffert von /api/planet_timeline
+            playbackTick(mode, speed, interval);
+        }
+    }, interval);
 
-            document.getElementById('datumInput').value = formatDate(currentDate);
+    if (mode !== 'realtime') {
+        resetTimelineBuffer();
+        const datumInput = document.getElementById('datumInput').value;
+        ladeLokaleEphemeriden(parseDateFromString(datumInput));
+        // Deckt der geladene Zeitraum das Datum, kommen die Frames ohne Server
+        if (!lokaleWiedergabeMoeglich(datumInput)) {
+            fillTimelineBuffer(mode, speed, interval);
         }
+    }
 
-        updatePlanetData();
-    }, interval);
+    markPlaybackButton(mode, speed);
+}
 
-    // UI-Status aktualisieren
+// UI-Status der Play-Buttons aktualisieren
+function markPlaybackButton(mode, speed) {
     document.querySelectorAll('.play-btn').forEach(btn => btn.classList.remove('playing'));
 
     let buttonId;
@@ -1007,10 +1157,259 @@ function stopPlayback() {
         clearInterval(playbackInterval);
         playbackInterval = null;
     }
+    stopRealtimeStream();
     currentPlaybackMode = null;
+    resetTimelineBuffer();
     document.querySelectorAll('.play-btn').forEach(btn => btn.classList.remove('playing'));
 }
 
+// --- ECHTZEIT-STREAM (/api/stream) ---
+let realtimeStream = null;
+let realtimeStreamLevel = null;
+
+function startRealtimeStream(interval) {
+    if (!window.EventSource) return false;
+
+    stopRealtimeStream();
+    realtimeStreamLevel = getCurrentLevelRange(zoom_level);
+    realtimeStream = new EventSource(`/api/stream?zoom_level=${encodeURIComponent(zoom_level)}&intervall=${interval / 1000}`);
+
+    realtimeStream.onmessage = async (event) => {
+        const message = JSON.parse(event.data);
+
+        currentDate = new Date();
+        const datumInput = formatDate(currentDate);
+        document.getElementById('datumInput').value = datumInput;
+
+        // Ebene gewechselt: Kanal der neuen Ebene abonnieren
+        if (getCurrentLevelRange(zoom_level) !== realtimeStreamLevel) {
+            startRealtimeStream(interval);
+            updatePlanetData();
+            return;
+        }
+
+        if (message.laengen) {
+            try {
+                const layout = await getLayout(zoom_level);
+                applyPlanetData(combineLayout(layout, message.laengen, datumInput), datumInput);
+            } catch (error) {
+                console.error('Stream update error:', error);
+                updatePlanetData();
+            }
+        }
+    };
+
+    realtimeStream.onerror = () => {
+        // Verbindung verloren oder vom Server getrennt: auf Polling umschalten
+        if (currentPlaybackMode === 'realtime' && realtimeStream && realtimeStream.readyState === EventSource.CLOSED) {
+            stopRealtimeStream();
+            playbackInterval = setInterval(() => {
+                currentDate = new Date();
+                document.getElementById('datumInput').value = formatDate(currentDate);
+                updatePlanetPositions();
+            }, interval);
+        }
+    };
+
+    return true;
+}
+
+function stopRealtimeStream() {
+    if (realtimeStream) {
+        realtimeStream.close();
+        realtimeStream = null;
+    }
+}
+
+// --- WIEDERGABE-PUFFER (Timeline-API) ---
+// Statt einer Anfrage pro Tick werden einige Sekunden Animation auf einmal geladen.
+const TIMELINE_BUFFER_MS = 3000;
+let timelineFrames = [];
+let timelineBase = null;
+let timelineLayout = null;
+let timelineKey = null;
+let timelineLoading = false;
+let timelineGeneration = 0;
+
+function currentTimelineKey() {
+    return `${zoom_level}|${selectedPlanet}`;
+}
+
+function resetTimelineBuffer() {
+    timelineFrames = [];
+    timelineBase = null;
+    timelineLayout = null;
+    timelineKey = currentTimelineKey();
+    timelineLoading = false;
+    timelineGeneration++;
+}
+
+async function fillTimelineBuffer(mode, speed, interval) {
+    if (timelineLoading) return;
+
+    const generation = timelineGeneration;
+    const onlyLongitudes = getCurrentLevelRange(zoom_level) === 'sonnensystem';
+    const frameCount = Math.max(2, Math.ceil(TIMELINE_BUFFER_MS / interval));
+    // Nächster Block schließt an den letzten gepufferten Frame an
+    const startDatum = timelineFrames.length > 0
+        ? timelineFrames[timelineFrames.length - 1].datum
+        : document.getElementById('datumInput').value;
+
+    timelineLoading = true;
+    try {
+        const response = await fetch('/api/planet_timeline', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                datum: startDatum,
+                schritt: mode,
+                richtung: speed,
+                anzahl_frames: frameCount,
+                zoom_level: zoom_level,
+                relativ: true,
+                selected_planet: selectedPlanet,
+                nur_laengen: onlyLongitudes
+            })
+        });
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        // Im Sonnensystem kommen nur Längen, die Geometrie liefert das gecachte Layout
+        const layout = onlyLongitudes ? await getLayout(zoom_level) : null;
+
+        // Antwort verwerfen, wenn Wiedergabe gestoppt oder Ansicht geändert wurde
+        if (generation !== timelineGeneration) return;
+
+        if (data.error) {
+            document.getElementById('status').textContent = 'Fehler: ' + data.error;
+            return;
+        }
+
+        timelineBase = data.basis || null;
+        timelineLayout = layout;
+        timelineFrames.push(...data.frames);
+    } catch (error) {
+        console.error('Timeline error:', error);
+    } finally {
+        if (generation === timelineGeneration) {
+            timelineLoading = false;
+        }
+    }
+}
+
+function playbackTick(mode, speed, interval) {
+    // Zoom, Verschiebung oder Auswahl geändert: gepufferte Frames sind veraltet
+    if (timelineKey !== currentTimelineKey()) {
+        resetTimelineBuffer();
+    }
+
+    const lokal = lokalerFrame(mode, speed);
+    if (lokal) {
+        // Gepufferte Server-Frames schließen nicht mehr an das Datum an
+        if (timelineFrames.length > 0 || timelineLoading) {
+            resetTimelineBuffer();
+        }
+        document.getElementById('datumInput').value = lokal.datum;
+        currentDate = lokal.date;
+        applyPlanetData(lokal.data, lokal.datum);
+        return;
+    }
+
+    const frame = timelineFrames.shift();
+    let data = null;
+    if (frame && frame.laengen && timelineLayout) {
+        data = combineLayout(timelineLayout, frame.laengen, frame.datum);
+    } else if (frame && timelineBase) {
+        data = Object.assign({}, timelineBase, {
+            planeten: frame.planeten || timelineBase.planeten,
+            status: timelineBase.status ? Object.assign({}, timelineBase.status, { datum_uhrzeit_str: frame.datum }) : undefined
+        });
+    }
+
+    if (data) {
+        document.getElementById('datumInput').value = frame.datum;
+        currentDate = parseDateFromString(frame.datum);
+        applyPlanetData(data, frame.datum);
+    }
+
+    // Nachladen, sobald weniger als die Hälfte des Puffers übrig ist
+    if (timelineFrames.length < Math.ceil(TIMELINE_BUFFER_MS / interval) / 2) {
+        fillTimelineBuffer(mode, speed, interval);
+    }
+}
+
+// --- LOKALE WIEDERGABE (Tschebyschow-Koeffizienten, static/tschebyschow.js) ---
+// Im Sonnensystem rechnet der Browser die Frames selbst aus Layout und
+// Koeffizienten; der Server wird nur beim Wechsel des Zeitraums gefragt.
+// Zeitraum: 20 Jahre um das nächste volle Jahrzehnt, feste Grenzen halten
+// die Antworten cachebar; der nächste Zeitraum wird geladen, sobald die
+// Wiedergabe das Jahrzehnt wechselt (der alte reicht dann noch 5 Jahre).
+const LOKALE_EPHEMERIDEN_JAHRE = 10;
+let lokaleEphemeriden = null;
+let lokaleEphemeridenMitte = null;
+let lokaleEphemeridenLaedt = null;
+
+function ladeLokaleEphemeriden(date) {
+    if (typeof TschebyschowEphemeriden === 'undefined') return;
+
+    const mitte = Math.round(date.getFullYear() / LOKALE_EPHEMERIDEN_JAHRE) * LOKALE_EPHEMERIDEN_JAHRE;
+    if (mitte === lokaleEphemeridenMitte || mitte === lokaleEphemeridenLaedt || mitte - LOKALE_EPHEMERIDEN_JAHRE < 1) return;
+
+    const jahresanfang = jahr => `${String(jahr).padStart(4, '0')}/01/01 00:00:00`;
+    lokaleEphemeridenLaedt = mitte;
+    TschebyschowEphemeriden.laden(jahresanfang(mitte - LOKALE_EPHEMERIDEN_JAHRE), jahresanfang(mitte + LOKALE_EPHEMERIDEN_JAHRE))
+        .then(ephemeriden => {
+            lokaleEphemeriden = ephemeriden;
+            lokaleEphemeridenMitte = mitte;
+        })
+        .catch(error => console.error('Ephemeriden error:', error))
+        .finally(() => {
+            if (lokaleEphemeridenLaedt === mitte) {
+                lokaleEphemeridenLaedt = null;
+            }
+        });
+}
+
+function lokaleWiedergabeMoeglich(datum) {
+    return getCurrentLevelRange(zoom_level) === 'sonnensystem'
+        && lokaleEphemeriden !== null
+        && lokaleEphemeriden.deckt(datum);
+}
+
+// Nächster Wiedergabe-Frame ohne Server (Schritt wie adjustTime), null wenn
+// Ebene, Layout oder Koeffizienten nicht passen
+function lokalerFrame(mode, speed) {
+    if (getCurrentLevelRange(zoom_level) !== 'sonnensystem') return null;
+
+    const layout = layoutCache.get(zoom_level);
+    if (!layout) {
+        getLayout(zoom_level).catch(error => console.error('Layout error:', error));
+        return null;
+    }
+
+    const date = parseDateFromString(document.getElementById('datumInput').value);
+    const richtung = speed >= 0 ? 1 : -1;
+    if (mode === 'day') {
+        date.setDate(date.getDate() + richtung);
+    } else if (mode === 'month') {
+        date.setMonth(date.getMonth() + richtung);
+    } else if (mode === 'year') {
+        date.setFullYear(date.getFullYear() + richtung);
+    }
+
+    ladeLokaleEphemeriden(date);
+    const datum = formatDate(date);
+    const laengen = lokaleEphemeriden ? lokaleEphemeriden.laengen(datum) : null;
+    if (!laengen) return null;
+
+    return { datum: datum, date: date, data: combineLayout(layout, laengen, datum) };
+}
+
 // CSS für bessere Touch-Erfahrung hinzufügen
 function addTouchStyles() {
     const style = document.createElement('style');
@@ -0,0 +1,88 @@
+// --- LOKALE EPHEMERIDEN (Tschebyschow-Koeffizienten von /api/ephemeriden) ---
+// Wertet die heliozentrischen Längen im Browser aus, damit die Wiedergabe
+// nicht pro Frame den Server fragt. Dateiformat und Rechenweg wie in
+// tschebyschow.py (Klasse Koeffizienten).
+
+const TSCHEBYSCHOW_MAGIC = 'PUCH';
+const TSCHEBYSCHOW_VERSION = 1;
+const ZWEI_PI = 2 * Math.PI;
+// ephem zählt Tage seit 1899/12/31 12:00 UTC
+const EPHEM_EPOCHE_MS = Date.UTC(1899, 11, 31, 12, 0, 0);
+const TAG_MS = 86400000;
+
+class TschebyschowEphemeriden {
+    constructor(buffer) {
+        const bytes = new Uint8Array(buffer);
+        if (String.fromCharCode(...bytes.subarray(0, 4)) !== TSCHEBYSCHOW_MAGIC) {
+            throw new Error('Keine Tschebyschow-Koeffizientendatei');
+        }
+        const kopfLaenge = new DataView(buffer).getUint32(4, true);
+        this.kopf = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + kopfLaenge)));
+        if (this.kopf.version !== TSCHEBYSCHOW_VERSION) {
+            throw new Error(`Nicht unterstützte Version ${this.kopf.version}`);
+        }
+        this.start = this.kopf.start;
+        this.ende = this.kopf.ende;
+
+        // Float64-Blöcke liegen auf 8 Byte ausgerichtet hintereinander
+        let position = 8 + kopfLaenge;
+        this.koerper = this.kopf.koerper.map(koerper => {
+            const anzahl = koerper.segmente * (koerper.grad + 1);
+            const werte = new Float64Array(buffer, position, anzahl);
+            position += 8 * anzahl;
+            return Object.assign({ werte: werte }, koerper);
+        });
+    }
+
+    static async laden(start, ende) {
+        const response = await fetch(`/api/ephemeriden?start=${encodeURIComponent(start)}&ende=${encodeURIComponent(ende)}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return new TschebyschowEphemeriden(await response.arrayBuffer());
+    }
+
+    // "YYYY/MM/DD HH:MM:SS" (wie ephem als UTC gelesen) → ephem-Tage
+    static ephemTage(datumString) {
+        const [datum, uhrzeit = '0:0:0'] = datumString.split(' ');
+        const [jahr, monat, tag] = datum.split('/').map(Number);
+        const [stunden, minuten, sekunden] = uhrzeit.split(':').map(Number);
+        const zeit = new Date(0);
+        // setUTCFullYear statt Date.UTC: Jahre unter 100 nicht als 19xx deuten
+        zeit.setUTCFullYear(jahr, monat - 1, tag);
+        zeit.setUTCHours(stunden || 0, minuten || 0, sekunden || 0, 0);
+        return (zeit.getTime() - EPHEM_EPOCHE_MS) / TAG_MS;
+    }
+
+    deckt(datumString) {
+        const zeit = TschebyschowEphemeriden.ephemTage(datumString);
+        return zeit >= this.start && zeit < this.ende;
+    }
+
+    // {Name: Länge in rad} wie /api/planet_positions, null außerhalb des Zeitraums
+    laengen(datumString) {
+        const zeit = TschebyschowEphemeriden.ephemTage(datumString);
+        if (!(zeit >= this.start && zeit < this.ende)) return null;
+
+        const ergebnis = {};
+        this.koerper.forEach(koerper => {
+            const n = koerper.grad + 1;
+            const s = Math.min(Math.floor((zeit - koerper.start) / koerper.segment_tage), koerper.segmente - 1);
+            const x = 2 * (zeit - koerper.start - s * koerper.segment_tage) / koerper.segment_tage - 1;
+
+            // Clenshaw-Rekursion über die Koeffizienten des Segments
+            const werte = koerper.werte;
+            const versatz = s * n;
+            let b1 = 0;
+            let b2 = 0;
+            for (let j = n - 1; j > 0; j--) {
+                const b0 = 2 * x * b1 - b2 + werte[versatz + j];
+                b2 = b1;
+                b1 = b0;
+            }
+            const laenge = (x * b1 - b2 + werte[versatz]) % ZWEI_PI;
+            ergebnis[koerper.name] = laenge < 0 ? laenge + ZWEI_PI : laenge;
+        });
+        return ergebnis;
+    }
+}
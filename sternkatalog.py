@@ -0,0 +1,506 @@
+import bisect
+import csv
+import hashlib
+import heapq
+import itertools
+import math
+import os
+import threading
+import zlib
+
+from katalogdatei import Katalogdatei, schreibe_katalog
+
+# --- STERN- UND GALAXIENKATALOGE ---
+# Liest einen HYG-artigen CSV-Katalog (ra in Stunden, dist in Parsec, mag,
+# absmag, spect, lum) und baut einen impliziten 2D-k-d-Baum über die
+# Draufsicht (Winkel = Rektaszension, Radius = Entfernung). Jeder Teilbaum
+# kennt seine hellste Magnitude; eine Best-First-Suche liefert so die hellsten
+# Sterne eines Ausschnitts, ohne den ganzen Katalog anzufassen.
+# Gespeichert wird im Binärformat aus katalogdatei.py, bereits in
+# Baumreihenfolge; der Index ist damit die gemappte Datei selbst.
+#
+# Galaxien liegen nach Entfernungs-Eimern (logarithmisch) sortiert und darin
+# nach Priorität (scheinbare Größe) absteigend; eine Abfrage mischt die Eimer
+# eines Entfernungsbereichs und hört nach `limit` Treffern auf.
+
+INDEX_VERSION = 5
+LICHTJAHRE_PRO_PARSEC = 3.26156
+# HYG markiert unbekannte Entfernungen mit 100000 pc
+UNBEKANNTE_ENTFERNUNG_PC = 100000
+# Spektralklassen-Code: Index in SPEKTRAL_CODES, alles andere → len(SPEKTRAL_CODES)
+SPEKTRAL_CODES = 'OBAFGKM'
+# Sternfarbe je Spektralklassen-Code
+STERN_FARBEN = (
+    '#9bb0ff',  # O: Blau
+    '#aabfff',  # B: Blau-Weiß
+    '#cad7ff',  # A: Weiß
+    '#f8f7ff',  # F: Gelb-Weiß
+    '#fff4ea',  # G: Gelb (wie Sonne)
+    '#ffd2a1',  # K: Orange
+    '#ffcc6f',  # M: Rot-Orange
+    '#ffffff'   # Standard
+)
+# Entfernungs-Eimer der Galaxien: Eimer 0 bis EIMER_BASIS_LJ, danach je Faktor √2
+EIMER_BASIS_LJ = 100000
+EIMER_ANZAHL = 48
+# Füllfarbe je Galaxientyp (Farbcode): Spirale bzw. unbekannt, elliptisch/linsenförmig, irregulär
+GALAXIEN_FARBEN = ('rgba(200, 200, 255, 0.7)', 'rgba(255, 225, 180, 0.7)', 'rgba(190, 255, 220, 0.7)')
+
+
+class SternIndex:
+    """k-d-Baum über die Sterne einer Katalogdatei, in Baumreihenfolge gespeichert.
+
+    Der Knoten eines Bereichs [lo, hi) ist der Stern in der Mitte; linke und
+    rechte Hälfte sind die Kinder, abwechselnd nach x und y geteilt.
+    `min_mag[mitte]` ist die hellste Magnitude des Teilbaums. Farbcode und
+    Radien je Größenklasse (siehe stern_groessen) stehen schon in der Datei.
+    """
+
+    def __init__(self, datei):
+        self.datei = datei
+        self.x = datei.spalte('x')
+        self.y = datei.spalte('y')
+        self.entfernung_lj = datei.spalte('entfernung_lj')
+        self.mag = datei.spalte('mag')
+        self.masse_sonne = datei.spalte('masse_sonne')
+        self.spektral_code = datei.spalte('spektral_code')
+        self.radien = tuple(datei.spalte(f'radius_{klasse}') for klasse in range(3))
+        self.max_radien = tuple(max(radien, default=0.0) for radien in self.radien)
+        self.min_mag = datei.spalte('min_mag')
+        self.anzahl = len(datei)
+        # Sterne je Kreis (max_entfernung), siehe zaehlen
+        self._im_kreis = {}
+        self._namen = None
+
+    def abfrage(self, max_entfernung, rechteck=None, limit=2000):
+        """Indizes der hellsten Sterne innerhalb von `max_entfernung` (Lichtjahre)
+        und optional im Rechteck (x0, y0, x1, y1), nach Helligkeit sortiert
+        (bei gleicher Magnitude nach Index, damit das Ergebnis eindeutig ist)."""
+        if self.anzahl == 0 or limit <= 0:
+            return []
+
+        unendlich = math.inf
+        qx0, qy0, qx1, qy1 = rechteck if rechteck else (-unendlich, -unendlich, unendlich, unendlich)
+        r2 = max_entfernung * max_entfernung
+        x, y, mag, min_mag = self.x, self.y, self.mag, self.min_mag
+
+        ergebnis = []
+        mitte = self.anzahl // 2
+        # Knoten: (hellste Magnitude, lo, 1, hi, tiefe, Grenzen); Stern: (Magnitude, index, 0).
+        # (min_mag, lo) ist eine untere Schranke für (Magnitude, Index) aller Sterne im Teilbaum
+        kandidaten = [(min_mag[mitte], 0, 1, self.anzahl, 0, -unendlich, -unendlich, unendlich, unendlich)]
+
+        while kandidaten and len(ergebnis) < limit:
+            eintrag = heapq.heappop(kandidaten)
+            if eintrag[2] == 0:
+                ergebnis.append(eintrag[1])
+                continue
+
+            _, lo, _, hi, tiefe, bx0, by0, bx1, by1 = eintrag
+            mitte = (lo + hi) // 2
+            sx, sy = x[mitte], y[mitte]
+            if qx0 <= sx <= qx1 and qy0 <= sy <= qy1 and sx * sx + sy * sy <= r2:
+                heapq.heappush(kandidaten, (mag[mitte], mitte, 0))
+
+            if tiefe % 2 == 0:
+                kinder = ((lo, mitte, bx0, by0, sx, by1), (mitte + 1, hi, sx, by0, bx1, by1))
+            else:
+                kinder = ((lo, mitte, bx0, by0, bx1, sy), (mitte + 1, hi, bx0, sy, bx1, by1))
+
+            for klo, khi, kx0, ky0, kx1, ky1 in kinder:
+                if klo >= khi:
+                    continue
+                if kx0 > qx1 or kx1 < qx0 or ky0 > qy1 or ky1 < qy0:
+                    continue
+                # Kürzester Abstand der Box zur Sonne
+                dx = max(kx0, 0.0, -kx1) if kx0 > 0 or kx1 < 0 else 0.0
+                dy = max(ky0, 0.0, -ky1) if ky0 > 0 or ky1 < 0 else 0.0
+                if dx * dx + dy * dy > r2:
+                    continue
+                heapq.heappush(kandidaten, (min_mag[(klo + khi) // 2], klo, 1, khi, tiefe + 1, kx0, ky0, kx1, ky1))
+
+        return ergebnis
+
+    def zaehlen(self, max_entfernung, rechteck=None):
+        """Anzahl Sterne innerhalb von `max_entfernung` und optional im Rechteck,
+        ohne Limit. Teilbäume ganz im Bereich zählen ohne Abstieg (hi - lo)."""
+        if rechteck is None and max_entfernung in self._im_kreis:
+            return self._im_kreis[max_entfernung]
+
+        unendlich = math.inf
+        qx0, qy0, qx1, qy1 = rechteck if rechteck else (-unendlich, -unendlich, unendlich, unendlich)
+        r2 = max_entfernung * max_entfernung
+        x, y = self.x, self.y
+
+        anzahl = 0
+        stapel = [(0, self.anzahl, 0, -unendlich, -unendlich, unendlich, unendlich)]
+        while stapel:
+            lo, hi, tiefe, bx0, by0, bx1, by1 = stapel.pop()
+            if lo >= hi or bx0 > qx1 or bx1 < qx0 or by0 > qy1 or by1 < qy0:
+                continue
+            dx = max(bx0, 0.0, -bx1) if bx0 > 0 or bx1 < 0 else 0.0
+            dy = max(by0, 0.0, -by1) if by0 > 0 or by1 < 0 else 0.0
+            if dx * dx + dy * dy > r2:
+                continue
+            fern_x = max(abs(bx0), abs(bx1))
+            fern_y = max(abs(by0), abs(by1))
+            if qx0 <= bx0 and bx1 <= qx1 and qy0 <= by0 and by1 <= qy1 and fern_x * fern_x + fern_y * fern_y <= r2:
+                anzahl += hi - lo
+                continue
+
+            mitte = (lo + hi) // 2
+            sx, sy = x[mitte], y[mitte]
+            if qx0 <= sx <= qx1 and qy0 <= sy <= qy1 and sx * sx + sy * sy <= r2:
+                anzahl += 1
+            if tiefe % 2 == 0:
+                stapel.append((lo, mitte, tiefe + 1, bx0, by0, sx, by1))
+                stapel.append((mitte + 1, hi, tiefe + 1, sx, by0, bx1, by1))
+            else:
+                stapel.append((lo, mitte, tiefe + 1, bx0, by0, bx1, sy))
+                stapel.append((mitte + 1, hi, tiefe + 1, bx0, sy, bx1, by1))
+
+        if rechteck is None:
+            self._im_kreis[max_entfernung] = anzahl
+        return anzahl
+
+    def index_von(self, name):
+        if self._namen is None:
+            self._namen = {self.datei.text('name', i): i for i in range(self.anzahl)}
+        return self._namen.get(name)
+
+    def stern(self, i):
+        """Die unveränderlichen Antwortfelder eines Sterns"""
+        return {
+            'name': self.datei.text('name', i),
+            'farbe': STERN_FARBEN[self.spektral_code[i]],
+            'entfernung_lj': self.entfernung_lj[i],
+            'masse_sonne': self.masse_sonne[i],
+            'spektralklasse': self.datei.text('spektralklasse', i),
+            'planetensystem': False
+        }
+
+
+class GalaxienKatalog:
+    """Galaxien einer Katalogdatei (siehe bereite_galaxien_vor) mit Entfernungsindex.
+
+    Position in Lichtjahren (x, y), Größe in Pixeln, Farbcode und Priorität
+    stehen schon in der Datei; eine Anfrage wählt nur noch aus und projiziert.
+    """
+
+    def __init__(self, datei):
+        self.datei = datei
+        self.x = datei.spalte('x')
+        self.y = datei.spalte('y')
+        self.entfernung_lj = datei.spalte('entfernung_lj')
+        self.durchmesser_lj = datei.spalte('durchmesser_lj')
+        self.sterne = datei.spalte('sterne')
+        self.radius = datei.spalte('radius')
+        self.farbe = datei.spalte('farbe')
+        self.prioritaet = datei.spalte('prioritaet')
+        self.anzahl = len(datei)
+        eimer = datei.spalte('eimer')
+        # Beginn jedes Eimers (die Datei ist nach Eimer sortiert)
+        self.eimer_grenzen = [bisect.bisect_left(eimer, e) for e in range(EIMER_ANZAHL + 1)]
+        self.max_radius = max(self.radius, default=0.0)
+        self._namen = None
+
+    def abfrage(self, min_entfernung, max_entfernung, rechteck=None, limit=2000):
+        """Indizes der Galaxien mit min_entfernung <= Entfernung <= max_entfernung
+        (Lichtjahre) und optional im Rechteck (x0, y0, x1, y1), höchste Priorität
+        zuerst (bei Gleichstand nach Index)"""
+        if self.anzahl == 0 or limit <= 0 or min_entfernung > max_entfernung:
+            return []
+        x, y, entfernung, prioritaet = self.x, self.y, self.entfernung_lj, self.prioritaet
+        qx0, qy0, qx1, qy1 = rechteck if rechteck else (-math.inf, -math.inf, math.inf, math.inf)
+
+        def treffer(lo, hi):
+            for i in range(lo, hi):
+                if min_entfernung <= entfernung[i] <= max_entfernung and qx0 <= x[i] <= qx1 and qy0 <= y[i] <= qy1:
+                    yield -prioritaet[i], i
+
+        grenzen = self.eimer_grenzen
+        eimer = range(galaxien_eimer(min_entfernung), galaxien_eimer(max_entfernung) + 1)
+        gemischt = heapq.merge(*(treffer(grenzen[e], grenzen[e + 1]) for e in eimer))
+        return [i for _, i in itertools.islice(gemischt, limit)]
+
+    def index_von(self, name):
+        if self._namen is None:
+            self._namen = {self.datei.text('name', i): i for i in range(self.anzahl)}
+        return self._namen.get(name)
+
+    def galaxie(self, i):
+        return {
+            'name': self.datei.text('name', i),
+            'entfernung_lj': _f32(self.entfernung_lj[i]),
+            'durchmesser_lj': _f32(self.durchmesser_lj[i]),
+            'sterne': self.sterne[i],
+            'radius': _f32(self.radius[i]),
+            'farbe': GALAXIEN_FARBEN[self.farbe[i]]
+        }
+
+
+class Katalog:
+    """Öffnet einen Katalog im Hintergrund; bis dahin ist `daten` None.
+
+    `pfad` ist eine Katalogdatei oder eine CSV-Datei. CSV wird einmalig mit
+    `konvertieren(csv, ziel)` in das Cache-Verzeichnis umgewandelt (Schlüssel:
+    Pfad, Größe, Änderungszeit) und danach nur noch gemappt. `oeffnen`
+    erzeugt aus der Katalogdatei das Objekt für `daten`.
+    """
+
+    def __init__(self, pfad, cache_verzeichnis, konvertieren, oeffnen):
+        self.pfad = pfad
+        self.cache_verzeichnis = cache_verzeichnis
+        self.konvertieren = konvertieren
+        self.oeffnen = oeffnen
+        self.daten = None
+        self.fehler = None
+        self._lock = threading.Lock()
+
+    @property
+    def bereit(self):
+        return self.daten is not None
+
+    def binaerpfad(self, executor=None):
+        if not self.pfad.lower().endswith('.csv'):
+            return self.pfad
+        info = os.stat(self.pfad)
+        quelle = (INDEX_VERSION, os.path.abspath(self.pfad), info.st_size, int(info.st_mtime))
+        schluessel = hashlib.sha1(repr(quelle).encode('utf-8')).hexdigest()[:16]
+        ziel = os.path.join(self.cache_verzeichnis, f"katalog-{schluessel}.bin")
+        if not os.path.exists(ziel):
+            os.makedirs(self.cache_verzeichnis, exist_ok=True)
+            if executor is not None:
+                # Umwandeln im Prozess-Pool (Aufwärmen), der Server-Prozess bleibt frei
+                executor.submit(self.konvertieren, self.pfad, ziel).result()
+            else:
+                self.konvertieren(self.pfad, ziel)
+        return ziel
+
+    def laden(self, executor=None):
+        with self._lock:
+            if self.daten is not None:
+                return
+            try:
+                self.daten = self.oeffnen(Katalogdatei(self.binaerpfad(executor)))
+            except (OSError, ValueError, KeyError) as fehler:
+                self.fehler = str(fehler)
+
+
+def konvertiere_sterne_csv(csv_pfad, ziel):
+    """HYG-CSV → Katalogdatei in k-d-Baum-Reihenfolge; liefert die Anzahl Sterne"""
+    sterne = []
+    with open(csv_pfad, newline='', encoding='utf-8') as datei:
+        for zeile in csv.DictReader(datei):
+            stern = _lese_zeile(zeile)
+            if stern is not None:
+                sterne.append(stern)
+
+    sortiert = _baue_baum(sterne)
+    mag = [s['mag'] for s in sortiert]
+    # Antwortfelder schon gerundet als float64, eine Anfrage liest sie nur noch
+    entfernung = [_f32(s['entfernung_lj']) for s in sortiert]
+    masse = [_f32(s['masse_sonne']) for s in sortiert]
+    groessen = [stern_groessen(m) for m in masse]
+    schreibe_katalog(ziel, len(sortiert), [
+        ('name', 'T', [s['name'] for s in sortiert]),
+        ('spektralklasse', 'T', [s['spektralklasse'] for s in sortiert]),
+        ('x', 'f', [s['x'] for s in sortiert]),
+        ('y', 'f', [s['y'] for s in sortiert]),
+        ('entfernung_lj', 'd', entfernung),
+        ('mag', 'f', mag),
+        ('min_mag', 'f', _berechne_min_mag(mag)),
+        ('masse_sonne', 'd', masse),
+        ('spektral_code', 'B', [spektral_code(s['spektralklasse']) for s in sortiert]),
+        ('radius_0', 'd', [g[0] for g in groessen]),
+        ('radius_1', 'd', [g[1] for g in groessen]),
+        ('radius_2', 'd', [g[2] for g in groessen])
+    ])
+    return len(sortiert)
+
+
+def konvertiere_galaxien_csv(csv_pfad, ziel):
+    """CSV mit den Spalten name, entfernung_lj, durchmesser_lj und optional sterne,
+    ra_grad (Rektaszension in Grad), typ (Hubble-Typ, z.B. Sb, E3, Irr) → Katalogdatei"""
+    galaxien = []
+    with open(csv_pfad, newline='', encoding='utf-8') as datei:
+        for zeile in csv.DictReader(datei):
+            try:
+                galaxie = {
+                    'name': zeile['name'].strip(),
+                    'entfernung_lj': float(zeile['entfernung_lj']),
+                    'durchmesser_lj': float(zeile['durchmesser_lj']),
+                    'sterne': int(float(zeile.get('sterne') or 0)),
+                    'typ': (zeile.get('typ') or '').strip()
+                }
+                if zeile.get('ra_grad'):
+                    galaxie['ra_grad'] = float(zeile['ra_grad'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if galaxie['entfernung_lj'] > 0 and galaxie['durchmesser_lj'] > 0:
+                galaxien.append(galaxie)
+
+    anzahl, spalten = bereite_galaxien_vor(galaxien)
+    schreibe_katalog(ziel, anzahl, spalten)
+    return anzahl
+
+
+def bereite_galaxien_vor(galaxien):
+    """(anzahl, spalten) für schreibe_katalog bzw. Speicherkatalog.
+
+    Alles Zoom-unabhängige wird hier einmal berechnet: Position in der
+    Draufsicht (Winkel = Rektaszension, Radius = Entfernung; ohne ra_grad ein
+    fester Winkel aus dem Namen), Größe max(5, 2 * ln(Durchmesser)) in
+    Pixeln, Farbcode aus dem Typ und die Priorität (scheinbare Größe
+    Durchmesser / Entfernung, bestimmt Auswahl und Beschriftung).
+    """
+    eintraege = []
+    for galaxie in galaxien:
+        ra_grad = galaxie.get('ra_grad')
+        if ra_grad is None:
+            ra_grad = zlib.crc32(galaxie['name'].encode('utf-8')) % 360
+        winkel = math.radians(ra_grad)
+        entfernung = galaxie['entfernung_lj']
+        prioritaet = galaxie['durchmesser_lj'] / entfernung
+        eintraege.append((galaxien_eimer(entfernung), -prioritaet, len(eintraege), {
+            **galaxie,
+            'x': entfernung * math.cos(winkel),
+            'y': entfernung * math.sin(winkel),
+            'radius': max(5, math.log(galaxie['durchmesser_lj']) * 2),
+            'farbe': galaxien_farbcode(galaxie.get('typ', '')),
+            'prioritaet': prioritaet
+        }))
+    eintraege.sort()
+    sortiert = [eintrag[3] for eintrag in eintraege]
+
+    return len(sortiert), [
+        ('name', 'T', [g['name'] for g in sortiert]),
+        ('x', 'f', [g['x'] for g in sortiert]),
+        ('y', 'f', [g['y'] for g in sortiert]),
+        ('entfernung_lj', 'f', [g['entfernung_lj'] for g in sortiert]),
+        ('durchmesser_lj', 'f', [g['durchmesser_lj'] for g in sortiert]),
+        ('sterne', 'Q', [g.get('sterne', 0) for g in sortiert]),
+        ('radius', 'f', [g['radius'] for g in sortiert]),
+        ('farbe', 'B', [g['farbe'] for g in sortiert]),
+        ('prioritaet', 'f', [g['prioritaet'] for g in sortiert]),
+        ('eimer', 'B', [eintrag[0] for eintrag in eintraege])
+    ]
+
+
+def galaxien_eimer(entfernung_lj):
+    if entfernung_lj <= EIMER_BASIS_LJ:
+        return 0
+    return min(EIMER_ANZAHL - 1, 1 + int(2 * math.log2(entfernung_lj / EIMER_BASIS_LJ)))
+
+
+def galaxien_farbcode(typ):
+    """Index in GALAXIEN_FARBEN aus einem Hubble-Typ (Sb, SB(s)c, E3, cE2, S0, dSph, Irr, SB(s)m)"""
+    typ = typ.strip().lstrip('cd')
+    if typ.startswith(('E', 'S0', 'SA0', 'SB0', 'Sph')):
+        return 1
+    if typ.startswith('I') or typ.endswith('m'):
+        return 2
+    return 0
+
+
+def stern_groessen(masse_sonne):
+    """Sternradius in Pixeln je Größenklasse (0: nahe Nachbarn bis 2: ganze Milchstraße)"""
+    return (max(3, masse_sonne * 6), max(2, masse_sonne * 4), max(1, masse_sonne * 2))
+
+
+def spektral_code(spektralklasse):
+    buchstabe = spektralklasse[:1]
+    return SPEKTRAL_CODES.index(buchstabe) if buchstabe and buchstabe in SPEKTRAL_CODES else len(SPEKTRAL_CODES)
+
+
+def _f32(wert):
+    """float32-Wert ohne Rundungsrauschen (7 signifikante Stellen)"""
+    return float(f"{wert:.7g}")
+
+
+def _lese_zeile(zeile):
+    try:
+        entfernung_pc = float(zeile['dist'])
+        ra_stunden = float(zeile['ra'])
+        mag = float(zeile['mag'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if entfernung_pc <= 0 or entfernung_pc >= UNBEKANNTE_ENTFERNUNG_PC:
+        # Sonne selbst bzw. unbekannte Entfernung
+        return None
+
+    name = (zeile.get('proper') or '').strip()
+    if not name:
+        for spalte, praefix in (('hip', 'HIP'), ('hd', 'HD'), ('gl', ''), ('id', 'HYG')):
+            wert = (zeile.get(spalte) or '').strip()
+            if wert:
+                name = f"{praefix} {wert}".strip()
+                break
+
+    return {
+        'name': name,
+        'entfernung_lj': entfernung_pc * LICHTJAHRE_PRO_PARSEC,
+        'winkel': ra_stunden * 15.0,
+        'mag': mag,
+        'masse_sonne': _schaetze_masse(zeile),
+        'spektralklasse': (zeile.get('spect') or '').strip()
+    }
+
+
+def _schaetze_masse(zeile):
+    """Grobe Masse aus der Leuchtkraft (Masse-Leuchtkraft-Beziehung L ~ M^3.5)"""
+    try:
+        leuchtkraft = float(zeile.get('lum') or 'nan')
+        if not leuchtkraft > 0:
+            leuchtkraft = 10 ** ((4.83 - float(zeile['absmag'])) / 2.5)
+    except (KeyError, TypeError, ValueError):
+        return 1.0
+    return round(min(max(leuchtkraft ** (1 / 3.5), 0.08), 150.0), 2)
+
+
+def _baue_baum(sterne):
+    for stern in sterne:
+        winkel = math.radians(stern['winkel'])
+        stern['x'] = stern['entfernung_lj'] * math.cos(winkel)
+        stern['y'] = stern['entfernung_lj'] * math.sin(winkel)
+
+    # Median-Teilung, abwechselnd nach x und y (iterativ, ohne Rekursionstiefe)
+    reihenfolge = list(range(len(sterne)))
+    stapel = [(0, len(sterne), 0)]
+    while stapel:
+        lo, hi, tiefe = stapel.pop()
+        if hi - lo <= 1:
+            continue
+        achse = 'x' if tiefe % 2 == 0 else 'y'
+        reihenfolge[lo:hi] = sorted(reihenfolge[lo:hi], key=lambda i: sterne[i][achse])
+        mitte = (lo + hi) // 2
+        stapel.append((lo, mitte, tiefe + 1))
+        stapel.append((mitte + 1, hi, tiefe + 1))
+
+    return [sterne[i] for i in reihenfolge]
+
+
+def _berechne_min_mag(mag):
+    """Hellste Magnitude je Teilbaum, gespeichert am Index des Knotens (Bereichsmitte)"""
+    min_mag = list(mag)
+    # Bereiche in Vorordnung sammeln und rückwärts (Kinder vor Eltern) auswerten
+    bereiche = []
+    stapel = [(0, len(mag))]
+    while stapel:
+        lo, hi = stapel.pop()
+        if lo >= hi:
+            continue
+        bereiche.append((lo, hi))
+        mitte = (lo + hi) // 2
+        stapel.append((lo, mitte))
+        stapel.append((mitte + 1, hi))
+
+    for lo, hi in reversed(bereiche):
+        mitte = (lo + hi) // 2
+        wert = mag[mitte]
+        if lo < mitte:
+            wert = min(wert, min_mag[(lo + mitte) // 2])
+        if mitte + 1 < hi:
+            wert = min(wert, min_mag[(mitte + 1 + hi) // 2])
+        min_mag[mitte] = wert
+    return min_mag
@@ -0,0 +1,45 @@
+import csv
+import os
+import random
+import sys
+import tempfile
+
+import pytest
+
+# Vor dem ersten Import der App: kein Aufwärm-Pool, kurze Ephemeriden-Tabelle,
+# Cache außerhalb des Repositorys
+os.environ.setdefault('PLANETENUHR_AUFWAERMEN_PROZESSE', '0')
+os.environ.setdefault('PLANETENUHR_EPHEMERIDEN_START', '2024/01/01')
+os.environ.setdefault('PLANETENUHR_EPHEMERIDEN_ENDE', '2024/03/01')
+os.environ.setdefault('PLANETENUHR_CACHE_VERZEICHNIS', tempfile.mkdtemp(prefix='planetenuhr-tests-'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from katalogdatei import Katalogdatei  # noqa: E402
+from sternkatalog import SternIndex, konvertiere_sterne_csv  # noqa: E402
+
+HYG_SPALTEN = ['id', 'hip', 'hd', 'gl', 'proper', 'ra', 'dist', 'mag', 'absmag', 'spect', 'lum']
+
+
+def schreibe_hyg_csv(pfad, anzahl, seed=7):
+    """HYG-artiger Zufallskatalog; Magnituden auf 0,1 gerundet, damit es Gleichstände gibt"""
+    zufall = random.Random(seed)
+    with open(pfad, 'w', newline='', encoding='utf-8') as datei:
+        schreiber = csv.writer(datei)
+        schreiber.writerow(HYG_SPALTEN)
+        for i in range(anzahl):
+            schreiber.writerow([
+                i + 1, i if i % 3 else '', '', '', 'Testa' if i == 42 else '',
+                round(zufall.uniform(0, 24), 4), round(10 ** zufall.uniform(0, 4), 3),
+                round(zufall.uniform(-1, 12), 1), round(zufall.uniform(-5, 15), 2),
+                zufall.choice('OBAFGKMDL') + 'V', round(10 ** zufall.uniform(-3, 4), 4)
+            ])
+
+
+@pytest.fixture(scope='session')
+def stern_index(tmp_path_factory):
+    """SternIndex über 5000 Zufallssterne (Katalogdatei, per mmap geöffnet)"""
+    verzeichnis = tmp_path_factory.mktemp('sternkatalog')
+    schreibe_hyg_csv(verzeichnis / 'hyg.csv', 5000)
+    konvertiere_sterne_csv(str(verzeichnis / 'hyg.csv'), str(verzeichnis / 'sterne.bin'))
+    return SternIndex(Katalogdatei(str(verzeichnis / 'sterne.bin')))
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import app as planetenuhr
+import asgi
+from aufwaermen import Prozesspool
+from ergebniscache import ErgebnisCache
+
+
+def asgi_anfrage(pfad, query=b'', method='GET', trennen_nach=None):
+    """Führt eine Anfrage über asgi.application aus; liefert die gesendeten Nachrichten.
+    Mit `trennen_nach` meldet der Client sich nach so vielen Body-Teilen ab."""
+    gesendet = []
+
+    async def ablauf():
+        getrennt = asyncio.Event()
+        anfragen = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if anfragen:
+                return anfragen.pop()
+            await getrennt.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(nachricht):
+            gesendet.append(nachricht)
+            teile = [n for n in gesendet if n['type'] == 'http.response.body' and n['body']]
+            if trennen_nach is not None and len(teile) >= trennen_nach:
+                getrennt.set()
+            # Dem Wächter Gelegenheit geben, die Trennung zu bemerken
+            await asyncio.sleep(0)
+
+        scope = {
+            'type': 'http', 'method': method, 'path': pfad, 'query_string': query,
+            'headers': [(b'host', b'localhost')], 'http_version': '1.1'
+        }
+        await asgi.application(scope, receive, send)
+
+    asyncio.run(ablauf())
+    return gesendet
+
+
+def test_wsgi_antwort_wie_flask():
+    query = 'datum=2024/01/15 12:00:00'
+    nachrichten = asgi_anfrage('/api/planet_positions', query.encode('latin-1'))
+    assert nachrichten[0]['type'] == 'http.response.start'
+    assert nachrichten[0]['status'] == 200
+    koerper = nachrichten[1:]
+    assert koerper[-1] == {'type': 'http.response.body', 'body': b'', 'more_body': False}
+    assert all(n['more_body'] for n in koerper[:-1])
+
+    erwartet = planetenuhr.app.test_client().get('/api/planet_positions', query_string=query).get_data()
+    assert json.loads(b''.join(n['body'] for n in koerper)) == json.loads(erwartet)
+
+
+def test_wsgi_fehlerstatus_wird_durchgereicht():
+    nachrichten = asgi_anfrage('/gibt/es/nicht')
+    assert nachrichten[0]['status'] == 404
+    assert nachrichten[-1]['more_body'] is False
+
+
+def planet_data_anfragen(body, anzahl):
+    """`anzahl` gleichzeitige POST /api/planet_data; liefert je Anfrage (Status, Body)"""
+    async def anfrage():
+        gesendet = []
+        anfragen = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def receive():
+            if anfragen:
+                return anfragen.pop()
+            await asyncio.Event().wait()
+
+        async def send(nachricht):
+            gesendet.append(nachricht)
+
+        scope = {
+            'type': 'http', 'method': 'POST', 'path': '/api/planet_data', 'query_string': b'',
+            'headers': [(b'host', b'localhost'), (b'content-type', b'application/json')], 'http_version': '1.1'
+        }
+        await asgi.application(scope, receive, send)
+        return gesendet[0]['status'], b''.join(n.get('body', b'') for n in gesendet[1:])
+
+    async def ablauf():
+        return await asyncio.gather(*(anfrage() for _ in range(anzahl)))
+
+    return asyncio.run(ablauf())
+
+
+@pytest.mark.parametrize('prozesse', [None, 1])
+def test_planet_data_cache_im_elternprozess(monkeypatch, prozesse):
+    cache = ErgebnisCache(ttl_sekunden=60)
+    monkeypatch.setattr(planetenuhr, 'PLANET_DATA_CACHE', cache)
+    pool = Prozesspool(prozesse) if prozesse else None
+    monkeypatch.setattr(asgi, 'RECHEN_POOL', pool)
+    body = json.dumps({'datum': '2024/01/20 08:00:00', 'zoom_level': -10}).encode('utf-8')
+    try:
+        antworten = planet_data_anfragen(body, 3)
+        antworten += planet_data_anfragen(body, 1)
+        if pool is not None:
+            # Der Pool startet erst mit dem ersten Auftrag: die Berechnung lief dort,
+            # in einem eigenen Prozess
+            assert pool._executor is not None
+            assert pool.submit(os.getpid).result() != os.getpid()
+    finally:
+        if pool is not None:
+            pool.beenden()
+
+    erwartet = planetenuhr.planet_data_body(
+        '2024/01/20 08:00:00', -10, 0, 0, None, (0, 0, planetenuhr.FENSTER_GROESSE, planetenuhr.FENSTER_GROESSE),
+        'application/json', None
+    )[0]
+    assert antworten == [(200, erwartet)] * 4
+    # Gerechnet wurde einmal (ggf. im Pool), gezählt im Elternprozess
+    statistik = cache.statistik()
+    assert statistik['fehlschlaege'] == 1
+    assert statistik['treffer'] + statistik['zusammengefasst'] == 3
+    assert statistik['treffer'] >= 1
+    assert statistik['eintraege'] == 1
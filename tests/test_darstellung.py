@@ -0,0 +1,59 @@
+import app as planetenuhr
+from darstellung import BildCache
+
+
+def bild(groesse, zeichen=b'x'):
+    return lambda: zeichen * groesse
+
+
+def test_bytebudget_verdraengt_aelteste():
+    cache = BildCache(100)
+    for schluessel in 'abc':
+        cache.hole_oder_berechne(schluessel, bild(40))
+    # a + b + c = 120 > 100: a fällt heraus
+    assert cache.statistik() == {'treffer': 0, 'fehlschlaege': 3, 'eintraege': 2, 'bytes': 80}
+
+    # b wird benutzt, danach verdrängt d das nun älteste c
+    assert cache.hole_oder_berechne('b', bild(40, b'?')) == b'x' * 40
+    cache.hole_oder_berechne('d', bild(30))
+    assert cache.statistik() == {'treffer': 1, 'fehlschlaege': 4, 'eintraege': 2, 'bytes': 70}
+    assert cache.hole_oder_berechne('c', bild(40, b'c')) == b'c' * 40
+    assert cache.statistik()['bytes'] <= 100
+
+
+def test_zu_grosses_bild_wird_nicht_gespeichert():
+    cache = BildCache(100)
+    cache.hole_oder_berechne('klein', bild(60))
+    assert cache.hole_oder_berechne('gross', bild(101)) == b'x' * 101
+    # Das kleine Bild bleibt, das große verdrängt nichts
+    assert cache.statistik() == {'treffer': 0, 'fehlschlaege': 2, 'eintraege': 1, 'bytes': 60}
+    assert cache.hole_oder_berechne('klein', bild(60, b'?')) == b'x' * 60
+
+
+def test_genau_das_budget_passt():
+    cache = BildCache(100)
+    cache.hole_oder_berechne('a', bild(100))
+    assert cache.statistik()['bytes'] == 100
+    cache.hole_oder_berechne('b', bild(1))
+    assert cache.statistik() == {'treffer': 0, 'fehlschlaege': 2, 'eintraege': 1, 'bytes': 1}
+
+
+def test_api_bild_nutzt_cache_und_budget(monkeypatch):
+    cache = BildCache(10 ** 6)
+    monkeypatch.setattr(planetenuhr, 'BILD_CACHE', cache)
+    client = planetenuhr.app.test_client()
+    url = '/api/bild?zoom_level=-10&datum=2024/02/10 12:00:00&format=svg&groesse=300'
+
+    erste = client.get(url)
+    zweite = client.get(url)
+    assert erste.status_code == zweite.status_code == 200
+    assert erste.get_data() == zweite.get_data()
+    statistik = cache.statistik()
+    assert (statistik['treffer'], statistik['fehlschlaege'], statistik['eintraege']) == (1, 1, 1)
+    assert statistik['bytes'] == len(erste.get_data())
+
+    # Budget kleiner als das Bild: ausgeliefert, aber nicht gespeichert
+    klein = BildCache(len(erste.get_data()) - 1)
+    monkeypatch.setattr(planetenuhr, 'BILD_CACHE', klein)
+    assert client.get(url).get_data() == erste.get_data()
+    assert klein.statistik()['bytes'] == 0
@@ -0,0 +1,144 @@
+import json
+import struct
+from array import array
+
+import pytest
+
+import app as planetenuhr
+import drahtformat
+
+DATUM = '2024/02/10 12:00:00'
+# (zoom_level, selected_planet): Sonnensystem, Sterne, Galaxien
+ANSICHTEN = [(-10, 'Mars'), (-10, None), (-13, None), (-16, None), (-22, None)]
+
+
+def aus_kompakt(daten):
+    """Gegenstück zu drahtformat.kompakt, Rechenweg wie fromKompakt in static/script.js"""
+    ergebnis = {k: v for k, v in daten.items() if k != 'format'}
+    for schluessel in drahtformat.OBJEKTLISTEN:
+        liste = daten.get(schluessel)
+        if liste is None:
+            continue
+        objekte = []
+        for i in range(liste['anzahl']):
+            objekt = {feld: werte[i] for feld, werte in liste['spalten'].items()}
+            objekt.update((feld, i in indizes) for feld, indizes in liste['markiert'].items())
+            objekte.append(objekt)
+        ergebnis[schluessel] = objekte
+    return ergebnis
+
+
+def aus_float32(body):
+    """Float32-Blöcke zurück in die Spalten des kompakten Formats"""
+    assert body[:4] == drahtformat.FLOAT32_MAGIC
+    (kopf_laenge,) = struct.unpack_from('<I', body, 4)
+    assert (8 + kopf_laenge) % 4 == 0
+    daten = json.loads(body[8:8 + kopf_laenge])
+    position = 8 + kopf_laenge
+    for schluessel in drahtformat.OBJEKTLISTEN:
+        liste = daten.get(schluessel)
+        if liste is None:
+            continue
+        for feld in liste.pop('float32'):
+            block = array('f', body[position:position + 4 * liste['anzahl']])
+            liste['spalten'][feld] = block.tolist()
+            position += 4 * liste['anzahl']
+    assert position == len(body)
+    return daten
+
+
+def erwartet(planet_data):
+    """Ansicht mit der Rundung des kompakten Formats, ohne Tierkreiszeichen"""
+    def runden(objekt):
+        return {
+            feld: round(wert, 2) if feld in drahtformat.PIXEL_FELDER
+            else round(wert, 6) if feld in drahtformat.WINKEL_FELDER else wert
+            for feld, wert in objekt.items()
+        }
+    ergebnis = dict(planet_data)
+    for schluessel in drahtformat.OBJEKTLISTEN:
+        if schluessel in ergebnis:
+            ergebnis[schluessel] = [runden(objekt) for objekt in ergebnis[schluessel]]
+    for schluessel in ('sonne', 'milchstrasse'):
+        if schluessel in ergebnis:
+            ergebnis[schluessel] = {
+                k: round(v, 2) if k in drahtformat.PIXEL_FELDER and isinstance(v, float) else v
+                for k, v in ergebnis[schluessel].items()
+            }
+    if 'zodiak' in ergebnis:
+        ergebnis['zodiak'] = {k: v for k, v in ergebnis['zodiak'].items() if k != 'zeichen'}
+    return ergebnis
+
+
+def ansicht(zoom_level, selected_planet):
+    planet_data = planetenuhr.calculate_planet_data(DATUM, zoom_level, 0, 0, selected_planet, None)
+    # Über JSON wie auf dem Draht (Tupel werden Listen)
+    return json.loads(json.dumps(planet_data))
+
+
+@pytest.mark.parametrize('zoom_level, selected_planet', ANSICHTEN)
+def test_kompakt_rundreise(zoom_level, selected_planet):
+    planet_data = ansicht(zoom_level, selected_planet)
+    body = drahtformat.kodiere(planet_data, drahtformat.KOMPAKT)
+    assert aus_kompakt(json.loads(body)) == erwartet(planet_data)
+
+
+@pytest.mark.parametrize('zoom_level, selected_planet', ANSICHTEN)
+def test_msgpack_rundreise(zoom_level, selected_planet):
+    msgpack = pytest.importorskip('msgpack')
+    planet_data = ansicht(zoom_level, selected_planet)
+    body = drahtformat.kodiere(planet_data, drahtformat.MSGPACK)
+    assert aus_kompakt(msgpack.unpackb(body, raw=False)) == erwartet(planet_data)
+
+
+@pytest.mark.parametrize('zoom_level, selected_planet', ANSICHTEN)
+def test_float32_rundreise(zoom_level, selected_planet):
+    planet_data = ansicht(zoom_level, selected_planet)
+    body = drahtformat.kodiere(planet_data, drahtformat.FLOAT32)
+    ergebnis = aus_kompakt(aus_float32(body))
+    soll = erwartet(planet_data)
+    assert set(ergebnis) == set(soll)
+    for schluessel, wert in soll.items():
+        if schluessel not in drahtformat.OBJEKTLISTEN:
+            assert ergebnis[schluessel] == wert
+            continue
+        assert len(ergebnis[schluessel]) == len(wert)
+        for objekt, soll_objekt in zip(ergebnis[schluessel], wert):
+            assert set(objekt) == set(soll_objekt)
+            for feld, soll_wert in soll_objekt.items():
+                if feld in drahtformat.PIXEL_FELDER or feld in drahtformat.WINKEL_FELDER:
+                    assert objekt[feld] == pytest.approx(soll_wert, rel=1e-6, abs=1e-6)
+                else:
+                    assert objekt[feld] == soll_wert
+
+
+def test_markierte_felder_als_indizes():
+    planet_data = ansicht(-10, 'Mars')
+    planeten = drahtformat.kompakt(planet_data)['planeten']
+    mars = [planet['name'] for planet in planet_data['planeten']].index('Mars')
+    assert planeten['markiert']['selected'] == [mars]
+    assert 'selected' not in planeten['spalten']
+
+
+@pytest.mark.parametrize('accept, format', [
+    (None, drahtformat.JSON),
+    ('', drahtformat.JSON),
+    ('text/html', drahtformat.JSON),
+    (drahtformat.KOMPAKT, drahtformat.KOMPAKT),
+    (f'{drahtformat.KOMPAKT};q=0.5, {drahtformat.FLOAT32}', drahtformat.FLOAT32),
+    (f'application/json;q=0.1, {drahtformat.KOMPAKT}', drahtformat.KOMPAKT),
+])
+def test_waehle_format(accept, format):
+    assert drahtformat.waehle_format(accept) == format
+
+
+def test_msgpack_nur_mit_bibliothek():
+    if drahtformat.msgpack is None:
+        assert drahtformat.waehle_format(drahtformat.MSGPACK) == drahtformat.JSON
+    else:
+        assert drahtformat.waehle_format(drahtformat.MSGPACK) == drahtformat.MSGPACK
+
+
+def test_unbekanntes_format():
+    with pytest.raises(ValueError):
+        drahtformat.kodiere({}, drahtformat.JSON)
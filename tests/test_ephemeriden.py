@@ -0,0 +1,74 @@
+import math
+
+import ephem
+import pytest
+
+import ephemeriden
+from app import HELIOCENTRIC_OBJEKTE
+from ephemeriden import EphemeridenTabelle
+
+START = '2024/01/01'
+ENDE = '2027/01/01'
+# Fehlerschranke aus dem Docstring von EphemeridenTabelle
+SCHRANKE_RAD = 2e-6
+
+
+@pytest.fixture(scope='module')
+def tabelle():
+    tabelle = EphemeridenTabelle(HELIOCENTRIC_OBJEKTE, START, ENDE)
+    tabelle.aufbauen()
+    return tabelle
+
+
+def test_genauigkeit_gegenueber_ephem(tabelle):
+    abweichungen = tabelle.pruefe_genauigkeit(stichproben=500)
+    assert set(abweichungen) == set(HELIOCENTRIC_OBJEKTE)
+    assert max(abweichungen.values()) < SCHRANKE_RAD
+
+
+def test_stuetzstellen_wie_ephem(tabelle):
+    mars = ephem.Mars()
+    for i in (1, 400, 1000):
+        zeit = tabelle.start + i * tabelle.schritt
+        mars.compute(zeit)
+        # float32-Auflösung bei Werten bis 2π
+        assert tabelle.laengen(zeit)['Mars'] == pytest.approx(float(mars.hlong), abs=1e-6)
+
+
+def test_ausserhalb_und_vor_aufbau_none(tabelle):
+    assert tabelle.laengen(tabelle.start) is None
+    assert tabelle.laengen(tabelle.ende - tabelle.schritt) is None
+    assert tabelle.laengen(float(ephem.Date('2030/01/01'))) is None
+    assert tabelle.laengen(tabelle.start + tabelle.schritt) is not None
+    assert EphemeridenTabelle(HELIOCENTRIC_OBJEKTE, START, ENDE).laengen(tabelle.start + 10) is None
+
+
+def test_werte_im_bereich_0_bis_2pi(tabelle):
+    for k in range(200):
+        zeit = tabelle.start + 2 + k * 5.3
+        for wert in tabelle.laengen(zeit).values():
+            assert 0 <= wert < 2 * math.pi
+
+
+def test_datei_wird_geteilt(tmp_path, monkeypatch, tabelle):
+    pfad = str(tmp_path / 'ephemeriden.bin')
+    erste = EphemeridenTabelle(HELIOCENTRIC_OBJEKTE, START, ENDE, pfad=pfad)
+    erste.aufbauen()
+    assert erste.bereit and erste.fortschritt() == 1.0
+
+    # Ein zweiter Prozess rechnet nicht neu, sondern mappt die fertige Datei
+    def nicht_rechnen(*args):
+        raise AssertionError('Tabelle wurde neu berechnet')
+    monkeypatch.setattr(ephemeriden, '_berechne_block', nicht_rechnen)
+    zweite = EphemeridenTabelle(HELIOCENTRIC_OBJEKTE, START, ENDE, pfad=pfad)
+    zweite.mitlesen()
+    assert zweite.bereit
+    zweite.aufbauen()
+
+    zeit = float(ephem.Date('2025/06/15 13:37'))
+    assert zweite.laengen(zeit) == erste.laengen(zeit) == tabelle.laengen(zeit)
+
+    # Anderer Zeitraum passt nicht zum Dateikopf und wird nicht gemappt
+    andere = EphemeridenTabelle(HELIOCENTRIC_OBJEKTE, START, '2026/01/01', pfad=pfad)
+    andere.mitlesen()
+    assert andere.laengen(zeit) is None
@@ -0,0 +1,125 @@
+import json
+import math
+
+import ephem
+import pytest
+
+import app as planetenuhr
+import ereignisse
+from ereignisse import ZEICHEN_BREITE, EreignisSuche, _grobscan, _wickeln
+
+from test_asgi import asgi_anfrage
+
+# Zwei Körper auf Kreisbahnen: Längen linear in der Zeit, Ereignisse analytisch bekannt
+BAHNEN = {'A': (0.3, 2 * math.pi / 50), 'B': (1.0, 2 * math.pi / 200)}
+ZEICHEN = [(f"Z{i}", None) for i in range(12)]
+
+
+def kreis_laengen(zeiten):
+    return [{name: (l0 + omega * zeit) % (2 * math.pi) for name, (l0, omega) in BAHNEN.items()} for zeit in zeiten]
+
+
+def erwartete_ereignisse(start, ende):
+    (la, wa), (lb, wb) = BAHNEN['A'], BAHNEN['B']
+    erwartet = []
+    for art, versatz in (('konjunktion', 0.0), ('opposition', math.pi)):
+        # (wa - wb) t + la - lb - versatz = 2πk
+        k = math.ceil(((wa - wb) * start + la - lb - versatz) / (2 * math.pi))
+        while (zeit := (2 * math.pi * k - la + lb + versatz) / (wa - wb)) < ende:
+            erwartet.append((zeit, art, ['A', 'B']))
+            k += 1
+    for name, (l0, omega) in BAHNEN.items():
+        m = math.floor((l0 + omega * start) / ZEICHEN_BREITE) + 1
+        while (zeit := (m * ZEICHEN_BREITE - l0) / omega) < ende:
+            erwartet.append((zeit, 'eintritt', [name]))
+            m += 1
+    return sorted(erwartet)
+
+
+@pytest.fixture
+def suche():
+    return EreignisSuche(kreis_laengen, ZEICHEN, schritt_tage=1.0, block_tage=100)
+
+
+def test_findet_alle_ereignisse_mit_genauer_zeit(suche):
+    gefunden = list(suche.suche(0.0, 400.0))
+    erwartet = erwartete_ereignisse(0.0, 400.0)
+    assert [(e['art'], e['koerper']) for e in gefunden] == [(art, koerper) for _, art, koerper in erwartet]
+    for ereignis, (zeit, _, _) in zip(gefunden, erwartet):
+        assert ereignis['zeit'] == pytest.approx(zeit, abs=ereignisse.ZEIT_TOLERANZ)
+
+
+def test_eintritt_nennt_neues_zeichen(suche):
+    for ereignis in suche.suche(0.0, 400.0, arten=('eintritt',)):
+        l0, omega = BAHNEN[ereignis['koerper'][0]]
+        laenge = (l0 + omega * (ereignis['zeit'] + 0.01)) % (2 * math.pi)
+        assert ereignis['zeichen'] == f"Z{int(laenge // ZEICHEN_BREITE)}"
+
+
+def test_zeitraum_und_bloecke_schneiden_sauber(suche):
+    alle = list(suche.suche(0.0, 400.0))
+    teil = list(suche.suche(150.5, 250.2))
+    assert teil == [e for e in alle if 150.5 <= e['zeit'] < 250.2]
+    bloecke = list(suche.bloecke(150.5, 250.2))
+    assert len(bloecke) == 2
+    assert [e for block in bloecke for e in block] == teil
+
+
+def test_filter_nach_art_und_koerper(suche):
+    assert {e['art'] for e in suche.suche(0.0, 400.0, arten=('opposition',))} == {'opposition'}
+    nur_b = list(suche.suche(0.0, 400.0, arten=('konjunktion', 'eintritt'), koerper=['B']))
+    assert nur_b and all(e['art'] == 'eintritt' and e['koerper'] == ['B'] for e in nur_b)
+
+
+def test_grobscan_numpy_wie_python():
+    pytest.importorskip('numpy')
+    laengen = kreis_laengen([i * 1.0 for i in range(401)])
+    arten = ereignisse.ARTEN
+    assert sorted(ereignisse._grobscan_numpy(laengen, ['A', 'B'], arten), key=repr) == \
+        sorted(_grobscan(laengen, ['A', 'B'], arten), key=repr)
+
+
+def test_verfeinern_klammert_nullstelle(suche):
+    # Nullstelle im Intervall, Funktionswerte an den Grenzen mit verschiedenem Vorzeichen
+    zeit = next(zeit for zeit, art, _ in erwartete_ereignisse(0.0, 400.0) if art == 'konjunktion')
+    t0, t1 = math.floor(zeit), math.floor(zeit) + 1
+    assert suche._funktion(t0, 'konjunktion', ('A', 'B'), None) * suche._funktion(t1, 'konjunktion', ('A', 'B'), None) < 0
+    ergebnis = suche._verfeinern(t0, t1, 'konjunktion', ('A', 'B'), None)
+    assert t0 <= ergebnis <= t1
+    assert ergebnis == pytest.approx(zeit, abs=ereignisse.ZEIT_TOLERANZ)
+
+
+def test_echte_ephemeriden_treffen_die_nullstelle():
+    start, ende = float(ephem.Date('2024/01/01')), float(ephem.Date('2025/01/01'))
+    gefunden = list(planetenuhr.EREIGNIS_SUCHE.suche(start, ende))
+    assert gefunden
+    assert [e['zeit'] for e in gefunden] == sorted(e['zeit'] for e in gefunden)
+    for ereignis in gefunden:
+        laengen = planetenuhr.berechne_helio_laengen([ephem.Date(ereignis['zeit'])])[0]
+        if ereignis['art'] == 'eintritt':
+            rest = _wickeln(laengen[ereignis['koerper'][0]] + 1e-9)
+            abstand = abs(_wickeln(rest - round(rest / ZEICHEN_BREITE) * ZEICHEN_BREITE))
+        else:
+            a, b = ereignis['koerper']
+            versatz = 0.0 if ereignis['art'] == 'konjunktion' else math.pi
+            abstand = abs(_wickeln(laengen[a] - laengen[b] - versatz))
+        # ZEIT_TOLERANZ (≈ 1 s) mal schnellste Bewegung (Merkur, ≈ 0,07 rad/Tag)
+        assert abstand < 1e-5
+
+
+def test_asgi_streamt_ereignisse_blockweise():
+    nachrichten = asgi_anfrage('/api/ereignisse', b'start=2024/01/01&ende=2025/01/01')
+    assert nachrichten[0]['status'] == 200
+    assert (b'x-accel-buffering', b'no') in nachrichten[0]['headers']
+    teile = [n['body'] for n in nachrichten[1:] if n['body']]
+    assert len(teile) > 2
+    zeilen = b''.join(teile).decode('utf-8').splitlines()
+    assert json.loads(zeilen[-1]) == {'fertig': True, 'anzahl': len(zeilen) - 1}
+
+
+def test_asgi_ereignisse_enden_beim_trennen():
+    nachrichten = asgi_anfrage('/api/ereignisse', b'start=2000/01/01&ende=2030/01/01', trennen_nach=1)
+    teile = [n['body'] for n in nachrichten[1:] if n['body']]
+    assert len(teile) <= 2
+    assert b'fertig' not in b''.join(teile)
+    assert nachrichten[-1]['more_body'] is False
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+import ergebniscache
+from ergebniscache import ErgebnisCache
+
+
+class Uhr:
+    def __init__(self):
+        self.jetzt = 1000.0
+
+    def __call__(self):
+        return self.jetzt
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = Uhr()
+    monkeypatch.setattr(ergebniscache.time, 'monotonic', uhr)
+    return uhr
+
+
+def test_gleichzeitige_anfragen_rechnen_einmal():
+    cache = ErgebnisCache(ttl_sekunden=60)
+    laeuft = threading.Event()
+    weiter = threading.Event()
+    aufrufe = []
+
+    def berechnen():
+        aufrufe.append(1)
+        laeuft.set()
+        assert weiter.wait(5)
+        return 'wert'
+
+    ergebnisse = []
+    besitzer = threading.Thread(target=lambda: ergebnisse.append(cache.hole_oder_berechne('k', berechnen)))
+    besitzer.start()
+    assert laeuft.wait(5)
+    wartende = [
+        threading.Thread(target=lambda: ergebnisse.append(cache.hole_oder_berechne('k', berechnen)))
+        for _ in range(4)
+    ]
+    for thread in wartende:
+        thread.start()
+    # Alle Wartenden hängen an der laufenden Berechnung, bevor sie fertig wird
+    while cache.statistik()['zusammengefasst'] < 4:
+        time.sleep(0.001)
+    weiter.set()
+    for thread in [besitzer] + wartende:
+        thread.join(5)
+
+    assert aufrufe == [1]
+    assert ergebnisse == ['wert'] * 5
+    statistik = cache.statistik()
+    assert (statistik['fehlschlaege'], statistik['zusammengefasst'], statistik['treffer']) == (1, 4, 0)
+    assert cache.hole_oder_berechne('k', berechnen) == 'wert'
+    assert cache.statistik()['treffer'] == 1
+
+
+def test_fehler_erreicht_wartende_und_wird_nicht_gespeichert():
+    cache = ErgebnisCache(ttl_sekunden=60)
+    laeuft = threading.Event()
+    weiter = threading.Event()
+
+    def berechnen():
+        laeuft.set()
+        assert weiter.wait(5)
+        raise ValueError('kaputt')
+
+    fehler = []
+
+    def anfrage():
+        try:
+            cache.hole_oder_berechne('k', berechnen)
+        except ValueError as e:
+            fehler.append(e)
+
+    threads = [threading.Thread(target=anfrage)]
+    threads[0].start()
+    assert laeuft.wait(5)
+    threads.append(threading.Thread(target=anfrage))
+    threads[1].start()
+    while cache.statistik()['zusammengefasst'] < 1:
+        time.sleep(0.001)
+    weiter.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(fehler) == 2
+    assert cache.hole_oder_berechne('k', lambda: 'neu') == 'neu'
+
+
+def test_ttl_laeuft_ab(uhr):
+    cache = ErgebnisCache(ttl_sekunden=1.0)
+    werte = iter(['alt', 'neu'])
+    berechnen = lambda: next(werte)
+
+    assert cache.hole_oder_berechne('k', berechnen) == 'alt'
+    uhr.jetzt += 0.9
+    assert cache.hole_oder_berechne('k', berechnen) == 'alt'
+    uhr.jetzt += 0.2
+    assert cache.hole_oder_berechne('k', berechnen) == 'neu'
+    statistik = cache.statistik()
+    assert (statistik['treffer'], statistik['fehlschlaege']) == (1, 2)
+
+
+def test_lru_grenze_und_leeren(uhr):
+    cache = ErgebnisCache(max_eintraege=2, ttl_sekunden=60)
+    for schluessel in 'abc':
+        cache.hole_oder_berechne(schluessel, lambda: schluessel)
+    assert cache.statistik()['eintraege'] == 2
+    # 'a' wurde verdrängt, 'b' und 'c' sind noch da
+    assert cache.hole_oder_berechne('a', lambda: 'A') == 'A'
+    assert cache.hole_oder_berechne('c', lambda: 'C') == 'c'
+
+    cache.leeren()
+    statistik = cache.statistik()
+    assert statistik['eintraege'] == 0
+    assert statistik['trefferquote'] == pytest.approx(1 / 5)
+    assert cache.hole_oder_berechne('c', lambda: 'C') == 'C'
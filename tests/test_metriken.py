@@ -0,0 +1,15 @@
+import app as planetenuhr
+
+
+def test_metrics_enthaelt_stream_statistik():
+    abonnement = planetenuhr.STREAM_VERTEILER.abonnieren(('test', 3600))
+    try:
+        text = planetenuhr.app.test_client().get('/metrics').get_data(as_text=True)
+    finally:
+        planetenuhr.STREAM_VERTEILER.abbestellen(abonnement)
+    werte = dict(zeile.split(' ', 1) for zeile in text.splitlines() if zeile and not zeile.startswith('#'))
+    assert int(werte['planetenuhr_stream_kanaele']) >= 1
+    assert int(werte['planetenuhr_stream_abonnenten']) >= 1
+    assert 'planetenuhr_stream_gesendet_total' in werte
+    assert 'planetenuhr_stream_getrennt_total' in werte
+    assert '# TYPE planetenuhr_stream_gesendet_total counter' in text
@@ -0,0 +1,66 @@
+import pytest
+
+from projektion import NumpyProjektion, PythonProjektion, waehle_projektion
+
+np = pytest.importorskip('numpy')
+
+# (max_entfernung, rechteck, limit) wie in den Zoomstufen, dazu Grenzfälle
+ANSICHTEN = [
+    (100, None, 2000),
+    (1000, None, 2000),
+    (50000, None, 2000),
+    (1000, (-300.0, -200.0, 150.0, 400.0), 2000),
+    (50000, (-300.0, -200.0, 150.0, 400.0), 50),
+    (50000, (1000.0, 1000.0, 30000.0, 30000.0), 1),
+    (50000, (5.0, 5.0, 4.0, 4.0), 2000),
+    (0, None, 2000),
+]
+
+
+@pytest.mark.parametrize('max_entfernung, rechteck, limit', ANSICHTEN)
+def test_katalog_auswahl_beide_engines_gleich(stern_index, max_entfernung, rechteck, limit):
+    erwartet = PythonProjektion().katalog_auswahl(stern_index, max_entfernung, rechteck, limit)
+    assert NumpyProjektion().katalog_auswahl(stern_index, max_entfernung, rechteck, limit) == erwartet
+
+
+def test_katalog_auswahl_spaltencache_gibt_gleiche_ergebnisse(stern_index):
+    projektion = NumpyProjektion()
+    for max_entfernung, rechteck, limit in ANSICHTEN:
+        erwartet = PythonProjektion().katalog_auswahl(stern_index, max_entfernung, rechteck, limit)
+        assert projektion.katalog_auswahl(stern_index, max_entfernung, rechteck, limit) == erwartet
+    assert len(projektion._katalog_spalten) == 1
+
+
+@pytest.mark.parametrize('anzahl', [3, 1000])
+def test_polar_und_skalieren_beide_engines_gleich(anzahl):
+    radien = [1.5 * i for i in range(anzahl)]
+    winkel = [0.01 * i for i in range(anzahl)]
+    for erwartet, erhalten in zip(PythonProjektion().polar(400, 400, radien, winkel, -1),
+                                  NumpyProjektion().polar(400, 400, radien, winkel, -1)):
+        assert erhalten == pytest.approx(erwartet, abs=1e-9)
+    for erwartet, erhalten in zip(PythonProjektion().skalieren(400, 400, 0.3, radien, winkel),
+                                  NumpyProjektion().skalieren(400, 400, 0.3, radien, winkel)):
+        assert erhalten == pytest.approx(erwartet, abs=1e-9)
+
+
+@pytest.mark.parametrize('klasse', [0, 1, 2])
+@pytest.mark.parametrize('fenster', [None, (0.0, 0.0, 800.0, 800.0), (350.0, 380.0, 420.0, 410.0)])
+@pytest.mark.parametrize('anzahl', [40, 5000])
+def test_katalog_sichtbar_beide_engines_gleich(stern_index, anzahl, fenster, klasse):
+    treffer = PythonProjektion().katalog_auswahl(stern_index, 50000, None, anzahl)
+    gewaehlt = treffer[-1]
+    erwartet = PythonProjektion().katalog_sichtbar(stern_index, treffer, 400, 400, 0.05, klasse, fenster, gewaehlt)
+    erhalten = NumpyProjektion().katalog_sichtbar(stern_index, treffer, 400, 400, 0.05, klasse, fenster, gewaehlt)
+    assert erhalten == erwartet
+    assert gewaehlt in erhalten[0]
+    if fenster is None:
+        assert erhalten[0] == treffer
+    else:
+        assert len(erhalten[0]) < len(treffer)
+
+
+def test_waehle_projektion():
+    assert waehle_projektion('python').name == 'python'
+    assert waehle_projektion('auto').name == 'numpy'
+    with pytest.raises(ValueError):
+        waehle_projektion('fortran')
@@ -0,0 +1,78 @@
+import pytest
+
+import app as planetenuhr
+from projektion import NumpyProjektion, PythonProjektion, np
+from sternkatalog import Katalog, SternIndex, konvertiere_sterne_csv
+
+RECHTECKE = [None, (-300.0, -200.0, 150.0, 400.0), (1000.0, -5000.0, 30000.0, 30000.0), (5.0, 5.0, 4.0, 4.0)]
+
+
+def im_bereich(index, max_entfernung, rechteck):
+    """Indizes per Brute Force, gleiche Vergleiche wie im Baum"""
+    x0, y0, x1, y1 = rechteck if rechteck else (float('-inf'), float('-inf'), float('inf'), float('inf'))
+    return [
+        i for i in range(index.anzahl)
+        if x0 <= index.x[i] <= x1 and y0 <= index.y[i] <= y1
+        and index.x[i] * index.x[i] + index.y[i] * index.y[i] <= max_entfernung * max_entfernung
+    ]
+
+
+@pytest.mark.parametrize('max_entfernung', [0, 100, 1000, 50000])
+@pytest.mark.parametrize('rechteck', RECHTECKE)
+def test_zaehlen_wie_brute_force(stern_index, max_entfernung, rechteck):
+    erwartet = len(im_bereich(stern_index, max_entfernung, rechteck))
+    assert stern_index.zaehlen(max_entfernung, rechteck) == erwartet
+    assert PythonProjektion().katalog_zaehlen(stern_index, max_entfernung, rechteck) == erwartet
+    if np is not None:
+        assert NumpyProjektion().katalog_zaehlen(stern_index, max_entfernung, rechteck) == erwartet
+
+
+@pytest.mark.parametrize('limit', [1, 17, 500, 10 ** 6])
+@pytest.mark.parametrize('max_entfernung', [0, 100, 1000, 50000])
+@pytest.mark.parametrize('rechteck', RECHTECKE)
+def test_abfrage_wie_brute_force(stern_index, max_entfernung, rechteck, limit):
+    erwartet = sorted(im_bereich(stern_index, max_entfernung, rechteck), key=lambda i: (stern_index.mag[i], i))
+    assert stern_index.abfrage(max_entfernung, rechteck, limit) == erwartet[:limit]
+
+
+def test_abfrage_leer(stern_index):
+    assert stern_index.abfrage(50000, limit=0) == []
+    assert stern_index.abfrage(-1) == []
+
+
+@pytest.fixture
+def katalog(stern_index, monkeypatch):
+    """Geladener Sternkatalog in der App, ohne Limit pro Antwort"""
+    katalog = Katalog(stern_index.datei.pfad, None, konvertiere_sterne_csv, SternIndex)
+    katalog.laden()
+    monkeypatch.setattr(planetenuhr, 'STERNKATALOG', katalog)
+    monkeypatch.setattr(planetenuhr, 'STERNKATALOG_MAX_STERNE', 10 ** 6)
+    return katalog
+
+
+@pytest.mark.parametrize('zoom_level', [-11, -15, -20])
+@pytest.mark.parametrize('sichtbereich', [(0, 0, 600, 600), (200, 300, 400, 350)])
+def test_katalog_culling_zaehlt_weggelassene(katalog, zoom_level, sichtbereich):
+    alle = planetenuhr.calculate_milchstrasse_data(zoom_level, 25, -40)
+    assert alle['zoom_info']['culled'] == 0
+
+    fenster = planetenuhr.sicht_rechteck(sichtbereich, planetenuhr.BESCHRIFTUNG_BREITE)
+    erwartet = [
+        stern['name'] for stern in alle['sterne']
+        if planetenuhr.punkt_sichtbar(stern['x'], stern['y'], stern['radius'], fenster)
+    ]
+    daten = planetenuhr.calculate_milchstrasse_data(zoom_level, 25, -40, None, sichtbereich)
+    assert sorted(stern['name'] for stern in daten['sterne']) == sorted(erwartet)
+    assert daten['zoom_info']['culled'] == len(alle['sterne']) - len(erwartet)
+
+
+def test_katalog_culling_behaelt_gewaehlten_stern(katalog):
+    alle = planetenuhr.calculate_milchstrasse_data(-15, 25, -40)['sterne']
+    fenster = planetenuhr.sicht_rechteck((0, 0, 100, 100), planetenuhr.BESCHRIFTUNG_BREITE)
+    ausserhalb = next(
+        stern for stern in alle
+        if not planetenuhr.punkt_sichtbar(stern['x'], stern['y'], stern['radius'], fenster)
+        and abs(stern['x'] - 50) < 400 and abs(stern['y'] - 50) < 400
+    )
+    daten = planetenuhr.calculate_milchstrasse_data(-15, 25, -40, ausserhalb['name'], (0, 0, 100, 100))
+    assert [stern['name'] for stern in daten['sterne'] if stern['selected']] == [ausserhalb['name']]
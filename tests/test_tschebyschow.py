@@ -0,0 +1,130 @@
+import json
+import math
+import os
+import shutil
+import subprocess
+
+import ephem
+import pytest
+
+import app as planetenuhr
+import tschebyschow
+
+ZWEI_PI = 2 * math.pi
+START = float(ephem.Date('2024/01/01'))
+ENDE = float(ephem.Date('2032/01/01'))
+JS_PFAD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'tschebyschow.js')
+
+# Heliozentrische Längen (rad) direkt aus ephem, auf 1e-7 gerundet
+GOLDEN = {
+    '2024/03/20 12:00:00': {
+        'Merkur': 1.6641161, 'Venus': 5.4647117, 'Mars': 5.3352861, 'Jupiter': 0.9251238, 'Saturn': 5.9420104,
+        'Uranus': 0.9163433, 'Neptun': 6.2375703, 'Pluto': 5.2407842, 'Erde': 0.0065463
+    },
+    '2025/07/04 06:30:15': {
+        'Merkur': 3.9968221, 'Venus': 6.0557446, 'Mars': 3.3359277, 'Jupiter': 1.6439239, 'Saturn': 6.2111769,
+        'Uranus': 1.0095311, 'Neptun': 0.0044909, 'Pluto': 5.2793474, 'Erde': 1.7899893
+    },
+    '2031/12/31 23:59:59': {
+        'Merkur': 3.8192611, 'Venus': 3.2812266, 'Mars': 0.0941545, 'Jupiter': 4.894073, 'Saturn': 1.4010732,
+        'Uranus': 1.4904054, 'Neptun': 0.2568802, 'Pluto': 5.4643345, 'Erde': 4.8887948
+    }
+}
+
+
+def winkel_abstand(a, b):
+    return abs((a - b + math.pi) % ZWEI_PI - math.pi)
+
+
+@pytest.fixture(scope='module')
+def daten():
+    return tschebyschow.exportiere(planetenuhr.berechne_koerper_laengen, planetenuhr.EPHEMERIDEN_KOERPER, START, ENDE)
+
+
+def test_abweichung_von_berechne_helio_laengen(daten):
+    koeffizienten = tschebyschow.Koeffizienten(daten)
+    zeiten = [START + (k * 0.618033988749895 % 1.0) * (ENDE - START) for k in range(300)]
+    # Innerhalb der Ephemeriden-Tabelle (conftest: 2024/01 bis 2024/03) kommt deren Interpolationsfehler dazu
+    toleranz = tschebyschow.TOLERANZ_RAD + 2e-6
+    for zeit, referenz in zip(zeiten, planetenuhr.berechne_helio_laengen([ephem.Date(z) for z in zeiten])):
+        ausgewertet = koeffizienten.laengen(zeit)
+        assert set(ausgewertet) == set(referenz)
+        for name, wert in referenz.items():
+            assert winkel_abstand(ausgewertet[name], wert) < toleranz, (name, zeit)
+
+
+def test_pruefe_genauigkeit_ueber_maximalen_zeitraum():
+    # Nach den Sprüngen von ephem um den 1.1.2000 (siehe TOLERANZ_RAD)
+    start = float(ephem.Date('2001/01/01'))
+    abweichungen = tschebyschow.pruefe_genauigkeit(
+        planetenuhr.berechne_koerper_laengen, planetenuhr.EPHEMERIDEN_KOERPER,
+        start, start + planetenuhr.TSCHEBYSCHOW_MAX_TAGE, stichproben=300
+    )
+    assert set(abweichungen) == set(planetenuhr.EPHEMERIDEN_KOERPER)
+    assert max(abweichungen.values()) < tschebyschow.TOLERANZ_RAD
+
+
+def test_golden_werte_python(daten):
+    koeffizienten = tschebyschow.Koeffizienten(daten)
+    for datum, erwartet in GOLDEN.items():
+        ausgewertet = koeffizienten.laengen(float(ephem.Date(datum)))
+        for name, wert in erwartet.items():
+            assert winkel_abstand(ausgewertet[name], wert) < tschebyschow.TOLERANZ_RAD + 1e-7, (datum, name)
+
+
+def test_format_deterministisch_und_zeitraum(daten):
+    assert daten[:4] == tschebyschow.MAGIC
+    assert tschebyschow.exportiere(
+        planetenuhr.berechne_koerper_laengen, planetenuhr.EPHEMERIDEN_KOERPER, START, ENDE
+    ) == daten
+    koeffizienten = tschebyschow.Koeffizienten(daten)
+    assert koeffizienten.laengen(START - 0.5) is None
+    assert koeffizienten.laengen(ENDE) is None
+    assert koeffizienten.laengen(START) is not None
+    for koerper in koeffizienten.kopf['koerper']:
+        assert koerper['start'] <= START
+        assert koerper['start'] + koerper['segmente'] * koerper['segment_tage'] >= ENDE
+    with pytest.raises(ValueError):
+        tschebyschow.Koeffizienten(b'XXXX' + daten[4:])
+
+
+def werte_mit_node_aus(pfad, daten_strings):
+    """Wertet die Koeffizientendatei mit static/tschebyschow.js in Node aus"""
+    skript = """
+const fs = require('fs');
+const vm = require('vm');
+vm.runInThisContext(fs.readFileSync(process.argv[1], 'utf8') + '\\nglobalThis.T = TschebyschowEphemeriden;');
+const bytes = new Uint8Array(fs.readFileSync(process.argv[2]));
+const ephemeriden = new T(bytes.buffer);
+const ergebnis = {};
+for (const datum of JSON.parse(process.argv[3])) {
+    ergebnis[datum] = {tage: T.ephemTage(datum), deckt: ephemeriden.deckt(datum), laengen: ephemeriden.laengen(datum)};
+}
+console.log(JSON.stringify(ergebnis));
+"""
+    ausgabe = subprocess.run(
+        ['node', '-e', skript, JS_PFAD, str(pfad), json.dumps(daten_strings)],
+        check=True, capture_output=True, text=True, timeout=60
+    ).stdout
+    return json.loads(ausgabe)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='Node.js nicht installiert')
+def test_js_auswertung_golden_und_wie_python(daten, tmp_path):
+    pfad = tmp_path / 'koeffizienten.bin'
+    pfad.write_bytes(daten)
+    ausserhalb = '2040/01/01 00:00:00'
+    ergebnis = werte_mit_node_aus(pfad, list(GOLDEN) + [ausserhalb])
+    koeffizienten = tschebyschow.Koeffizienten(daten)
+
+    for datum, erwartet in GOLDEN.items():
+        js = ergebnis[datum]
+        assert js['deckt']
+        assert js['tage'] == pytest.approx(float(ephem.Date(datum)), abs=1e-9)
+        python = koeffizienten.laengen(float(ephem.Date(datum)))
+        for name, wert in erwartet.items():
+            assert winkel_abstand(js['laengen'][name], wert) < tschebyschow.TOLERANZ_RAD + 1e-7, (datum, name)
+            # Gleicher Rechenweg: bis auf Rundung identisch mit der Python-Auswertung
+            assert winkel_abstand(js['laengen'][name], python[name]) < 1e-12, (datum, name)
+    assert not ergebnis[ausserhalb]['deckt']
+    assert ergebnis[ausserhalb]['laengen'] is None
@@ -0,0 +1,155 @@
+import json
+import math
+import struct
+import sys
+from array import array
+
+# --- TSCHEBYSCHOW-KOEFFIZIENTEN FÜR DEN CLIENT ---
+# Heliozentrische Längen als stückweise Tschebyschow-Polynome, damit der
+# Browser Wiedergabe-Frames selbst rechnen kann (static/tschebyschow.js) und
+# nur beim Wechsel des Zeitraums den Server fragt.
+#
+# Dateiformat: b'PUCH', uint32 Kopflänge, Kopf (JSON), Auffüllung mit
+# Leerzeichen auf 8 Byte, danach je Körper (Reihenfolge wie im Kopf)
+# segmente * (grad + 1) Float64-Werte (Little-Endian). Kopf:
+# {"version", "start", "ende", "toleranz_rad", "koerper": [{"name",
+# "start", "segment_tage", "grad", "segmente"}]}; Zeiten in ephem-Tagen
+# (seit 1899/12/31 12:00 UTC). Segment k eines Körpers deckt
+# [start + k * segment_tage, start + (k + 1) * segment_tage) ab; die Länge
+# ist dort entfaltet (stetig), ausgewertet wird mit Clenshaw, danach mod 2π.
+
+MAGIC = b'PUCH'
+FORMAT_VERSION = 1
+MEDIENTYP = 'application/vnd.planetenuhr.tschebyschow'
+ZWEI_PI = 2 * math.pi
+# Zugesicherte Genauigkeit gegenüber ephem (≈ 0,2 Bogensekunden). Ausnahme:
+# vom 24.12.1999 bis 8.1.2000 springt ephem selbst um bis zu 5e-6 rad, die
+# Polynome glätten diese Sprünge
+TOLERANZ_RAD = 1e-6
+GRAD = 10
+# Segmentlänge in Tagen je Körper: kurz für schnelle Bahnen; Erde (aus der
+# geozentrischen Sonne) trägt die monatliche Mondstörung
+SEGMENT_TAGE = {
+    'Merkur': 16, 'Venus': 32, 'Erde': 16, 'Mars': 64, 'Jupiter': 256,
+    'Saturn': 512, 'Uranus': 1024, 'Neptun': 1024, 'Pluto': 1024
+}
+STANDARD_SEGMENT_TAGE = 16
+
+
+def exportiere(laengen_funktion, namen, start, ende, grad=GRAD, segment_tage=None):
+    """Koeffizientendatei (bytes) für [start, ende) in ephem-Tagen.
+
+    `laengen_funktion(name, zeiten)` liefert die heliozentrischen Längen eines
+    Körpers (rad). Segmente liegen auf einem festen Raster (Vielfache der
+    Segmentlänge), gleiche Zeiträume ergeben also gleiche Bytes.
+    """
+    segment_tage = segment_tage or SEGMENT_TAGE
+    knoten = [math.cos(math.pi * (k + 0.5) / (grad + 1)) for k in range(grad + 1)]
+    kopf_koerper = []
+    bloecke = []
+    for name in namen:
+        laenge = segment_tage.get(name, STANDARD_SEGMENT_TAGE)
+        erstes = math.floor(start / laenge) * laenge
+        segmente = max(1, math.ceil((ende - erstes) / laenge))
+
+        zeiten = []
+        for s in range(segmente):
+            mitte = erstes + (s + 0.5) * laenge
+            # Knoten in aufsteigender Zeit, damit das Entfalten der Reihe nach geht
+            zeiten.extend(mitte + 0.5 * laenge * x for x in reversed(knoten))
+        werte = laengen_funktion(name, zeiten)
+
+        koeffizienten = array('d')
+        for s in range(segmente):
+            stuetz = _entfalte(werte[s * (grad + 1):(s + 1) * (grad + 1)])
+            # Zurück in Knotenreihenfolge (x_k absteigend)
+            koeffizienten.extend(_koeffizienten(stuetz[::-1], grad))
+        if sys.byteorder != 'little':
+            koeffizienten.byteswap()
+        bloecke.append(koeffizienten.tobytes())
+        kopf_koerper.append({
+            'name': name, 'start': erstes, 'segment_tage': laenge, 'grad': grad, 'segmente': segmente
+        })
+
+    kopf = json.dumps({
+        'version': FORMAT_VERSION, 'start': start, 'ende': ende,
+        'toleranz_rad': TOLERANZ_RAD, 'koerper': kopf_koerper
+    }, separators=(',', ':')).encode('utf-8')
+    kopf += b' ' * (-(len(MAGIC) + 4 + len(kopf)) % 8)
+    return b''.join([MAGIC, struct.pack('<I', len(kopf)), kopf] + bloecke)
+
+
+class Koeffizienten:
+    """Auswertung einer Koeffizientendatei, Rechenweg wie in static/tschebyschow.js"""
+
+    def __init__(self, daten):
+        if daten[:4] != MAGIC:
+            raise ValueError("Keine Tschebyschow-Koeffizientendatei")
+        (kopf_laenge,) = struct.unpack_from('<I', daten, 4)
+        self.kopf = json.loads(daten[8:8 + kopf_laenge])
+        if self.kopf['version'] != FORMAT_VERSION:
+            raise ValueError(f"Nicht unterstützte Version {self.kopf['version']}")
+        self.start = self.kopf['start']
+        self.ende = self.kopf['ende']
+        self._koerper = []
+        position = 8 + kopf_laenge
+        for koerper in self.kopf['koerper']:
+            anzahl = koerper['segmente'] * (koerper['grad'] + 1)
+            werte = array('d', daten[position:position + 8 * anzahl])
+            if sys.byteorder != 'little':
+                werte.byteswap()
+            self._koerper.append((koerper, werte))
+            position += 8 * anzahl
+
+    def laengen(self, zeit):
+        """{Name: Länge in rad} für einen Zeitpunkt (ephem-Tage) oder None außerhalb"""
+        if not self.start <= zeit < self.ende:
+            return None
+        ergebnis = {}
+        for koerper, werte in self._koerper:
+            n = koerper['grad'] + 1
+            s = min(int((zeit - koerper['start']) // koerper['segment_tage']), koerper['segmente'] - 1)
+            x = 2 * (zeit - koerper['start'] - s * koerper['segment_tage']) / koerper['segment_tage'] - 1
+            ergebnis[koerper['name']] = _clenshaw(werte, s * n, n, x) % ZWEI_PI
+        return ergebnis
+
+
+def pruefe_genauigkeit(laengen_funktion, namen, start, ende, stichproben=2000):
+    """Größte Abweichung (rad) je Körper zwischen Auswertung und `laengen_funktion`
+    an über den Zeitraum verteilten Zeitpunkten"""
+    koeffizienten = Koeffizienten(exportiere(laengen_funktion, namen, start, ende))
+    zeiten = [start + (k * 0.618033988749895 % 1.0) * (ende - start) for k in range(stichproben)]
+    abweichungen = {}
+    for name in namen:
+        referenz = laengen_funktion(name, zeiten)
+        abweichungen[name] = max(
+            abs((koeffizienten.laengen(zeit)[name] - wert + math.pi) % ZWEI_PI - math.pi)
+            for zeit, wert in zip(zeiten, referenz)
+        )
+    return abweichungen
+
+
+def _entfalte(werte):
+    """Sprünge über 0/2π entfernen (Bahnbewegung pro Knotenabstand << π)"""
+    ergebnis = [werte[0]]
+    for wert in werte[1:]:
+        vorher = ergebnis[-1]
+        ergebnis.append(vorher + (wert - vorher + math.pi) % ZWEI_PI - math.pi)
+    return ergebnis
+
+
+def _koeffizienten(stuetz, grad):
+    """Tschebyschow-Koeffizienten aus Werten an den Knoten cos(π(k + ½)/(grad + 1))"""
+    n = grad + 1
+    koeffizienten = []
+    for j in range(n):
+        summe = sum(wert * math.cos(math.pi * j * (k + 0.5) / n) for k, wert in enumerate(stuetz))
+        koeffizienten.append(summe * (1 if j else 0.5) * 2 / n)
+    return koeffizienten
+
+
+def _clenshaw(werte, versatz, n, x):
+    b1 = b2 = 0.0
+    for j in range(n - 1, 0, -1):
+        b1, b2 = 2 * x * b1 - b2 + werte[versatz + j], b1
+    return x * b1 - b2 + werte[versatz]
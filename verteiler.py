@@ -0,0 +1,155 @@
+import asyncio
+import queue
+import threading
+import time
+
+# --- VERTEILER FÜR STREAMING (Server-Sent Events) ---
+# Pro Kanal (z.B. Ebene + Takt) läuft genau ein Thread, der einmal pro Takt
+# rechnet und das Ergebnis an alle Abonnenten verteilt.
+
+
+class Abonnement:
+    """Begrenzte Warteschlange eines Stream-Clients.
+
+    `zustellen` blockiert nie: ist die Warteschlange voll, ist der Client zu
+    langsam und wird vom Verteiler getrennt. `None` in der Warteschlange
+    signalisiert das Ende des Streams.
+    """
+
+    def __init__(self, kanal, max_puffer):
+        self.kanal = kanal
+        self.warteschlange = queue.Queue(maxsize=max_puffer)
+        self.getrennt = False
+
+    def zustellen(self, nachricht):
+        try:
+            self.warteschlange.put_nowait(nachricht)
+            return True
+        except queue.Full:
+            return False
+
+    def trennen(self):
+        self.getrennt = True
+        # Alte Nachrichten verwerfen, damit das Endesignal sicher Platz hat
+        while True:
+            try:
+                self.warteschlange.get_nowait()
+            except queue.Empty:
+                break
+        self.zustellen(None)
+
+
+class AsyncAbonnement(Abonnement):
+    """Abonnement für asyncio-Clients (ASGI): der Verteiler-Thread übergibt
+    Nachrichten threadsicher an die Event-Loop, ohne einen Thread pro Client."""
+
+    def __init__(self, kanal, max_puffer, loop):
+        self.kanal = kanal
+        self.getrennt = False
+        self.max_puffer = max_puffer
+        self._loop = loop
+        self._warteschlange = asyncio.Queue()
+        self._ausstehend = 0
+        self._lock = threading.Lock()
+
+    def zustellen(self, nachricht):
+        with self._lock:
+            if self._ausstehend >= self.max_puffer:
+                return False
+            self._ausstehend += 1
+        self._loop.call_soon_threadsafe(self._warteschlange.put_nowait, nachricht)
+        return True
+
+    def trennen(self):
+        self.getrennt = True
+        self._loop.call_soon_threadsafe(self._warteschlange.put_nowait, None)
+
+    async def holen(self, timeout):
+        """Nächste Nachricht, None beim Trennen; asyncio.TimeoutError ohne Nachricht"""
+        nachricht = await asyncio.wait_for(self._warteschlange.get(), timeout)
+        if nachricht is not None:
+            with self._lock:
+                self._ausstehend -= 1
+        return nachricht
+
+
+class _Kanal:
+    def __init__(self):
+        self.abonnenten = set()
+        self.thread = None
+
+
+class Verteiler:
+    """Teilt eine Berechnung pro Takt auf alle Abonnenten eines Kanals auf.
+
+    `berechnen(kanal)` liefert die Nachricht für einen Takt. Der Kanal ist ein
+    Tupel, dessen letztes Element das Intervall in Sekunden ist. Kanal-Threads
+    starten mit dem ersten Abonnenten und enden mit dem letzten.
+    """
+
+    def __init__(self, berechnen, max_puffer=16):
+        self.berechnen = berechnen
+        self.max_puffer = max_puffer
+        self._kanaele = {}
+        self._lock = threading.Lock()
+        self.gesendet = 0
+        self.getrennt = 0
+
+    def abonnieren(self, kanal, abonnement=None):
+        abonnement = abonnement or Abonnement(kanal, self.max_puffer)
+        with self._lock:
+            eintrag = self._kanaele.get(kanal)
+            if eintrag is None:
+                eintrag = self._kanaele[kanal] = _Kanal()
+            eintrag.abonnenten.add(abonnement)
+            if eintrag.thread is None:
+                eintrag.thread = threading.Thread(
+                    target=self._takt, args=(kanal, eintrag), name=f'verteiler-{kanal}', daemon=True
+                )
+                eintrag.thread.start()
+        return abonnement
+
+    def abbestellen(self, abonnement):
+        with self._lock:
+            eintrag = self._kanaele.get(abonnement.kanal)
+            if eintrag is not None:
+                eintrag.abonnenten.discard(abonnement)
+
+    def statistik(self):
+        with self._lock:
+            return {
+                'kanaele': len(self._kanaele),
+                'abonnenten': sum(len(eintrag.abonnenten) for eintrag in self._kanaele.values()),
+                'gesendet': self.gesendet,
+                'getrennt': self.getrennt
+            }
+
+    def _takt(self, kanal, eintrag):
+        intervall = kanal[-1]
+        while True:
+            with self._lock:
+                if not eintrag.abonnenten:
+                    # Letzter Abonnent weg: Kanal abbauen
+                    del self._kanaele[kanal]
+                    return
+                abonnenten = list(eintrag.abonnenten)
+
+            try:
+                nachricht = self.berechnen(kanal)
+            except Exception:
+                nachricht = None
+
+            if nachricht is not None:
+                for abonnement in abonnenten:
+                    if abonnement.zustellen(nachricht):
+                        self.gesendet += 1
+                    else:
+                        # Langsamer Client: trennen statt unbegrenzt puffern
+                        self.abbestellen(abonnement)
+                        abonnement.trennen()
+                        self.getrennt += 1
+
+            # Auf Vielfache des Intervalls ausrichten, damit Takte verschiedener
+            # Kanäle auf dieselbe Sekunde fallen (Treffer im Ergebnis-Cache)
+            jetzt = time.time()
+            time.sleep(intervall - (jetzt % intervall))